@@ -0,0 +1,63 @@
+# ai-services/benchmarks/startup.py
+
+"""
+Cold-start benchmark for the ai-services process.
+
+Each run starts a fresh interpreter and measures:
+  - import_s: `import main` (the app can serve /health after this)
+  - warm_s:   building all engines afterwards (when /ready turns 200)
+
+Exits non-zero when the median import time exceeds --max-import-seconds,
+so it can guard against heavy imports creeping back into module load.
+
+    python benchmarks/startup.py --runs 5 --max-import-seconds 1.0
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.engines.warm_up()
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "warm_s": t2 - t1}))
+"""
+
+
+def measure_once() -> dict:
+    env = {**os.environ, "ENGINE_WARMUP": "lazy", "PYTHONPATH": SERVICE_DIR}
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=SERVICE_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(runs: int) -> dict:
+    samples = [measure_once() for _ in range(runs)]
+    return {
+        key: {"median": round(statistics.median(s[key] for s in samples), 4),
+              "max": round(max(s[key] for s in samples), 4)}
+        for key in ("import_s", "warm_s")
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure ai-services import and warm-up time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(json.dumps(result, indent=2))
+    if result["import_s"]["median"] > args.max_import_seconds:
+        print(f"REGRESSION: median import {result['import_s']['median']}s "
+              f"> budget {args.max_import_seconds}s", file=sys.stderr)
+        sys.exit(1)
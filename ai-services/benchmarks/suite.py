@@ -0,0 +1,290 @@
+# ai-services/benchmarks/suite.py
+
+"""
+Benchmark suite for the ML engines and the FastAPI app.
+
+  - micro: per-call latency of recommend_careers (with and without Big Five
+    traits) / recommend_careers_batch / recommend_streams on synthetic
+    catalogs of each --sizes, of
+    AptitudeEngine.get_next_question / calculate_scores, and of the
+    interest analysis behind /analyze/interests
+  - load: concurrent in-process requests against the app (no network),
+    reporting throughput and p50/p95/p99 per endpoint
+  - startup (--startup): import and warm-up time, see benchmarks/startup.py
+
+All inputs come from benchmarks/synthetic.py with a fixed --seed. Results
+are written as JSON; --save-baseline stores them and --compare flags every
+metric that got worse than the stored baseline by more than --threshold
+(exit status 1). A load scenario with any non-200 response fails the run
+(and any comparison) outright: fast errors are not speedups. Baselines are machine-specific: compare runs from the
+same host.
+
+    cd ai-services
+    python -m benchmarks.suite --sizes 10 1000 10000 --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.suite --sizes 10 1000 10000 --compare benchmarks/baselines/local.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from benchmarks import synthetic
+
+# Metric -> +1 if higher is worse, -1 if lower is worse
+DIRECTIONS = {
+    "p50_us": 1, "p95_us": 1,
+    "p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "rps": -1,
+    "import_s": 1, "warm_s": 1,
+}
+
+
+def _summary_us(samples: Sequence[float]) -> Dict:
+    us = np.asarray(samples) * 1e6
+    return {
+        "calls": len(us),
+        "mean_us": round(float(us.mean()), 2),
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p95_us": round(float(np.percentile(us, 95)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+    }
+
+
+def time_calls(fn: Callable, inputs: Sequence, calls: int, warmup: int = 5) -> Dict:
+    """Time `calls` calls of fn(input), cycling through `inputs`."""
+    for i in range(min(warmup, calls)):
+        fn(inputs[i % len(inputs)])
+    samples = []
+    for i in range(calls):
+        arg = inputs[i % len(inputs)]
+        started = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - started)
+    return _summary_us(samples)
+
+
+# -----------------------------------------------------------------------------
+# Micro-benchmarks
+# -----------------------------------------------------------------------------
+def micro_careers(sizes: List[int], data_dir: str, seed: int, calls: int) -> Dict:
+    from models.recommender import CareerRecommendationEngine
+
+    results = {}
+    students = synthetic.profiles(256, seed)
+    with_personality = synthetic.profiles(256, seed, personality=True)
+    batch = [dict(p, k=10) for p in students[:32]]
+    for n in sizes:
+        engine = CareerRecommendationEngine(synthetic.write_catalog(n, data_dir, seed))
+        results[f"micro/recommend_careers/n={n}"] = time_calls(
+            lambda p: engine.recommend_careers(**p), students, calls)
+        results[f"micro/recommend_careers_personality/n={n}"] = time_calls(
+            lambda p: engine.recommend_careers(**p), with_personality, calls)
+        results[f"micro/recommend_careers_batch32/n={n}"] = time_calls(
+            lambda b: engine.recommend_careers_batch(b), [batch], max(1, calls // 32))
+        results[f"micro/recommend_streams/n={n}"] = time_calls(
+            lambda p: engine.recommend_streams(p["interests"], p["aptitude"], p["class_level"]), students, calls)
+    return results
+
+
+def micro_aptitude(items: int, data_dir: str, seed: int, calls: int) -> Dict:
+    from models.aptitude import AptitudeEngine
+
+    engine = AptitudeEngine(synthetic.write_item_bank(items, data_dir, seed))
+    sheets = synthetic.aptitude_responses(256, seed, per_student=20, bank=engine.items)
+    return {
+        f"micro/get_next_question/items={items}": time_calls(
+            lambda answers: engine.get_next_question(answers, 3), sheets, calls),
+        "micro/calculate_scores": time_calls(engine.calculate_scores, sheets, calls),
+    }
+
+
+def micro_interests(seed: int, calls: int) -> Dict:
+    from models.personality import PersonalityAnalyzer
+
+    analyzer = PersonalityAnalyzer()
+    students = synthetic.interest_responses(1000, seed)
+    return {
+        "micro/analyze_responses": time_calls(analyzer.analyze_responses, students, calls),
+        "micro/analyze_bulk1000": time_calls(analyzer.analyze_bulk, [students], max(1, calls // 100)),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Load test
+# -----------------------------------------------------------------------------
+def _load_app(catalog_path: str):
+    """Import main against a synthetic catalog with the response cache off, engines warm and ready."""
+    os.environ["CAREER_CATALOG_PATH"] = catalog_path
+    os.environ["RECOMMEND_CACHE_SIZE"] = "0"
+    # Not "eager": the engines are built by warm_up() below, as the startup hook does
+    os.environ["ENGINE_WARMUP"] = "background"
+    import main
+    main.warm_up()
+    if not main.service_ready.is_set():
+        raise RuntimeError("Engine warm-up failed (see the log); the app would answer 503")
+    return main
+
+
+async def _drive(client, method: str, path: str, bodies: List, requests: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            body = bodies[next_index % len(bodies)]
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    ms = np.asarray(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+    }
+
+
+def load_test(size: int, data_dir: str, seed: int, requests: int, concurrency: int) -> Dict:
+    import httpx
+
+    main = _load_app(synthetic.write_catalog(size, data_dir, seed))
+    students = synthetic.profiles(512, seed + 1)
+    profile_bodies = [{"profile": {**p, "aptitude": p["aptitude"]}} for p in students]
+    scenarios = {
+        f"load/recommend_careers/n={size}": ("POST", "/recommend/careers", profile_bodies),
+        f"load/recommend_streams/n={size}": ("POST", "/recommend/streams", profile_bodies),
+        "load/analyze_interests": ("POST", "/analyze/interests", synthetic.interest_responses(512, seed)),
+        "load/aptitude_score": ("POST", "/assess/aptitude/score", synthetic.aptitude_responses(512, seed)),
+    }
+
+    async def run_all():
+        results = {}
+        async with httpx.AsyncClient(app=main.app, base_url="http://bench") as client:
+            for name, (method, path, bodies) in scenarios.items():
+                results[name] = await _drive(client, method, path, bodies, requests, concurrency)
+        return results
+
+    try:
+        return asyncio.run(run_all())
+    finally:
+        main.engine_executor.shutdown()
+
+
+# -----------------------------------------------------------------------------
+# Baselines
+# -----------------------------------------------------------------------------
+def failures(report: Dict) -> List[str]:
+    """Scenarios that answered anything but 200; their timings measure the wrong thing."""
+    return [f"{name} errors: {metrics['errors']}/{metrics['requests']}"
+            for name, metrics in report["results"].items() if metrics.get("errors")]
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Human-readable regressions: metrics worse than baseline by more than
+    `threshold`, and every scenario with errors.
+    """
+    regressions = failures(current)
+    for name, metrics in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        for metric, direction in DIRECTIONS.items():
+            if metric not in metrics or not base.get(metric):
+                continue
+            change = (metrics[metric] - base[metric]) / base[metric]
+            if change * direction > threshold:
+                regressions.append(f"{name} {metric}: {base[metric]} -> {metrics[metric]} ({change:+.0%})")
+    return regressions
+
+
+def run(args) -> Dict:
+    results: Dict[str, Dict] = {}
+    if "micro" in args.only:
+        results.update(micro_careers(args.sizes, args.data_dir, args.seed, args.calls))
+        results.update(micro_aptitude(args.items, args.data_dir, args.seed, args.calls))
+        results.update(micro_interests(args.seed, args.calls))
+    if "load" in args.only:
+        results.update(load_test(args.load_size, args.data_dir, args.seed, args.requests, args.concurrency))
+    if args.startup:
+        from benchmarks.startup import measure
+        results["startup"] = {key: value["median"] for key, value in measure(args.startup_runs).items()}
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "argv": sys.argv[1:],
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EduPath ML benchmarks")
+    parser.add_argument("--only", nargs="+", default=["micro", "load"], choices=["micro", "load"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000],
+                        help="catalog sizes for micro-benchmarks (up to 100000)")
+    parser.add_argument("--items", type=int, default=2000, help="item bank size")
+    parser.add_argument("--calls", type=int, default=500, help="calls per micro-benchmark")
+    parser.add_argument("--load-size", type=int, default=1000, help="catalog size for the load test")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--startup", action="store_true", help="also measure import/warm-up time")
+    parser.add_argument("--startup-runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "edupath-bench"),
+                        help="cache for generated catalogs and item banks")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--save-baseline", help="store results as the baseline at this path")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    else:
+        errors = failures(report)
+        for line in errors:
+            print(f"FAILED {line}", file=sys.stderr)
+        if errors:
+            sys.exit(1)
@@ -0,0 +1,136 @@
+# ai-services/benchmarks/synthetic.py
+
+"""
+Deterministic synthetic data for benchmarks: career catalogs, item banks,
+student profiles and assessment responses. The same (size, seed) always
+yields the same data, so numbers are comparable across runs and machines.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from models.catalog import FORMAT_VERSION, compile_catalog
+from models.constraints import JOB_MARKET_LEVELS
+from models.irt import DOMAINS
+from models.scoring import APTITUDE_KEYS, BIG_FIVE_KEYS, RIASEC_KEYS
+
+STREAMS = ["Science", "Commerce", "Arts", "Any"]
+DEGREES = {
+    "Science": ["B.Tech/B.E.", "B.Sc", "MBBS", "B.Sc/B.Tech"],
+    "Commerce": ["B.Com", "BBA", "CA", "B.Com/BBA"],
+    "Arts": ["BA", "BFA", "B.Des", "BA/BJMC"],
+    "Any": ["Any Graduate", "Diploma", "B.Ed"],
+}
+
+
+def careers(n: int, seed: int = 0) -> List[Dict]:
+    """`n` careers shaped like the built-in catalog; ~1 in 10 has a partial profile."""
+    rng = random.Random(seed)
+    # Separate streams so adding personality and the young prior didn't change the other fields for a seed
+    personality_rng = random.Random(seed + 1)
+    young_rng = random.Random(seed + 2)
+    out = []
+    for i in range(n):
+        stream = rng.choice(STREAMS)
+        riasec = {k: rng.randint(5, 95) for k in RIASEC_KEYS}
+        aptitude = {k: rng.randint(20, 95) for k in APTITUDE_KEYS}
+        if rng.random() < 0.1:
+            for k in rng.sample(RIASEC_KEYS, rng.randint(1, 3)):
+                del riasec[k]
+        if rng.random() < 0.1:
+            aptitude = {}
+        low = rng.randint(2, 15)
+        out.append({
+            "id": f"career_{i:06d}",
+            "name": f"Career {i}",
+            "riasec_profile": riasec,
+            "required_aptitude": aptitude,
+            "education_path": [stream, f"Track {rng.randint(1, 40)}", rng.choice(DEGREES[stream])],
+            "salary_range": f"₹{low}-{low + rng.randint(2, 30)} LPA",
+            "job_market": rng.choice(JOB_MARKET_LEVELS),
+            "description": f"Synthetic career {i} for benchmarking",
+            "personality_profile": {k: personality_rng.randint(5, 95) for k in BIG_FIVE_KEYS},
+            "young_prior": 1 if young_rng.random() < 0.05 else 0,
+        })
+    return out
+
+
+def write_catalog(n: int, directory: str, seed: int = 0) -> str:
+    """Compile a synthetic catalog of `n` careers into `directory`; returns the .bin path."""
+    os.makedirs(directory, exist_ok=True)
+    source = os.path.join(directory, f"careers_{n}_{seed}.json")
+    out = os.path.join(directory, f"careers_{n}_{seed}.v{FORMAT_VERSION}.bin")
+    if not os.path.exists(out):
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(careers(n, seed), f, ensure_ascii=False)
+        compile_catalog(source, out)
+    return out
+
+
+def item_bank(n: int, seed: int = 0) -> List[Dict]:
+    """`n` 2PL/3PL items spread evenly over the aptitude domains."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"item_{i:06d}",
+            "domain": DOMAINS[i % len(DOMAINS)],
+            "text": f"Synthetic item {i}",
+            "a": round(rng.uniform(0.5, 2.5), 3),
+            "b": round(rng.gauss(0.0, 1.2), 3),
+            "c": rng.choice([0.0, 0.0, 0.2, 0.25]),
+        }
+        for i in range(n)
+    ]
+
+
+def write_item_bank(n: int, directory: str, seed: int = 0) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"items_{n}_{seed}.json")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(item_bank(n, seed), f)
+    return path
+
+
+def profiles(n: int, seed: int = 0, aptitude_share: float = 0.7, personality: bool = False) -> List[Dict]:
+    """recommend_careers keyword arguments for `n` students (optionally with Big Five traits)."""
+    rng = random.Random(seed)
+    personality_rng = random.Random(seed + 1)
+    out = []
+    for _ in range(n):
+        profile = {
+            "interests": {k: round(rng.uniform(0, 100), 1) for k in RIASEC_KEYS},
+            "aptitude": ({k: round(rng.uniform(10, 100), 1) for k in APTITUDE_KEYS}
+                         if rng.random() < aptitude_share else None),
+            "class_level": rng.choice([9, 10, 11, 12]),
+        }
+        if personality:
+            profile["personality"] = {k: round(personality_rng.uniform(0, 100), 1) for k in BIG_FIVE_KEYS}
+        out.append(profile)
+    return out
+
+
+def interest_responses(n: int, seed: int = 0, per_student: int = 30) -> List[List[Dict]]:
+    """Interest questionnaires: `per_student` 1-5 ratings over the RIASEC categories."""
+    rng = random.Random(seed)
+    return [
+        [{"category": rng.choice(RIASEC_KEYS), "rating": rng.randint(1, 5)} for _ in range(per_student)]
+        for _ in range(n)
+    ]
+
+
+def aptitude_responses(n: int, seed: int = 0, per_student: int = 40,
+                       bank: Optional[List[Dict]] = None) -> List[List[Dict]]:
+    """Answer sheets [{id, domain, correct}] drawn from `bank` (or bare domains)."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if bank:
+            picked = rng.sample(bank, min(per_student, len(bank)))
+            out.append([{"id": it["id"], "domain": it["domain"], "correct": rng.random() < 0.6} for it in picked])
+        else:
+            out.append([{"id": f"q{j}", "domain": rng.choice(DOMAINS), "correct": rng.random() < 0.6}
+                        for j in range(per_student)])
+    return out
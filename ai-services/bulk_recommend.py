@@ -0,0 +1,158 @@
+# ai-services/bulk_recommend.py
+
+"""
+Offline bulk recommendations for a cohort file.
+
+Reads student profiles from CSV (or Parquet, needs pyarrow) in chunks,
+scores each chunk on a process pool with the batched career engine and
+streams top-k careers and streams per student to an NDJSON file.
+
+Input columns: realistic, investigative, artistic, social, enterprising,
+conventional; optional logical, numerical, spatial, verbal (blank = no
+aptitude), class_level and student_id. A row that cannot be scored is
+written as {"student_id", "error"} in its place.
+
+    python bulk_recommend.py cohort.csv results.ndjson --workers 8 --chunk-size 5000
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from models.scoring import APTITUDE_KEYS, RIASEC_KEYS
+
+# Engine owned by each pool worker, built once by _init_worker
+_engine = None
+
+
+def _init_worker():
+    global _engine
+    from models.recommender import CareerRecommendationEngine
+    _engine = CareerRecommendationEngine()
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq  # optional; only needed for Parquet input
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _value(row: Dict, key: str) -> Optional[float]:
+    v = row.get(key)
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number, got {v!r}") from None
+
+
+def _student_id(row: Dict):
+    """student_id as written to the output; blank cells (NaN) become null."""
+    v = row.get("student_id")
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def _profile(row: Dict) -> Dict:
+    """One row -> recommend_careers keyword arguments (plus student_id)."""
+    aptitude = {k: _value(row, k) for k in APTITUDE_KEYS}
+    class_level = _value(row, "class_level")
+    return {
+        "student_id": _student_id(row),
+        "interests": {k: _value(row, k) or 0.0 for k in RIASEC_KEYS},
+        "aptitude": aptitude if all(v is not None for v in aptitude.values()) else None,
+        "class_level": int(class_level) if class_level is not None else 10,
+    }
+
+
+def _profiles(chunk: pd.DataFrame) -> List[Dict]:
+    """
+    Rows -> profiles in row order. A row that cannot be read becomes
+    {"student_id", "error"} so one bad cell does not fail its whole chunk.
+    """
+    profiles = []
+    for row in chunk.to_dict("records"):
+        try:
+            profiles.append(_profile(row))
+        except (TypeError, ValueError, OverflowError) as e:
+            profiles.append({"student_id": _student_id(row), "error": str(e)})
+    return profiles
+
+
+def score_chunk(chunk: pd.DataFrame, top_k: int) -> bytes:
+    """Score one chunk in a worker; returns its NDJSON lines."""
+    profiles = _profiles(chunk)
+    valid = [p for p in profiles if "error" not in p]
+    careers = iter(_engine.recommend_careers_batch([{**p, "k": top_k} for p in valid]))
+    lines = []
+    for profile in profiles:
+        if "error" in profile:
+            lines.append(profile)
+            continue
+        recs = next(careers)
+        if isinstance(recs, Exception):
+            lines.append({"student_id": profile["student_id"], "error": str(recs)})
+            continue
+        streams = _engine.recommend_streams(profile["interests"], profile["aptitude"], profile["class_level"])
+        lines.append({
+            "student_id": profile["student_id"],
+            "careers": [{"id": r["career"]["id"], "fit_score": r["fit_score"],
+                         "interest_match": r["interest_match"], "aptitude_match": r["aptitude_match"]}
+                        for r in recs],
+            "streams": [{"stream": s["stream"], "fit_score": s["fit_score"]} for s in streams[:top_k]],
+        })
+    return "".join(json.dumps(line, default=str) + "\n" for line in lines).encode("utf-8")
+
+
+def run(source: str, output: str, workers: int, chunk_size: int, top_k: int,
+        progress_every: float = 2.0) -> int:
+    """Stream `source` through the pool into `output`; returns rows written."""
+    rows = 0
+    started = last_report = time.perf_counter()
+    # At most 2 chunks per worker are in flight, so memory stays bounded
+    in_flight: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, open(output, "wb") as out:
+        def drain_one():
+            nonlocal rows, last_report
+            n, future = in_flight.popleft()
+            out.write(future.result())
+            rows += n
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                print(f"{rows} rows, {rows / (now - started):.0f} rows/s", file=sys.stderr)
+
+        for chunk in _read_chunks(source, chunk_size):
+            in_flight.append((len(chunk), pool.submit(score_chunk, chunk, top_k)))
+            if len(in_flight) >= 2 * workers:
+                drain_one()
+        while in_flight:
+            drain_one()
+
+    elapsed = time.perf_counter() - started
+    print(f"done: {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)", file=sys.stderr)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk career/stream recommendations for a cohort file")
+    parser.add_argument("source", help="student profiles (.csv or .parquet)")
+    parser.add_argument("output", help="NDJSON output path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    run(args.source, args.output, args.workers, args.chunk_size, args.top_k)
@@ -1,23 +1,109 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import threading
+import time
 
 # Third-party / internal libs
-import numpy as np  # if engines use it
 from dotenv import load_dotenv
 
-# Your internal models
-from models.aptitude import AptitudeEngine
-from models.recommender import CareerRecommendationEngine
-from models.personality import PersonalityAnalyzer
+# Your internal models (engine modules themselves load lazily, see models/executor.py)
+from models.cache import cache_from_env, quantize
+from models.batching import MicroBatcher
+from models.executor import EngineExecutor, LazyEngines, Overloaded
+from models.metrics import METRICS, current_trace, stage
+from models.persistence import result_writer_from_env
+from models.records import check_projection, dumps, render_recommendations
+from models.sessions import AlreadyAnswered, AptitudeSessions, session_store_from_env
 
 load_dotenv()
 
+# METRICS_ENABLED=0 turns instrumentation off; METRICS_PROFILE_SAMPLE_RATE (0..1)
+# is the fraction of requests whose stage breakdown is logged to edupath.profile
+METRICS.configure(enabled=os.getenv("METRICS_ENABLED", "1") != "0",
+                  profile_sample_rate=float(os.getenv("METRICS_PROFILE_SAMPLE_RATE", "0")))
+
+# -----------------------------------------------------------------------------
+# Request instrumentation
+# -----------------------------------------------------------------------------
+def _timed_endpoint(endpoint):
+    """Wrap an endpoint to mark where its own work starts and ends in the request trace."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            trace = current_trace()
+            if trace is not None:
+                trace.handler_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    trace.handler_finished = time.perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            trace = current_trace()
+            if trace is not None:
+                trace.handler_started = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    trace.handler_finished = time.perf_counter()
+    return timed
+
+class TimedRoute(APIRoute):
+    """
+    Route recording per-endpoint latency, status, payload sizes and the split
+    into validation (body parsing + pydantic), handler and serialization.
+    Endpoints are labelled by path template, so ids don't explode cardinality.
+    Streaming responses are timed up to the point their body starts.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            trace, token = METRICS.begin_request(self.path)
+            status, response = 500, None
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                length = request.headers.get("content-length")
+                body = getattr(response, "body", None)
+                METRICS.end_request(trace, token, request.method, status,
+                                    int(length) if length and length.isdigit() else None,
+                                    len(body) if body is not None else None)
+
+        return timed_handler
+
 # -----------------------------------------------------------------------------
 # App and CORS
 # -----------------------------------------------------------------------------
 app = FastAPI(docs_url="/docs", redoc_url="/redoc", openapi_url="/openapi.json")
+app.router.route_class = TimedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,14 +122,143 @@ def version():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: answers as soon as the process serves HTTP, before engines are built."""
     return {"status": "healthy", "service": "EduPathAI ML Services"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until engines (and the executor pool) are warm."""
+    if not service_ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "starting", "engines": engines.built()})
+    return {"status": "ready", "engines": engines.built()}
+
 # -----------------------------------------------------------------------------
 # Initialize ML engines
 # -----------------------------------------------------------------------------
-aptitude_engine = AptitudeEngine()
-career_recommender = CareerRecommendationEngine()
-personality_analyzer = PersonalityAnalyzer()
+# ENGINE_WARMUP: "background" (default) builds engines after startup without
+# blocking liveness, "eager" builds them at import, "lazy" on first use.
+ENGINE_WARMUP = os.getenv("ENGINE_WARMUP", "background")
+engines = LazyEngines()
+service_ready = threading.Event()
+if ENGINE_WARMUP == "eager":
+    engines.warm_up()
+
+# CPU-bound engine calls run off the event loop (ENGINE_EXECUTOR = inline | thread | process)
+engine_executor = EngineExecutor(
+    engines,
+    mode=os.getenv("ENGINE_EXECUTOR", "thread"),
+    workers=int(os.getenv("ENGINE_WORKERS", "4")),
+    max_queue=int(os.getenv("ENGINE_MAX_QUEUE", "64")),
+    retry_after=int(os.getenv("ENGINE_RETRY_AFTER", "1")),
+)
+
+def warm_up():
+    try:
+        if ENGINE_WARMUP != "lazy":
+            engines.warm_up()
+        engine_executor.start()
+        service_ready.set()
+    except Exception:
+        logging.getLogger(__name__).exception("Engine warm-up failed")
+
+@app.on_event("startup")
+def start_engine_executor():
+    if ENGINE_WARMUP == "background":
+        threading.Thread(target=warm_up, name="engine-warmup", daemon=True).start()
+    else:
+        warm_up()
+
+@app.on_event("shutdown")
+def stop_engine_executor():
+    engine_executor.shutdown()
+
+@app.get("/executor/stats")
+def executor_stats():
+    return engine_executor.stats()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of request and engine stage metrics."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profiles")
+def metric_profiles():
+    """Most recent sampled per-request stage breakdowns (METRICS_PROFILE_SAMPLE_RATE)."""
+    return list(METRICS.profiles)
+
+async def run_engine(engine: str, method: str, *args, **kwargs):
+    """Run an engine method on the executor; a full queue becomes a fast 503 with Retry-After."""
+    try:
+        return await engine_executor.run(engine, method, *args, **kwargs)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly",
+                            headers={"Retry-After": str(e.retry_after)})
+
+async def require_ready():
+    """Dependency for engine endpoints: a fast 503 with Retry-After until warm-up has finished."""
+    if not service_ready.is_set():
+        raise HTTPException(status_code=503, detail="Service is starting, retry shortly",
+                            headers={"Retry-After": str(engine_executor.retry_after)})
+
+async def engine(name: str):
+    """An engine for use on the event loop; a lazy one is built in the threadpool, never here."""
+    built = engines.get(name)
+    return built if built is not None else await run_in_threadpool(engines.__getitem__, name)
+
+# Response cache for /recommend/*. Keys are exact profiles unless RECOMMEND_CACHE_QUANTUM
+# opts in to snapping scores to that many points, which trades exact scores for hit rate
+recommendation_cache = cache_from_env(os.environ)
+CACHE_QUANTUM = float(os.getenv("RECOMMEND_CACHE_QUANTUM", "0"))
+
+@app.on_event("shutdown")
+def stop_recommendation_cache():
+    recommendation_cache.close()
+
+@app.get("/cache/stats")
+def cache_stats():
+    return recommendation_cache.stats()
+
+# Opt-in micro-batching of concurrent /recommend/careers calls (RECOMMEND_BATCH_WINDOW_MS > 0).
+# Scoring and top-k run on the whole batch matrix; the work is memory-bound, so the gain
+# shrinks as the catalog grows (about parity at 100k careers). Measure before turning it on.
+BATCH_WINDOW_MS = float(os.getenv("RECOMMEND_BATCH_WINDOW_MS", "0"))
+career_batcher = None
+if BATCH_WINDOW_MS > 0:
+    career_batcher = MicroBatcher(
+        lambda items: run_engine("career", "recommend_careers_batch", items),
+        window=BATCH_WINDOW_MS / 1000,
+        max_batch=int(os.getenv("RECOMMEND_BATCH_MAX", "32")),
+    )
+
+# Write-behind audit trail of scored results (RESULTS_STORE, see models/persistence.py)
+result_writer = result_writer_from_env(os.environ)
+
+@app.on_event("startup")
+async def start_result_writer():
+    if result_writer is not None:
+        result_writer.start()
+
+@app.on_event("shutdown")
+async def stop_result_writer():
+    if result_writer is not None:
+        await result_writer.close()
+
+def persist(kind: str, endpoint: str, input, result, student_id: Optional[str] = None):
+    """Queue a result for the audit trail (input as the client sent it); a no-op when persistence is off."""
+    if result_writer is not None:
+        result_writer.record(kind, input, result, endpoint=endpoint, student_id=student_id)
+
+@app.get("/persistence/stats")
+def persistence_stats():
+    if result_writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_writer.stats()}
+
+@app.get("/batch/stats")
+def batch_stats():
+    if career_batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **career_batcher.stats()}
 
 # -----------------------------------------------------------------------------
 # Pydantic schemas (rich)
@@ -75,112 +290,440 @@ class StudentProfile(BaseModel):
     personality: Optional[PersonalityTraits] = None
     class_level: int
     location: Optional[Dict] = None
+    # e.g. {"min_salary": 8, "streams": ["Commerce"], "job_market": "Good+", "degrees": ["B.Com"]}
     constraints: Optional[Dict] = None
 
 class RecommendationRequest(BaseModel):
     profile: StudentProfile
     recommendation_type: str = "career"  # "career", "stream", "college"
+    # /recommend/careers only: "compact" returns career ids and scores; `fields`
+    # projects the career object (e.g. ["name", "salary_range"]); static career
+    # data is served by /catalog/careers
+    response_mode: str = "full"
+    fields: Optional[List[str]] = None
 
 # -----------------------------------------------------------------------------
 # Interests analysis
 # -----------------------------------------------------------------------------
-@app.post("/analyze/interests")
-async def analyze_interests(responses: List[Dict]):
+@app.post("/analyze/interests", dependencies=[Depends(require_ready)])
+async def analyze_interests(responses: List[Dict], x_student_id: Optional[str] = Header(None)):
     """
     Analyze interest assessment responses and return RIASEC-like profile.
     Each response: {"category": one of categories, "rating": 1..5}
     """
     try:
-        profile: Dict[str, float] = {}
-        categories = ["realistic", "investigative", "artistic", "social", "enterprising", "conventional"]
-
-        # Group ratings by category
-        category_scores: Dict[str, List[float]] = {cat: [] for cat in categories}
-        for r in responses:
-            cat = r.get("category")
-            rating = r.get("rating")
-            if cat in category_scores and isinstance(rating, (int, float)):
-                category_scores[cat].append(float(rating))
-
-        # Averages
-        for cat, scores in category_scores.items():
-            profile[cat] = (sum(scores) / len(scores)) if scores else 0.0
-
-        # Normalize to 0-100
-        max_score = max(profile.values()) if profile else 1.0
-        if max_score <= 0:
-            max_score = 1.0
-        for cat in profile:
-            profile[cat] = (profile[cat] / max_score) * 100.0
-
-        # Top interests and interpretation
-        primary = sorted(profile.items(), key=lambda kv: kv[1], reverse=True)[:3]
-        interpretation = personality_analyzer.interpret_interests(profile)
-
-        return {
-            "profile": profile,
-            "primary_interests": primary,
-            "interpretation": interpretation
-        }
+        result = await run_engine("personality", "analyze_responses", responses)
+        persist("interest_profile", "/analyze/interests", responses, result, x_student_id)
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Students per vectorized chunk in /analyze/interests/bulk
+INTEREST_BULK_CHUNK = int(os.getenv("INTEREST_BULK_CHUNK", "1000"))
+# Longest accepted NDJSON line in bytes; longer lines are skipped, not buffered
+INTEREST_BULK_MAX_LINE = int(os.getenv("INTEREST_BULK_MAX_LINE", str(1 << 20)))
+
+async def _ndjson_lines(request: Request):
+    """
+    (line number, raw line) pairs from a streamed NDJSON body, skipping blank
+    lines. A line over INTEREST_BULK_MAX_LINE bytes comes back as None.
+    """
+    max_line = INTEREST_BULK_MAX_LINE
+    buffer = b""
+    line_no = 0
+    oversized = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if oversized or len(line) > max_line:
+                oversized = False
+                yield line_no, None
+            elif line.strip():
+                yield line_no, line
+        if len(buffer) > max_line:
+            # Drop the head of an overlong line; its tail is dropped at the newline
+            oversized, buffer = True, b""
+    if oversized or len(buffer) > max_line:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, buffer
+
+def _bulk_student(line: Optional[bytes]) -> tuple:
+    """(student_id, responses) from one NDJSON line; ValueError when it is malformed."""
+    if line is None:
+        raise ValueError(f"line longer than {INTEREST_BULK_MAX_LINE} bytes")
+    item = json.loads(line)
+    student_id, responses = (item.get("student_id"), item.get("responses")) if isinstance(item, dict) else (None, item)
+    if not isinstance(responses, list) or not all(isinstance(r, dict) for r in responses):
+        raise ValueError("expected a list of {category, rating} responses")
+    return student_id, responses
+
+async def _analyze_chunk(pending: List[tuple]) -> bytes:
+    """NDJSON for (index, line, student_id, responses, error) entries, in input order."""
+    students = [responses for *_, responses, error in pending if error is None]
+    results = iter(await run_engine("personality", "analyze_bulk", students) if students else ())
+    out = []
+    for index, line_no, student_id, responses, error in pending:
+        if error is None:
+            body = next(results)
+            persist("interest_profile", "/analyze/interests/bulk", responses, body,
+                    None if student_id is None else str(student_id))
+        else:
+            body = {"error": error}
+        out.append(json.dumps({"index": index, "line": line_no, "student_id": student_id, **body}))
+    return "".join(line + "\n" for line in out).encode("utf-8")
+
+async def _bulk_interest_results(request: Request):
+    pending: List[tuple] = []
+    index = 0
+    try:
+        async for line_no, line in _ndjson_lines(request):
+            try:
+                student_id, responses = _bulk_student(line)
+                pending.append((index, line_no, student_id, responses, None))
+            except ValueError as e:
+                pending.append((index, line_no, None, None, str(e)))
+            index += 1
+            if len(pending) >= INTEREST_BULK_CHUNK:
+                yield await _analyze_chunk(pending)
+                pending = []
+        if pending:
+            yield await _analyze_chunk(pending)
+    except Exception as e:
+        # Headers are already sent; report the failure in-band and stop
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        yield json.dumps({"error": detail}).encode("utf-8") + b"\n"
+
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that may run while the handler still reads the request body.
+    Starlette's version also listens for disconnects on the same receive channel,
+    which would swallow body chunks; here request.stream() sees the disconnect instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+@app.post("/analyze/interests/bulk", dependencies=[Depends(require_ready)])
+async def analyze_interests_bulk(request: Request):
+    """
+    Bulk interest analysis. Body is NDJSON, one student per line: either a list
+    of responses or {"student_id": ..., "responses": [...]}. Students are
+    analyzed in vectorized chunks and NDJSON results stream back as each chunk
+    completes, so memory stays flat. Every non-blank input line gets one output
+    line, in input order, tagged with its index and line number; malformed or
+    overlong (INTEREST_BULK_MAX_LINE) lines get {"error": ...} in their place.
+    """
+    return _BodyStreamingResponse(_bulk_interest_results(request), media_type="application/x-ndjson")
+
 # -----------------------------------------------------------------------------
 # Aptitude (adaptive) APIs
 # -----------------------------------------------------------------------------
-@app.post("/assess/aptitude/next-question")
+@app.post("/assess/aptitude/next-question", dependencies=[Depends(require_ready)])
 async def get_next_aptitude_question(current_performance: Dict):
     """Return the next question based on previous answers and current difficulty."""
     try:
-        question = aptitude_engine.get_next_question(
+        question = await run_engine(
+            "aptitude", "get_next_question",
             previous_answers=current_performance.get("answers", []),
             current_difficulty=current_performance.get("difficulty", 3),
         )
         return question
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/assess/aptitude/score")
-async def score_aptitude_test(responses: List[Dict]):
+@app.post("/assess/aptitude/score", dependencies=[Depends(require_ready)])
+async def score_aptitude_test(responses: List[Dict], x_student_id: Optional[str] = Header(None)):
     """Score completed aptitude assessment and return breakdown + insights."""
     try:
-        scores = aptitude_engine.calculate_scores(responses)
-        return {
-            "scores": scores,
-            "interpretation": aptitude_engine.interpret_scores(scores),
-            "strengths": aptitude_engine.identify_strengths(scores),
-        }
+        result = await run_engine("aptitude", "score_report", responses)
+        persist("aptitude_result", "/assess/aptitude/score", responses, result, x_student_id)
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# -----------------------------------------------------------------------------
+# Aptitude sessions: state stays server-side, each answer is an O(1) update.
+# Session calls wait on the store (Redis when shared), so they run in the threadpool.
+# -----------------------------------------------------------------------------
+aptitude_sessions = AptitudeSessions(lambda: engines["aptitude"], session_store_from_env(os.environ))
+
+@app.post("/assess/aptitude/session/start", dependencies=[Depends(require_ready)])
+async def start_aptitude_session(options: Optional[Dict] = None):
+    """Open a session; body may carry {"difficulty": 1..5}. Returns session_id and first question."""
+    try:
+        return await run_in_threadpool(aptitude_sessions.start, difficulty=(options or {}).get("difficulty", 3))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/assess/aptitude/session/{session_id}/answer", dependencies=[Depends(require_ready)])
+async def answer_aptitude_session(session_id: str, answer: Dict):
+    """
+    Record {"id", "correct": true/false} or {"id", "response"}; returns the next
+    question. Answering an item twice is a 409.
+    """
+    try:
+        return await run_in_threadpool(aptitude_sessions.answer, session_id, answer.get("id"),
+                                       correct=answer.get("correct"), response=answer.get("response"))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except AlreadyAnswered as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/assess/aptitude/session/{session_id}/next", dependencies=[Depends(require_ready)])
+async def next_aptitude_session_question(session_id: str):
+    try:
+        return await run_in_threadpool(aptitude_sessions.next, session_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/assess/aptitude/session/{session_id}/finish", dependencies=[Depends(require_ready)])
+async def finish_aptitude_session(session_id: str, x_student_id: Optional[str] = Header(None)):
+    """Score the session and close it."""
+    try:
+        result = await run_in_threadpool(aptitude_sessions.finish, session_id)
+        persist("aptitude_result", "/assess/aptitude/session/finish", {"session_id": session_id},
+                result, x_student_id)
+        return result
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # -----------------------------------------------------------------------------
 # Rich recommendations
 # -----------------------------------------------------------------------------
-@app.post("/recommend/careers")
-async def recommend_careers(request: RecommendationRequest):
+def _cache_profile(profile: "StudentProfile") -> Dict:
+    """Profile as engine kwargs, quantized when the cache is on so the result matches its key."""
+    step = CACHE_QUANTUM if recommendation_cache.enabled else 0
+    return {
+        "interests": quantize(profile.interests.dict(), step),
+        "aptitude": quantize(profile.aptitude.dict(), step) if profile.aptitude else None,
+        "personality": quantize(profile.personality.dict(), step) if profile.personality else None,
+        "class_level": profile.class_level,
+        "constraints": profile.constraints,
+    }
+
+async def _compute_careers(p: Dict) -> List[Dict]:
+    if career_batcher is not None:
+        return await career_batcher.submit(p)
+    return await run_engine("career", "recommend_careers", **p)
+
+def json_response(content: str, status_code: int = 200, headers: Optional[Dict] = None) -> Response:
+    """Response for an already-encoded JSON body (skips jsonable_encoder)."""
+    return Response(content, status_code=status_code, headers=headers, media_type="application/json")
+
+@app.post("/recommend/careers", dependencies=[Depends(require_ready)])
+async def recommend_careers(request: RecommendationRequest, x_student_id: Optional[str] = Header(None),
+                            x_tenant_id: Optional[str] = Header(None)):
+    """X-Tenant-Id selects the tenant's scoring weight set (SCORING_WEIGHTS_PATH), if it has one."""
     try:
-        recs = career_recommender.recommend_careers(
-            interests=request.profile.interests.dict(),
-            aptitude=request.profile.aptitude.dict() if request.profile.aptitude else None,
-            personality=request.profile.personality.dict() if request.profile.personality else None,
-            class_level=request.profile.class_level,
-        )
-        return {"recommendations": recs}
+        check_projection(request.response_mode, request.fields)
+        career = await engine("career")
+        p = _cache_profile(request.profile)
+        p["weights"] = career.weight_set_name(x_tenant_id)
+        key = recommendation_cache.make_key("careers", career.catalog_version, p)
+        recs = await recommendation_cache.get_or_compute_async(key, lambda: _compute_careers(p))
+        persist("recommendation", "/recommend/careers", {**request.profile.dict(), "weights": p["weights"]}, [
+            {"career_id": r["career"]["id"], "fit_score": r["fit_score"],
+             "interest_match": r["interest_match"], "aptitude_match": r["aptitude_match"]}
+            for r in recs
+        ], x_student_id)
+        # Careers are spliced in as pre-rendered JSON fragments
+        body = render_recommendations(recs, request.response_mode, request.fields)
+        return json_response('{"recommendations":' + body + "}")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/recommend/streams", dependencies=[Depends(require_ready)])
+async def recommend_streams(request: RecommendationRequest, x_student_id: Optional[str] = Header(None)):
+    try:
+        p = _cache_profile(request.profile)
+        del p["personality"]
+        key = recommendation_cache.make_key("streams", (await engine("career")).catalog_version, p)
+        recs = await recommendation_cache.get_or_compute_async(
+            key, lambda: run_engine("career", "recommend_streams", **p))
+        persist("recommendation", "/recommend/streams", request.profile.dict(),
+                [{"stream": r["stream"], "fit_score": r["fit_score"]} for r in recs], x_student_id)
+        return json_response(dumps({"recommendations": recs}))
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/recommend/streams")
-async def recommend_streams(request: RecommendationRequest):
+def _location_number(location: Dict, key: str, default: Optional[float] = None) -> Optional[float]:
+    """profile.location[key] as a finite float (default when absent); ValueError otherwise."""
+    value = location.get(key, default)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = float(value)
+    except (TypeError, ValueError):
+        number = math.nan
+    if not math.isfinite(number):
+        raise ValueError(f"profile.location.{key} must be a number")
+    return number
+
+@app.post("/recommend/colleges", dependencies=[Depends(require_ready)])
+async def recommend_colleges(request: RecommendationRequest, x_student_id: Optional[str] = Header(None)):
+    """
+    Colleges near the student offering their recommended streams.
+    profile.location: {"latitude", "longitude", "radius_km" (default 50),
+    "max_fees" (cheapest annual fee in the stream), "k" (default 10)}.
+    """
     try:
-        recs = career_recommender.recommend_streams(
-            interests=request.profile.interests.dict(),
-            aptitude=request.profile.aptitude.dict() if request.profile.aptitude else None,
-            class_level=request.profile.class_level,
+        location = request.profile.location or {}
+        latitude, longitude = _location_number(location, "latitude"), _location_number(location, "longitude")
+        if latitude is None or longitude is None:
+            raise ValueError("profile.location needs latitude and longitude")
+        p = _cache_profile(request.profile)
+        del p["personality"]
+        key = recommendation_cache.make_key("streams", (await engine("career")).catalog_version, p)
+        streams = await recommendation_cache.get_or_compute_async(
+            key, lambda: run_engine("career", "recommend_streams", **p))
+        recs = await run_engine(
+            "college", "recommend_colleges",
+            latitude=latitude,
+            longitude=longitude,
+            stream_fits={s["stream"]: s["fit_score"] for s in streams},
+            radius_km=_location_number(location, "radius_km", 50),
+            k=int(_location_number(location, "k", 10)),
+            max_fees=_location_number(location, "max_fees"),
         )
-        return {"recommendations": recs}
+        persist("recommendation", "/recommend/colleges", request.profile.dict(), [
+            {"college_id": r["college"].get("id"), "stream": r["stream"],
+             "distance_km": r["distance_km"], "fit_score": r["fit_score"]}
+            for r in recs
+        ], x_student_id)
+        return json_response(dumps({"recommendations": recs}))
+    except HTTPException:
+        raise
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# -----------------------------------------------------------------------------
+# Live what-if exploration
+# -----------------------------------------------------------------------------
+def _what_if_snapshot(session) -> str:
+    return dumps({"type": "snapshot", "catalog_version": session.catalog.version,
+                  "recommendations": session.top})
+
+def _apply_what_if(session, message: Dict) -> Dict:
+    with stage("whatif.apply"):
+        return session.apply(message.get("interests"), message.get("aptitude"), message.get("class_level"))
+
+@app.websocket("/ws/recommend/careers")
+async def what_if_careers(websocket: WebSocket):
+    """
+    Live slider exploration over one connection.
+
+    Send {"type": "start", "profile": {...StudentProfile}, "k": 10}, then one
+    {"type": "set", "interests": {...}, "aptitude": {...}, "class_level": n}
+    per change (only the dimensions that moved; null clears one). The server
+    answers "start" with a "snapshot" of the top k (career ids and scores;
+    static data is at /catalog/careers) and each "set" with a "delta" holding
+    only the top-k entries whose rank or scores changed plus the ids that
+    dropped out. Bad messages get an "error" and the session carries on; so
+    does a message shed while the engine executor is full (the error then
+    carries "retry_after" seconds). The profile's personality and the X-Tenant-Id weight set apply as in
+    /recommend/careers.
+    """
+    await websocket.accept()
+    session, filters = None, {}
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind in ("start", "set") and not service_ready.is_set():
+                    raise ValueError("Service is starting, retry shortly")
+                if kind == "start":
+                    career = await engine("career")
+                    profile = StudentProfile(**message.get("profile", {}))
+                    filters = {"k": int(message.get("k", 10)), "constraints": profile.constraints,
+                               "weights": career.weight_set_name(websocket.headers.get("x-tenant-id"))}
+                    session = await engine_executor.call(
+                        career.what_if_session, profile.interests.dict(),
+                        profile.aptitude.dict() if profile.aptitude else None, profile.class_level,
+                        personality=profile.personality.dict() if profile.personality else None, **filters)
+                    await websocket.send_text(_what_if_snapshot(session))
+                elif kind == "set":
+                    if session is None:
+                        raise ValueError("Send a start message first")
+                    career = await engine("career")
+                    if session.catalog.version != career.catalog_version:
+                        # Catalog was reloaded: rebuild on the new one and resend everything
+                        session = await engine_executor.call(career.what_if_session, **session.profile(),
+                                                             **filters)
+                        await websocket.send_text(_what_if_snapshot(session))
+                    delta = await engine_executor.call(_apply_what_if, session, message)
+                    await websocket.send_text(dumps({"type": "delta", **delta}))
+                else:
+                    raise ValueError(f"Unknown message type: {kind!r}")
+            except Overloaded as e:
+                await websocket.send_text(dumps({"type": "error", "detail": "Server busy, retry shortly",
+                                                 "retry_after": e.retry_after}))
+            except (ValueError, TypeError, AttributeError) as e:
+                await websocket.send_text(dumps({"type": "error", "detail": str(e)}))
+    except WebSocketDisconnect:
+        pass
+
+# -----------------------------------------------------------------------------
+# Static career catalog (cacheable; pairs with response_mode="compact")
+# -----------------------------------------------------------------------------
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "3600"))
+
+def _catalog_response(http_request: Request, version: str, body) -> Response:
+    """ETag is the catalog version (content-derived), so checking it never renders the body."""
+    etag = '"%s"' % version
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}"}
+    match = http_request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in match.split(",")] or match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return json_response(body(), headers=headers)
+
+@app.get("/catalog/careers", dependencies=[Depends(require_ready)])
+def career_catalog(http_request: Request):
+    """Every career's static fields with the catalog version; honours If-None-Match."""
+    catalog = engines["career"].snapshot()
+    return _catalog_response(http_request, catalog.version, lambda: catalog.records.document(catalog.version))
+
+@app.get("/catalog/careers/{career_id}", dependencies=[Depends(require_ready)])
+def career_catalog_entry(career_id: str, http_request: Request):
+    """One career's static fields; shares the catalog's ETag."""
+    catalog = engines["career"].snapshot()
+    row = catalog.records.row(career_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Unknown career: {career_id}")
+    return _catalog_response(http_request, catalog.version, lambda: catalog.records.fragment(row))
+
 # -----------------------------------------------------------------------------
 # Simple /recommend endpoint (lightweight payload)
 # -----------------------------------------------------------------------------
@@ -1,35 +1,126 @@
 # ai-services/models/aptitude.py
 
-from typing import List, Dict
+import json
+import os
+from typing import Container, List, Dict, Optional
+
+from models.irt import DOMAINS, AbilityEstimate, ItemBank, difficulty_level, difficulty_to_theta
+from models.sessions import SessionState
 
 class AptitudeEngine:
     """
-    Minimal, dependency-light aptitude engine.
-    Produces next-question stubs and simple scoring so the API runs end-to-end.
-    Replace with your adaptive/IRT logic later if needed.
+    Dependency-light aptitude engine.
+    Next-question selection is adaptive (IRT, see models/irt.py): per domain,
+    the most informative unseen item at the current EAP ability estimate.
+    Scoring is simple percent-correct per domain.
     """
 
-    def __init__(self):
-        # Simple item bank (logical, numerical, spatial, verbal)
-        # In real app, load from DB or JSON
-        self.items = [
-            {"id": "L1", "domain": "logical", "text": "If all Bloops are Razzies and all Razzies are Lazzies, are all Bloops definitely Lazzies?", "answer": "Yes"},
-            {"id": "N1", "domain": "numerical", "text": "What is 15% of 200?", "answer": "30"},
-            {"id": "S1", "domain": "spatial", "text": "Rotate an L-shape 90° clockwise. Which orientation matches?", "answer": "C"},
-            {"id": "V1", "domain": "verbal", "text": "Choose the synonym of 'benevolent'", "answer": "Kind"},
-        ]
+    def __init__(self, item_bank_path: Optional[str] = None, max_items: int = 60, se_target: float = 0.3):
+        # Item bank (logical, numerical, spatial, verbal) with 2PL/3PL parameters a, b, c.
+        # APTITUDE_ITEM_BANK points to a JSON list of items; the sample bank is the fallback.
+        item_bank_path = item_bank_path or os.getenv("APTITUDE_ITEM_BANK")
+        if item_bank_path:
+            with open(item_bank_path, encoding="utf-8") as f:
+                self.items = json.load(f)
+        else:
+            self.items = [
+                {"id": "L1", "domain": "logical", "text": "If all Bloops are Razzies and all Razzies are Lazzies, are all Bloops definitely Lazzies?", "answer": "Yes", "a": 1.0, "b": 0.0, "c": 0.0},
+                {"id": "N1", "domain": "numerical", "text": "What is 15% of 200?", "answer": "30", "a": 1.0, "b": -0.5, "c": 0.0},
+                {"id": "S1", "domain": "spatial", "text": "Rotate an L-shape 90° clockwise. Which orientation matches?", "answer": "C", "a": 1.0, "b": 0.0, "c": 0.25},
+                {"id": "V1", "domain": "verbal", "text": "Choose the synonym of 'benevolent'", "answer": "Kind", "a": 1.0, "b": 0.0, "c": 0.25},
+            ]
+        self.bank = ItemBank(self.items)
+        self.max_items = max_items
+        # A domain stops receiving items once its ability SE drops below this
+        self.se_target = se_target
 
     def get_next_question(self, previous_answers: List[Dict], current_difficulty: int = 3) -> Dict:
         """
-        Very simple next-item selection: return the next unseen item.
+        Adaptive next-item selection.
         previous_answers: [{id, correct: bool}]
+        current_difficulty (1-5) sets the prior ability before any answers.
         """
-        answered_ids = {a.get("id") for a in previous_answers or []}
-        for item in self.items:
-            if item["id"] not in answered_ids:
-                # Do not reveal correct answer here
-                return {"id": item["id"], "domain": item["domain"], "text": item["text"], "difficulty": current_difficulty}
-        return {"done": True}
+        estimates = [AbilityEstimate(prior_mean=difficulty_to_theta(current_difficulty)) for _ in DOMAINS]
+        seen = set()
+        for a in previous_answers or []:
+            pos = self.bank.position.get(a.get("id"))
+            if pos is None or pos in seen:
+                continue
+            seen.add(pos)
+            estimates[self.bank.domain_codes[pos]].update(self.bank, pos, bool(a.get("correct")))
+        return self.select_item(estimates, seen)
+
+    def select_item(self, estimates: List[AbilityEstimate], seen: Container[int]) -> Dict:
+        """Pick the least-tested open domain, then its most informative unseen item."""
+        if sum(est.answered for est in estimates) >= self.max_items:
+            return {"done": True}
+        open_domains = [
+            d for d, est in enumerate(estimates)
+            if est.answered < self.bank.domain_size(d) and est.se > self.se_target
+        ]
+        if not open_domains:
+            return {"done": True}
+        domain = min(open_domains, key=lambda d: estimates[d].answered)
+        theta = estimates[domain].theta
+        pos = self.bank.most_informative(domain, theta, seen)
+        if pos is None:
+            return {"done": True}
+        item = self.items[pos]
+        # Do not reveal correct answer here
+        return {
+            "id": item["id"],
+            "domain": item["domain"],
+            "text": item["text"],
+            "difficulty": difficulty_level(self.bank.b[pos]),
+            "ability": round(theta, 2) + 0.0,  # no "-0.0"
+        }
+
+    # -------------------------------------------------------------------------
+    # Stateful sessions (see models/sessions.py): O(1) work per answer
+    # -------------------------------------------------------------------------
+    def new_session_state(self, difficulty: float = 3) -> SessionState:
+        return SessionState(len(self.bank), prior_mean=difficulty_to_theta(difficulty))
+
+    def record_answer(self, state: SessionState, item_id: str, correct: Optional[bool] = None,
+                      response: Optional[str] = None) -> bool:
+        """
+        Apply one answer. Correctness comes from `correct`, or is checked
+        server-side from `response`. Returns False for an already-seen item.
+        """
+        pos = self.bank.position.get(item_id)
+        if pos is None:
+            raise ValueError(f"Unknown item: {item_id}")
+        if correct is not None and not isinstance(correct, bool):
+            raise ValueError("'correct' must be true or false")
+        if pos in state.seen:
+            return False
+        if correct is None:
+            if response is None:
+                raise ValueError("Answer needs either 'correct' or 'response'")
+            key = self.items[pos].get("answer")
+            if key is None:
+                raise ValueError(f"Item {item_id} has no answer key to check 'response' against; send 'correct'")
+            correct = str(response).strip().lower() == str(key).strip().lower()
+        domain = self.bank.domain_codes[pos]
+        state.seen.add(pos)
+        state.estimates[domain].update(self.bank, pos, correct)
+        state.correct[domain] += 1 if correct else 0
+        return True
+
+    def session_report(self, state: SessionState) -> Dict:
+        """Same shape as score_report, plus per-domain ability estimates."""
+        scores = {}
+        for d, domain in enumerate(DOMAINS):
+            answered = state.estimates[d].answered
+            scores[domain] = round(100 * state.correct[d] / answered, 1) if answered else 50.0
+        return {
+            "scores": scores,
+            "interpretation": self.interpret_scores(scores),
+            "strengths": self.identify_strengths(scores),
+            "ability": {domain: {"theta": round(est.theta, 2) + 0.0, "se": round(est.se, 2)}
+                        for domain, est in zip(DOMAINS, state.estimates)},
+            "answered": state.total_answered,
+        }
 
     def calculate_scores(self, responses: List[Dict]) -> Dict:
         """
@@ -51,6 +142,15 @@ class AptitudeEngine:
                 scores[d] = 50.0  # neutral default
         return scores
 
+    def score_report(self, responses: List[Dict]) -> Dict:
+        """Scores plus interpretation and strengths, as returned by /assess/aptitude/score."""
+        scores = self.calculate_scores(responses)
+        return {
+            "scores": scores,
+            "interpretation": self.interpret_scores(scores),
+            "strengths": self.identify_strengths(scores),
+        }
+
     def interpret_scores(self, scores: Dict) -> Dict:
         def level(x):
             return "High" if x >= 70 else "Medium" if x >= 40 else "Developing"
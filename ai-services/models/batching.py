@@ -0,0 +1,83 @@
+# ai-services/models/batching.py
+
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent calls into one batch call.
+
+    Items submitted within `window` seconds of the first pending item (or
+    until `max_batch` items are pending) are handed to `batch_fn` together;
+    each caller gets back its own entry of the returned list. An entry that
+    is an exception is raised to that caller only. `batch_fn` may be a
+    coroutine function (e.g. one that runs the batch on an executor).
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], window: float = 0.002,
+                 max_batch: int = 32):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.counters = {"batches": 0, "items": 0, "size_flushes": 0, "window_flushes": 0, "errors": 0}
+        # batch size -> number of batches of that size
+        self.fill_histogram: Dict[int, int] = {}
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush("size")
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush, "window")
+        return await future
+
+    def _flush(self, reason: str):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.counters["batches"] += 1
+        self.counters["items"] += len(batch)
+        self.counters[f"{reason}_flushes"] += 1
+        self.fill_histogram[len(batch)] = self.fill_histogram.get(len(batch), 0) + 1
+        # Keep a reference: the loop only holds weak references to tasks
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]):
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            self.counters["errors"] += 1
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller went away
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "mean_batch_size": round(self.counters["items"] / batches, 2) if batches else 0.0,
+            "mean_fill": round(self.counters["items"] / (batches * self.max_batch), 4) if batches else 0.0,
+            "fill_histogram": dict(sorted(self.fill_histogram.items())),
+        }
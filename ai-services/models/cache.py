@@ -0,0 +1,184 @@
+# ai-services/models/cache.py
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def quantize(values: Optional[Dict], step: float) -> Optional[Dict]:
+    """Snap 0-100 scores to a grid of `step` points so near-identical profiles share a key."""
+    if values is None or step <= 0:
+        return values
+    return {k: round(round(v / step) * step, 6) if isinstance(v, (int, float)) else v
+            for k, v in values.items()}
+
+
+class RecommendationCache:
+    """
+    Size-bounded LRU with per-entry TTL, plus an optional shared tier.
+
+    The shared tier is any client with Redis-style `get(key)` and
+    `set(key, value, ex=seconds)` (a `redis.Redis`, or a local stand-in in
+    tests). Values must be JSON-serializable; shared-tier failures are
+    counted and otherwise ignored so the service keeps answering.
+    From get_or_compute_async the shared tier is only called on a small
+    thread pool, never on the event loop, and writes to it don't hold up
+    the caller. Returned values are shared between callers and must not
+    be mutated.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, shared: Any = None,
+                 namespace: str = "edupath:rec", clock: Callable[[], float] = time.monotonic,
+                 shared_workers: int = 4):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self.namespace = namespace
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_pool = None
+        if shared is not None:
+            self._shared_pool = ThreadPoolExecutor(max_workers=shared_workers, thread_name_prefix="cache-shared")
+        self.counters = {"hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0,
+                         "expirations": 0, "shared_errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 or self.shared is not None
+
+    def make_key(self, *parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{self.namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return value
+                del self._entries[key]
+                self.counters["expirations"] += 1
+        return None
+
+    def _get_shared(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.shared.get(key)
+        except Exception:
+            self.counters["shared_errors"] += 1
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self._store_local(key, value)
+        self.counters["shared_hits"] += 1
+        return value
+
+    def _set_shared(self, key: str, value: Any):
+        try:
+            # Career records may be lazy mappings (see models/catalog.py)
+            self.shared.set(key, json.dumps(value, default=dict), ex=max(1, int(self.ttl)))
+        except Exception:
+            self.counters["shared_errors"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get_local(key)
+        if value is None and self.shared is not None:
+            value = self._get_shared(key)
+        if value is None:
+            self.counters["misses"] += 1
+        return value
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() with the shared-tier lookup run off the event loop."""
+        value = self._get_local(key)
+        if value is None and self.shared is not None:
+            value = await asyncio.get_running_loop().run_in_executor(self._shared_pool, self._get_shared, key)
+        if value is None:
+            self.counters["misses"] += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        self._store_local(key, value)
+        if self.shared is not None:
+            self._set_shared(key, value)
+
+    def set_behind(self, key: str, value: Any):
+        """set() that only queues the shared-tier write."""
+        self._store_local(key, value)
+        if self.shared is not None:
+            self._shared_pool.submit(self._set_shared, key, value)
+
+    def _store_local(self, key: str, value: Any):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    async def get_or_compute_async(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await compute()
+        value = await self.get_async(key)
+        if value is None:
+            value = await compute()
+            self.set_behind(key, value)
+        return value
+
+    def close(self):
+        """Stop the shared-tier pool once queued writes finish."""
+        if self._shared_pool is not None:
+            self._shared_pool.shutdown(wait=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.counters["hits"] + self.counters["shared_hits"] + self.counters["misses"]
+        hits = self.counters["hits"] + self.counters["shared_hits"]
+        return {
+            **self.counters,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "shared": self.shared is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_from_env(env: Dict[str, str]) -> RecommendationCache:
+    """
+    RECOMMEND_CACHE_SIZE (0 disables the in-process tier), RECOMMEND_CACHE_TTL seconds,
+    RECOMMEND_CACHE_REDIS_URL for the optional shared tier.
+    """
+    shared = None
+    redis_url = env.get("RECOMMEND_CACHE_REDIS_URL")
+    if redis_url:
+        import redis  # only needed when the shared tier is configured
+        shared = redis.Redis.from_url(redis_url, socket_timeout=0.05)
+    return RecommendationCache(
+        max_size=int(env.get("RECOMMEND_CACHE_SIZE", "10000")),
+        ttl=float(env.get("RECOMMEND_CACHE_TTL", "300")),
+        shared=shared,
+    )
@@ -0,0 +1,413 @@
+# ai-services/models/catalog.py
+
+"""
+Compiled career catalog.
+
+A JSON/CSV catalog is compiled once into a columnar binary file:
+
+    header | column | column | ... | meta JSON
+
+Besides the raw profiles (riasec, aptitude, personality on a 0-100 scale,
+NaN = not listed) and the strings (uint64 offsets into one UTF-8 blob), the
+file holds everything the service would otherwise derive at load: the
+scorer's NaN-free matrices, masks and unit rows, the reasons' high-RIASEC
+flags, salary and job-market columns, a sorted id order, and row postings
+per stream, job market and degree. Meta lists each column's offset, dtype
+and shape plus the posting ranges.
+
+Workers mmap the file and use those arrays in place, so a worker start or a
+reload parses nothing and the OS shares the pages between uvicorn workers.
+Strings are decoded per field on access. Only the current format loads;
+files written in another format are rejected with a pointer to recompile.
+
+Always publish a new catalog with compile_catalog (write to a temp file, then
+os.replace): running workers keep reading the old inode until they swap.
+
+    python -m models.catalog careers.json catalog.bin
+"""
+
+import bisect
+import csv
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from models.constraints import ConstraintIndex
+from models.records import CompiledCareers, aligned_dimensions
+from models.scoring import APTITUDE_KEYS, BIG_FIVE_KEYS, RIASEC_KEYS, CareerIndex, CareerScorer
+from models.streams import StreamScorer
+
+MAGIC = b"EDUCAT01"
+FORMAT_VERSION = 3
+# Every format starts with the magic and the format version
+_PREFIX = struct.Struct("<8sI")
+# Magic, format version, n careers, meta offset, meta length
+_HEADER = struct.Struct("<8sIIQQ")
+
+STRING_FIELDS = ["id", "name", "education_path", "salary_range", "job_market", "description"]
+# List-valued string fields are joined with the ASCII unit separator
+_LIST_FIELDS = {"education_path"}
+_SEP = "\x1f"
+
+# Career field and key order of each raw profile column
+_PROFILES = (("riasec", "riasec_profile", RIASEC_KEYS),
+             ("aptitude", "required_aptitude", APTITUDE_KEYS),
+             ("personality", "personality_profile", BIG_FIVE_KEYS))
+# Posting groups: stream and job-market keys as CareerIndex uses them, degrees as ConstraintIndex does
+_POSTING_GROUPS = ("stream", "market", "degree", "open_to_any")
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------------------------------------------------------
+# Compilation
+# -----------------------------------------------------------------------------
+def _read_source(path: str) -> Dict:
+    """
+    Load careers (and optional streams) from JSON or CSV.
+    CSV columns: the string fields, RIASEC, aptitude and Big Five keys (blank = not listed)
+    and young_prior (blank = 0); education_path steps are separated by ";".
+    """
+    if path.lower().endswith(".csv"):
+        careers = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                career = {k: row.get(k, "") for k in STRING_FIELDS}
+                career["education_path"] = [s.strip() for s in career["education_path"].split(";") if s.strip()]
+                career["riasec_profile"] = {k: float(row[k]) for k in RIASEC_KEYS if row.get(k, "").strip()}
+                career["required_aptitude"] = {k: float(row[k]) for k in APTITUDE_KEYS if row.get(k, "").strip()}
+                career["personality_profile"] = {k: float(row[k]) for k in BIG_FIVE_KEYS if row.get(k, "").strip()}
+                career["young_prior"] = float(row.get("young_prior", "").strip() or 0)
+                careers.append(career)
+        return {"careers": careers}
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {"careers": data} if isinstance(data, list) else data
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _postings(groups: Dict[str, Dict[str, np.ndarray]]):
+    """Concatenate posting lists into one int64 array; returns (rows, {group: {key: [start, count]}})."""
+    chunks, ranges, pos = [], {}, 0
+    for group, postings in groups.items():
+        ranges[group] = {}
+        for key, rows in postings.items():
+            chunks.append(np.asarray(rows, dtype="<i8"))
+            ranges[group][key] = [pos, len(rows)]
+            pos += len(rows)
+    return np.concatenate(chunks + [np.zeros(0, dtype="<i8")]), ranges
+
+
+def compile_catalog(source: str, out_path: str) -> str:
+    """Compile a JSON/CSV catalog into the binary format; returns the catalog version."""
+    data = _read_source(source)
+    careers = data["careers"]
+    n = len(careers)
+
+    profiles = {name: np.full((n, len(keys)), np.nan) for name, _, keys in _PROFILES}
+    chunks: List[bytes] = []
+    offsets = np.zeros(n * len(STRING_FIELDS) + 1, dtype="<u8")
+    pos = 0
+    for i, career in enumerate(careers):
+        for name, field, keys in _PROFILES:
+            profile = career.get(field) or {}
+            for j, key in enumerate(keys):
+                if key in profile:
+                    profiles[name][i, j] = profile[key]
+        for f, field in enumerate(STRING_FIELDS):
+            value = career.get(field) or ""
+            if field in _LIST_FIELDS:
+                value = _SEP.join(value)
+            raw = str(value).encode("utf-8")
+            chunks.append(raw)
+            pos += len(raw)
+            offsets[i * len(STRING_FIELDS) + f + 1] = pos
+    blob = b"".join(chunks)
+
+    # Derived once here, exactly as the in-memory path derives it, so workers only map it
+    ids = [str(career.get("id") or "") for career in careers]
+    young_prior = np.array([float(career.get("young_prior") or 0) for career in careers])
+    scorer = CareerScorer.from_arrays(ids, profiles["riasec"], profiles["aptitude"], profiles["personality"],
+                                      young_prior)
+    index = CareerIndex(careers)
+    constraint_index = ConstraintIndex(careers, index)
+    postings, posting_ranges = _postings({
+        "stream": index.by_stream,
+        "market": index.by_market,
+        "degree": constraint_index.degree_rows,
+        "open_to_any": {"": index.open_to_any},
+    })
+    columns = {
+        **profiles,
+        **{f"scorer.{name}": getattr(scorer, name) for name in CareerScorer.COLUMNS},
+        "high_riasec": aligned_dimensions(profiles["riasec"]),
+        "salary_low": constraint_index.salary_low,
+        "market_level": constraint_index.market_level.astype("<i8"),
+        "id_order": np.array(sorted(range(n), key=ids.__getitem__), dtype="<i8"),
+        "postings": postings,
+        "string_offsets": offsets,
+        "strings": np.frombuffer(blob, dtype="u1"),
+    }
+
+    layout = {}
+    pos = _align(_HEADER.size)
+    for name, array in columns.items():
+        array = columns[name] = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        layout[name] = {"offset": pos, "dtype": array.dtype.str, "shape": list(array.shape)}
+        pos = _align(pos + array.nbytes)
+
+    digest = hashlib.sha1(json.dumps(data.get("streams"), sort_keys=True).encode("utf-8"))
+    for array in columns.values():
+        digest.update(array.tobytes())
+    meta = {"version": digest.hexdigest()[:16], "streams": data.get("streams"),
+            "columns": layout, "postings": posting_ranges}
+    meta_raw = json.dumps(meta).encode("utf-8")
+
+    tmp = f"{out_path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, n, pos, len(meta_raw)))
+        for name, array in columns.items():
+            f.write(b"\0" * (layout[name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+        f.write(b"\0" * (pos - f.tell()))
+        f.write(meta_raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, out_path)
+    return meta["version"]
+
+
+# -----------------------------------------------------------------------------
+# Memory-mapped reader
+# -----------------------------------------------------------------------------
+class CareerRecord(Mapping):
+    """Read-only career dict backed by the mapped file; fields decode on access."""
+
+    __slots__ = ("_catalog", "_row")
+
+    _KEYS = STRING_FIELDS + ["riasec_profile", "required_aptitude", "personality_profile", "young_prior"]
+
+    def __init__(self, catalog: "MappedCatalog", row: int):
+        self._catalog = catalog
+        self._row = row
+
+    def __getitem__(self, key):
+        if key == "riasec_profile":
+            return self._catalog.profile(self._row, self._catalog.riasec, RIASEC_KEYS)
+        if key == "required_aptitude":
+            return self._catalog.profile(self._row, self._catalog.aptitude, APTITUDE_KEYS)
+        if key == "personality_profile":
+            return self._catalog.profile(self._row, self._catalog.personality, BIG_FIVE_KEYS)
+        if key in STRING_FIELDS:
+            return self._catalog.string(self._row, key)
+        if key == "young_prior":
+            return float(self._catalog.young_prior[self._row])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __reduce__(self):
+        # The mmap can't cross process boundaries; ship a plain dict instead
+        return dict, (dict(self),)
+
+
+class StringColumn(Sequence):
+    """One string field of every career, decoded per access; find() searches the sorted id order."""
+
+    def __init__(self, catalog: "MappedCatalog", field: str):
+        self._catalog = catalog
+        self._field = field
+
+    def __len__(self) -> int:
+        return self._catalog.size
+
+    def __getitem__(self, row):
+        return self._catalog.string(int(row), self._field)
+
+    def find(self, value: str):
+        """Row holding `value` (ids only; needs a format 3 file), or None."""
+        order = self._catalog.columns["id_order"]
+        i = bisect.bisect_left(order, value, key=self.__getitem__)
+        if i < len(order) and self[order[i]] == value:
+            return int(order[i])
+        return None
+
+
+class MappedCatalog(Sequence):
+    """Sequence of CareerRecord over a compiled catalog file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt = _PREFIX.unpack_from(self._mm, 0) if len(self._mm) >= _PREFIX.size else (None, None)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled career catalog")
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"{path} is catalog format {fmt}, this service reads format {FORMAT_VERSION}; "
+                             "recompile the catalog: python -m models.catalog <source> <output>")
+        self._map_columns()
+        self.riasec = self.columns["riasec"]
+        self.aptitude = self.columns["aptitude"]
+        self.personality = self.columns["personality"]
+        self.young_prior = self.columns["scorer.young_prior"]
+        self._offsets = self.columns["string_offsets"]
+
+    def _array(self, offset: int, dtype: str, shape) -> np.ndarray:
+        count = int(np.prod(shape))
+        if count == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    def _map_columns(self):
+        _, _, n, meta_off, meta_len = _HEADER.unpack_from(self._mm, 0)
+        meta = json.loads(self._mm[meta_off:meta_off + meta_len])
+        self.size = n
+        self.version = meta["version"]
+        self.streams = meta.get("streams")
+        self.columns = {name: self._array(c["offset"], c["dtype"], tuple(c["shape"]))
+                        for name, c in meta["columns"].items()}
+        self._blob_off = meta["columns"]["strings"]["offset"]
+        rows = self.columns["postings"]
+        self.postings = {group: {key: rows[start:start + count] for key, (start, count) in ranges.items()}
+                         for group, ranges in meta["postings"].items()}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.size))]
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return CareerRecord(self, int(i))
+
+    def string(self, row: int, field: str):
+        k = row * len(STRING_FIELDS) + STRING_FIELDS.index(field)
+        start = self._blob_off + int(self._offsets[k])
+        end = self._blob_off + int(self._offsets[k + 1])
+        value = self._mm[start:end].decode("utf-8")
+        if field in _LIST_FIELDS:
+            return value.split(_SEP) if value else []
+        return value
+
+    @staticmethod
+    def profile(row: int, matrix: np.ndarray, keys: List[str]) -> Dict[str, float]:
+        return {k: float(v) for k, v in zip(keys, matrix[row]) if not np.isnan(v)}
+
+    def ids(self) -> StringColumn:
+        return StringColumn(self, "id")
+
+
+# -----------------------------------------------------------------------------
+# Snapshots and hot reload
+# -----------------------------------------------------------------------------
+class CatalogSnapshot:
+    """Everything derived from one catalog version; swapped as a unit on reload."""
+
+    def __init__(self, careers: Sequence, streams: Dict, version: str):
+        self.careers = careers
+        self.streams = streams
+        self.version = version
+        self.stream_scorer = StreamScorer(streams)
+        if isinstance(careers, MappedCatalog):
+            # Scorer, reasons and indexes use the mapped columns in place
+            columns = careers.columns
+            self.scorer = CareerScorer.from_columns(
+                careers.ids(), {name: columns[f"scorer.{name}"] for name in CareerScorer.COLUMNS})
+            self.records = CompiledCareers(careers, self.scorer.ids, columns["high_riasec"])
+            postings = careers.postings
+            self.index = CareerIndex.from_postings(len(careers), postings["stream"], postings["market"],
+                                                   postings["open_to_any"][""])
+            self.constraint_index = ConstraintIndex.from_columns(
+                self.index, columns["salary_low"], columns["market_level"], postings["degree"])
+            return
+        self.scorer = CareerScorer(careers)
+        self.records = CompiledCareers(careers, self.scorer.ids, aligned_dimensions(self.scorer.riasec))
+        self.index = CareerIndex(careers)
+        self.constraint_index = ConstraintIndex(careers, self.index)
+
+
+class CatalogSource:
+    """
+    Hands out the current CatalogSnapshot for a compiled catalog file. A
+    background thread stat()s the file every `check_interval` seconds and,
+    once it has been replaced, builds the new snapshot off to the side and
+    swaps the reference; current() never does more than read it, so request
+    handlers (async ones included) never wait on a rebuild.
+    """
+
+    def __init__(self, path: str, default_streams: Dict, check_interval: float = 2.0):
+        self.path = path
+        self.default_streams = default_streams
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stat_key = self._stat()
+        self._snapshot = self._load()
+        self._stopped = threading.Event()
+        if check_interval > 0:
+            threading.Thread(target=self._watch, name="catalog-reload", daemon=True).start()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self) -> CatalogSnapshot:
+        catalog = MappedCatalog(self.path)
+        return CatalogSnapshot(catalog, catalog.streams or self.default_streams, catalog.version)
+
+    def _watch(self):
+        while not self._stopped.wait(self.check_interval):
+            try:
+                self.reload_if_changed()
+            except Exception:
+                logger.exception("Reloading %s failed", self.path)
+
+    def current(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Swap in the file's current contents if it changed; a broken file keeps the old snapshot."""
+        with self._lock:
+            try:
+                key = self._stat()
+                if key == self._stat_key:
+                    return False
+                snapshot = self._load()
+            except (OSError, ValueError):
+                return False
+            self._stat_key = key
+            self._snapshot = snapshot
+            return True
+
+    def close(self):
+        """Stop watching the file."""
+        self._stopped.set()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a JSON/CSV career catalog for mmap loading")
+    parser.add_argument("source", help="careers .json (list or {careers, streams}) or .csv")
+    parser.add_argument("output", help="compiled catalog path")
+    args = parser.parse_args()
+    print(f"Compiled {args.output} (version {compile_catalog(args.source, args.output)})")
@@ -0,0 +1,254 @@
+# ai-services/models/colleges.py
+
+"""
+College recommendations near a student.
+
+Colleges are held in memory behind two indexes:
+  - GeoGrid: a uniform latitude/longitude grid (cell -> college positions),
+    so a radius query only looks at colleges in the cells its bounding box
+    touches
+  - per-stream posting lists of the colleges offering a course in that stream
+
+A query intersects the two (starting from whichever side is smaller),
+computes haversine distances for the survivors only and ranks them by
+stream fit, distance and college quality.
+
+Records follow backend/models/College.js (location.coordinates is
+[longitude, latitude]); COLLEGE_DATA_PATH points to a JSON list of them.
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.scoring import top_k
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Course degree -> streams it continues from class 12
+DEGREE_STREAMS = {
+    "BSc": ["Science"],
+    "BCA": ["Science"],
+    "BCom": ["Commerce"],
+    "BBA": ["Commerce"],
+    "BA": ["Arts"],
+}
+NAAC_GRADES = {"A++": 1.0, "A+": 0.9, "A": 0.8, "B++": 0.7, "B+": 0.6, "B": 0.5, "C": 0.4}
+
+# Ranking: stream fit (0-1), closeness within the radius (0-1), college quality (0-1)
+FIT_WEIGHT = 0.6
+DISTANCE_WEIGHT = 0.25
+QUALITY_WEIGHT = 0.15
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many, in km."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the radius."""
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    if dlon >= 180 or not -180 <= lon - dlon <= lon + dlon <= 180:
+        # Polar or across the antimeridian: search every longitude
+        return lat - dlat, lat + dlat, -180.0, 180.0
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+
+def college_courses(college: Dict) -> Dict[str, List[Dict]]:
+    """Courses grouped by the stream they follow (explicit `stream` wins over the degree)."""
+    out: Dict[str, List[Dict]] = {}
+    for course in college.get("courses") or []:
+        streams = [course["stream"]] if course.get("stream") else DEGREE_STREAMS.get(course.get("degree"), [])
+        for stream in streams:
+            out.setdefault(stream.lower(), []).append(course)
+    return out
+
+
+def college_quality(college: Dict) -> float:
+    """Mean of placement rate and NAAC grade on 0-1; 0.5 when neither is known."""
+    parts = []
+    placement = (college.get("rankings") or {}).get("placementRate")
+    if placement is not None:
+        parts.append(min(max(float(placement) / 100, 0.0), 1.0))
+    grade = (college.get("accreditation") or {}).get("naac")
+    if grade in NAAC_GRADES:
+        parts.append(NAAC_GRADES[grade])
+    return sum(parts) / len(parts) if parts else 0.5
+
+
+class GeoGrid:
+    """Uniform grid over latitude/longitude; each cell lists the positions inside it."""
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, cell_deg: float = 0.5):
+        self.cell_deg = cell_deg
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for pos, (lat, lon) in enumerate(zip(lats, lons)):
+            cells.setdefault(self._cell(lat, lon), []).append(pos)
+        self.cells = {cell: np.array(members, dtype=np.intp) for cell, members in cells.items()}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def query(self, box: Tuple[float, float, float, float]) -> np.ndarray:
+        """Positions in the cells overlapping `box` (a superset of those inside it)."""
+        lat0, lon0 = self._cell(box[0], box[2])
+        lat1, lon1 = self._cell(box[1], box[3])
+        if (lat1 - lat0 + 1) * (lon1 - lon0 + 1) > len(self.cells):
+            # Huge box: cheaper to walk the occupied cells
+            hits = [m for (a, b), m in self.cells.items() if lat0 <= a <= lat1 and lon0 <= b <= lon1]
+        else:
+            hits = [self.cells[(a, b)] for a in range(lat0, lat1 + 1) for b in range(lon0, lon1 + 1)
+                    if (a, b) in self.cells]
+        return np.concatenate(hits) if hits else np.zeros(0, dtype=np.intp)
+
+
+class CollegeRecommendationEngine:
+    def __init__(self, data_path: Optional[str] = None, cell_deg: float = 0.5):
+        data_path = data_path or os.getenv("COLLEGE_DATA_PATH")
+        if data_path:
+            with open(data_path, encoding="utf-8") as f:
+                data = json.load(f)
+            colleges = data["colleges"] if isinstance(data, dict) else data
+        else:
+            colleges = self._load_college_data()
+
+        # Only colleges with coordinates can be searched by distance
+        self.colleges = [c for c in colleges if len((c.get("location") or {}).get("coordinates") or []) == 2]
+        coords = np.array([c["location"]["coordinates"] for c in self.colleges], dtype=float).reshape(-1, 2)
+        self.lons, self.lats = coords[:, 0], coords[:, 1]
+        self.quality = np.array([college_quality(c) for c in self.colleges])
+        self.grid = GeoGrid(self.lats, self.lons, cell_deg)
+
+        # Per-stream posting lists, membership masks and cheapest annual fee (NaN = unknown)
+        self.courses = [college_courses(c) for c in self.colleges]
+        n = len(self.colleges)
+        postings: Dict[str, List[int]] = {}
+        fees: Dict[str, List[float]] = {}
+        for pos, by_stream in enumerate(self.courses):
+            for stream, courses in by_stream.items():
+                annual = [c["fees"]["annual"] for c in courses if (c.get("fees") or {}).get("annual") is not None]
+                postings.setdefault(stream, []).append(pos)
+                fees.setdefault(stream, []).append(min(annual) if annual else np.nan)
+        self.by_stream = {s: np.array(p, dtype=np.intp) for s, p in postings.items()}
+        self.offers: Dict[str, np.ndarray] = {}
+        self.stream_fees: Dict[str, np.ndarray] = {}
+        for stream, posting in self.by_stream.items():
+            self.offers[stream] = np.zeros(n, dtype=bool)
+            self.offers[stream][posting] = True
+            self.stream_fees[stream] = np.full(n, np.nan)
+            self.stream_fees[stream][posting] = fees[stream]
+
+    def _load_college_data(self) -> List[Dict]:
+        """Sample government colleges (J&K) in the backend's College schema"""
+        def college(cid, name, city, lat, lon, courses, naac=None, placement=None):
+            return {
+                "id": cid,
+                "name": name,
+                "type": "Government",
+                "location": {"type": "Point", "coordinates": [lon, lat], "city": city, "state": "Jammu and Kashmir"},
+                "courses": [{"name": n, "degree": d, "duration": 3, "fees": {"annual": fee}} for n, d, fee in courses],
+                "accreditation": {"naac": naac, "ugc": True},
+                "rankings": {"placementRate": placement},
+            }
+        return [
+            college("sp_college_srinagar", "Sri Pratap College", "Srinagar", 34.0740, 74.8190,
+                    [("B.Sc Physics", "BSc", 9000), ("B.Sc Computer Science", "BSc", 12000), ("BA English", "BA", 7000)],
+                    naac="A", placement=55),
+            college("gcw_ma_road_srinagar", "Government College for Women, M.A. Road", "Srinagar", 34.0735, 74.8160,
+                    [("BA Political Science", "BA", 6000), ("B.Com", "BCom", 8000), ("B.Sc Chemistry", "BSc", 9000)],
+                    naac="A", placement=48),
+            college("ggm_science_jammu", "Government Gandhi Memorial Science College", "Jammu", 32.7266, 74.8570,
+                    [("B.Sc Medical", "BSc", 10000), ("B.Sc Non-Medical", "BSc", 10000), ("BCA", "BCA", 15000)],
+                    naac="A", placement=60),
+            college("gcw_parade_jammu", "Government College for Women, Parade Ground", "Jammu", 32.7300, 74.8650,
+                    [("BA History", "BA", 6000), ("B.Com", "BCom", 8000), ("BBA", "BBA", 14000)],
+                    naac="B++", placement=45),
+            college("gdc_baramulla", "Government Degree College Baramulla", "Baramulla", 34.2090, 74.3430,
+                    [("BA Economics", "BA", 5000), ("B.Sc Botany", "BSc", 8000), ("B.Com", "BCom", 7000)],
+                    naac="B+"),
+            college("gdc_anantnag", "Government Degree College (Boys) Anantnag", "Anantnag", 33.7300, 75.1500,
+                    [("BA Urdu", "BA", 5000), ("B.Sc Zoology", "BSc", 8000), ("BCA", "BCA", 12000)],
+                    naac="B++", placement=40),
+            college("gdc_kathua", "Government Degree College Kathua", "Kathua", 32.3700, 75.5200,
+                    [("BA Geography", "BA", 5000), ("B.Com", "BCom", 7000)],
+                    naac="B"),
+        ]
+
+    def _candidates(self, stream: str, box: Tuple[float, float, float, float],
+                    geo: Optional[np.ndarray]) -> np.ndarray:
+        """Colleges offering `stream` inside `box`, starting from the smaller index."""
+        posting = self.by_stream.get(stream)
+        if posting is None:
+            return np.zeros(0, dtype=np.intp)
+        if geo is None or len(posting) < len(geo):
+            lats, lons = self.lats[posting], self.lons[posting]
+            inside = (lats >= box[0]) & (lats <= box[1]) & (lons >= box[2]) & (lons <= box[3])
+            return posting[inside]
+        return geo[self.offers[stream][geo]]
+
+    def recommend_colleges(self, latitude: float, longitude: float, stream_fits: Dict[str, float],
+                           radius_km: float = 50, k: int = 10, max_fees: Optional[float] = None) -> List[Dict]:
+        """
+        Top k colleges within `radius_km` offering one of the streams in
+        `stream_fits` ({stream: fit score 0-100}, e.g. from recommend_streams).
+        A college offering several of them is ranked by its best stream.
+        `max_fees` caps the cheapest annual fee in that stream (unknown fees pass).
+        """
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("latitude/longitude out of range")
+        if radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        box = bounding_box(latitude, longitude, radius_km)
+        geo = self.grid.query(box)
+
+        # (position, score, distance, stream) for every college/stream pair in range
+        hits, hit_streams = [], []
+        for stream, fit in stream_fits.items():
+            key = stream.lower()
+            cand = self._candidates(key, box, geo)
+            if max_fees is not None and len(cand):
+                cand = cand[~(self.stream_fees[key][cand] > max_fees)]
+            if not len(cand):
+                continue
+            d = haversine_km(latitude, longitude, self.lats[cand], self.lons[cand])
+            near = d <= radius_km
+            cand, d = cand[near], d[near]
+            if not len(cand):
+                continue
+            score = (FIT_WEIGHT * float(fit) / 100 + DISTANCE_WEIGHT * (1 - d / radius_km)
+                     + QUALITY_WEIGHT * self.quality[cand])
+            hits.append((cand, score, d, np.full(len(cand), len(hits))))
+            hit_streams.append(stream)
+        if not hits:
+            return []
+        pos, score, dist, which = (np.concatenate(parts) for parts in zip(*hits))
+
+        # Keep each college's best stream: sort by score, then first occurrence per position
+        order = np.lexsort((-score, pos))
+        pos, score, dist, which = pos[order], score[order], dist[order], which[order]
+        first = np.concatenate([[True], pos[1:] != pos[:-1]])
+        pos, score, dist, which = pos[first], score[first], dist[first], which[first]
+
+        results = []
+        for i in top_k(np.round(score * 100, 1), k):
+            stream = hit_streams[which[i]]
+            college = int(pos[i])
+            fee = self.stream_fees[stream.lower()][college]
+            results.append({
+                "college": self.colleges[college],
+                "stream": stream,
+                "courses": [c.get("name") for c in self.courses[college][stream.lower()]],
+                "distance_km": round(float(dist[i]), 1),
+                "min_annual_fee": None if np.isnan(fee) else float(fee),
+                "fit_score": round(float(score[i]) * 100, 1),
+            })
+        return results
@@ -0,0 +1,130 @@
+# ai-services/models/constraints.py
+
+import re
+from typing import Dict, List, Optional, Union
+import numpy as np
+
+from models.scoring import CareerIndex
+
+# Ordered worst -> best so "Good+" means Good or Excellent
+JOB_MARKET_LEVELS = ["Poor", "Average", "Good", "Excellent"]
+_MARKET_RANK = {name.lower(): i for i, name in enumerate(JOB_MARKET_LEVELS)}
+
+_SALARY_RE = re.compile(r"([\d.]+)\s*(?:-\s*([\d.]+))?\s*LPA", re.IGNORECASE)
+
+
+def parse_salary_range(text: Optional[str]) -> tuple:
+    """'₹6-25 LPA' -> (6.0, 25.0); unparseable -> (nan, nan)."""
+    m = _SALARY_RE.search(text or "")
+    if not m:
+        return float("nan"), float("nan")
+    low = float(m.group(1))
+    high = float(m.group(2)) if m.group(2) else low
+    return low, high
+
+
+def career_degrees(career: Dict) -> List[str]:
+    """Degree types parsed from the last education_path step (e.g. "BBA/B.Com")."""
+    path = career.get("education_path") or []
+    if len(path) < 3:
+        return []
+    return [d.strip() for d in path[-1].split("/") if d.strip()]
+
+
+def as_list(value: Union[str, List[str]], name: str) -> List[str]:
+    """A string-or-list constraint as a list; ValueError for anything else."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    raise ValueError(f"{name} must be a string or a list of strings")
+
+
+class ConstraintIndex:
+    """
+    Boolean-mask indexes over the career catalog, built once at load (or
+    mapped from a compiled catalog, see models/catalog.py).
+    A constraints dict is turned into AND-ed masks before any scoring happens.
+    Streams come from the catalog's CareerIndex postings rather than a second parse.
+
+    Supported constraints (all optional):
+        min_salary:  starting salary in LPA the career must reach (low end of salary_range)
+        streams:     stream(s) the student is in / willing to take; "Any" careers always match
+        job_market:  exact level(s), or "<level>+" for that level or better (e.g. "Good+")
+        degrees:     degree type(s) from education_path (e.g. "B.Com", "BBA")
+    """
+
+    def __init__(self, careers: List[Dict], index: CareerIndex):
+        degree_rows: Dict[str, List[int]] = {}
+        for i, career in enumerate(careers):
+            for degree in career_degrees(career):
+                rows = degree_rows.setdefault(degree.lower(), [])
+                if not rows or rows[-1] != i:
+                    rows.append(i)
+        self._setup(
+            index,
+            np.array([parse_salary_range(c.get("salary_range"))[0] for c in careers]),
+            np.array([_MARKET_RANK.get((c.get("job_market") or "").lower(), -1) for c in careers]),
+            {k: np.array(v, dtype=np.intp) for k, v in degree_rows.items()},
+        )
+
+    @classmethod
+    def from_columns(cls, index: CareerIndex, salary_low: np.ndarray, market_level: np.ndarray,
+                     degree_rows: Dict[str, np.ndarray]) -> "ConstraintIndex":
+        """Build from per-career columns and degree postings (e.g. mapped from a compiled catalog)."""
+        constraint_index = cls.__new__(cls)
+        constraint_index._setup(index, salary_low, market_level, degree_rows)
+        return constraint_index
+
+    def _setup(self, index: CareerIndex, salary_low: np.ndarray, market_level: np.ndarray,
+               degree_rows: Dict[str, np.ndarray]):
+        self.size = index.size
+        self.index = index
+        # Low end of salary_range in LPA (NaN when unparseable) and JOB_MARKET_LEVELS rank (-1 unknown)
+        self.salary_low = salary_low
+        self.market_level = market_level
+        # Sorted rows per lower-cased degree type
+        self.degree_rows = degree_rows
+
+    def _any_of(self, postings: Dict[str, np.ndarray], values: List[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for v in values:
+            rows = postings.get(v.lower())
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def _job_market_mask(self, value: Union[str, List[str]]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for v in as_list(value, "job_market"):
+            v = v.strip().lower()
+            at_least = v.endswith("+")
+            level = _MARKET_RANK.get(v.rstrip("+").strip())
+            if level is None:
+                raise ValueError(f"Unknown job_market level: {v!r}")
+            mask |= (self.market_level >= level) if at_least else (self.market_level == level)
+        return mask
+
+    def mask(self, constraints: Optional[Dict]) -> Optional[np.ndarray]:
+        """AND of all given constraints, or None when nothing constrains the catalog."""
+        if not constraints:
+            return None
+        masks = []
+        if constraints.get("min_salary") is not None:
+            try:
+                min_salary = float(constraints["min_salary"])
+            except (TypeError, ValueError):
+                raise ValueError("min_salary must be a number") from None
+            # NaN (unparseable salary) never satisfies a salary constraint
+            masks.append(self.salary_low >= min_salary)
+        if constraints.get("streams"):
+            stream_mask = np.zeros(self.size, dtype=bool)
+            stream_mask[self.index.candidates(streams=as_list(constraints["streams"], "streams"))] = True
+            masks.append(stream_mask)
+        if constraints.get("job_market"):
+            masks.append(self._job_market_mask(constraints["job_market"]))
+        if constraints.get("degrees"):
+            masks.append(self._any_of(self.degree_rows, as_list(constraints["degrees"], "degrees")))
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks)
@@ -0,0 +1,192 @@
+# ai-services/models/executor.py
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+MODES = ("inline", "thread", "process")
+ENGINE_NAMES = ("aptitude", "career", "college", "personality")
+
+# Engines owned by a process-pool child, built once by _init_worker
+_worker_engines: Optional[Dict[str, Any]] = None
+
+
+def build_engine(name: str) -> Any:
+    """Build one engine by name; engine modules are imported only here."""
+    if name == "aptitude":
+        from models.aptitude import AptitudeEngine
+        return AptitudeEngine()
+    if name == "career":
+        from models.recommender import CareerRecommendationEngine
+        return CareerRecommendationEngine()
+    if name == "college":
+        from models.colleges import CollegeRecommendationEngine
+        return CollegeRecommendationEngine()
+    if name == "personality":
+        from models.personality import PersonalityAnalyzer
+        return PersonalityAnalyzer()
+    raise KeyError(name)
+
+
+def build_engines() -> Dict[str, Any]:
+    """Engines by name, as addressed by EngineExecutor.run."""
+    return {name: build_engine(name) for name in ENGINE_NAMES}
+
+
+class LazyEngines:
+    """Engines by name, each built on first access (or all at once by warm_up)."""
+
+    def __init__(self):
+        self._engines: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[Any]:
+        """The engine if it is already built, else None (never builds)."""
+        return self._engines.get(name)
+
+    def __getitem__(self, name: str) -> Any:
+        engine = self._engines.get(name)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(name)
+                if engine is None:
+                    engine = self._engines[name] = build_engine(name)
+        return engine
+
+    def built(self) -> list:
+        return sorted(self._engines)
+
+    def warm_up(self):
+        for name in ENGINE_NAMES:
+            self[name]
+
+
+def _init_worker():
+    global _worker_engines
+    _worker_engines = build_engines()
+
+
+def _call_in_worker(engine: str, method: str, args: tuple, kwargs: Dict) -> Any:
+    return getattr(_worker_engines[engine], method)(*args, **kwargs)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class Overloaded(Exception):
+    """Raised instead of queueing when the executor's backlog is full."""
+
+    def __init__(self, retry_after: int, message: str = "Engine queue is full"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class NotStarted(Overloaded):
+    """Raised when a pooled executor is asked to run before start() (or after shutdown())."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after, "Engine executor is not running")
+
+
+class EngineExecutor:
+    """
+    Runs CPU-bound engine methods off the asyncio event loop.
+
+    mode "inline" calls the engine directly (no offloading), "thread" uses a
+    thread pool over the process's engines, "process" uses a process pool
+    whose children each build and keep their own engines (see start()).
+    Engines are never built on the calling (event loop) thread: a lazy
+    engine is built in a worker, or for "inline" in the default executor.
+    At most `workers + max_queue` calls may be in flight; beyond that run()
+    raises Overloaded right away so callers can shed load with a 503.
+    """
+
+    def __init__(self, engines: Dict[str, Any], mode: str = "thread", workers: int = 4,
+                 max_queue: int = 64, retry_after: int = 1):
+        if mode not in MODES:
+            raise ValueError(f"Unknown executor mode {mode!r}; expected one of {MODES}")
+        self.engines = engines
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.counters = {"completed": 0, "rejected": 0, "failed": 0}
+        self._pool: Optional[Executor] = None
+        self._local_pool: Optional[Executor] = None
+
+    def start(self):
+        """Create the pool; for processes, wait until every child has built its engines."""
+        if self.mode == "thread":
+            self._pool = self._local_pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                               thread_name_prefix="engine")
+        elif self.mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            for future in [self._pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+            self._local_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine-local")
+
+    def shutdown(self):
+        for pool in {self._pool, self._local_pool} - {None}:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._local_pool = None
+
+    def _call(self, engine: str, method: str, args: tuple, kwargs: Dict) -> Any:
+        return getattr(self.engines[engine], method)(*args, **kwargs)
+
+    async def run(self, engine: str, method: str, *args, **kwargs) -> Any:
+        if self.mode == "inline":
+            if self.engines.get(engine) is None:
+                await asyncio.get_running_loop().run_in_executor(None, self.engines.__getitem__, engine)
+            return self._call(engine, method, args, kwargs)
+        if self.mode == "process":
+            return await self._submit(self._pool, False, _call_in_worker, engine, method, args, kwargs)
+        return await self._submit(self._pool, True, self._call, engine, method, args, kwargs)
+
+    async def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn on objects that live in this process (e.g. a what-if session)
+        under the same in-flight limit. In "process" mode these go to a local
+        thread pool, since the objects can't be sent to the children.
+        """
+        if self.mode == "inline":
+            return fn(*args, **kwargs)
+        return await self._submit(self._local_pool, True, functools.partial(fn, *args, **kwargs))
+
+    async def _submit(self, pool: Optional[Executor], carry_context: bool, fn: Callable, *args) -> Any:
+        if pool is None:
+            raise NotStarted(self.retry_after)
+        if self.in_flight >= self.workers + self.max_queue:
+            self.counters["rejected"] += 1
+            raise Overloaded(self.retry_after)
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            if carry_context:
+                # Carry the caller's context so engine stage timings reach its request trace
+                future = loop.run_in_executor(pool, contextvars.copy_context().run, fn, *args)
+            else:
+                future = loop.run_in_executor(pool, fn, *args)
+            result = await future
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.counters["completed"] += 1
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            **self.counters,
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,114 @@
+# ai-services/models/irt.py
+
+"""
+Item response theory (IRT) helpers for adaptive aptitude testing.
+
+Items follow the 3PL model (2PL when c = 0) on the logistic metric:
+
+    P(correct | theta) = c + (1 - c) / (1 + exp(-a * (theta - b)))
+
+Response probabilities and Fisher information are precomputed for every
+item on a fixed theta grid, so ability updates and item selection are
+table lookups rather than per-item model evaluation.
+"""
+
+from typing import Container, Dict, List, Optional
+import numpy as np
+
+DOMAINS = ["logical", "numerical", "spatial", "verbal"]
+
+THETA_GRID = np.linspace(-4.0, 4.0, 81)
+
+# Edges on b between the API's difficulty levels (1 = easiest .. 5 = hardest)
+DIFFICULTY_EDGES = np.array([-1.5, -0.5, 0.5, 1.5])
+
+
+def difficulty_to_theta(difficulty: float) -> float:
+    """Map the 1-5 difficulty scale used by the API onto theta (3 -> 0)."""
+    return float(difficulty) - 3.0
+
+
+def difficulty_level(b: float) -> int:
+    """The 1-5 difficulty an item with parameter `b` is reported at (selection uses information, not this)."""
+    return int(np.searchsorted(DIFFICULTY_EDGES, b)) + 1
+
+
+class ItemBank:
+    """
+    Item parameters as arrays plus precomputed tables over THETA_GRID:
+      - log P(correct) and log P(incorrect) per item, for EAP updates
+      - per domain and grid point, that domain's items ordered by information
+    """
+
+    def __init__(self, items: List[Dict]):
+        self.items = items
+        self.ids = [item["id"] for item in items]
+        self.position = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.domain_codes = np.array([DOMAINS.index(item["domain"]) for item in items], dtype=np.int32)
+        self.a = np.array([float(item.get("a", 1.0)) for item in items])
+        self.b = np.array([float(item.get("b", 0.0)) for item in items])
+        self.c = np.array([float(item.get("c", 0.0)) for item in items])
+
+        # (n_items, n_grid) tables
+        p = self.c[:, None] + (1 - self.c[:, None]) / (1 + np.exp(-self.a[:, None] * (THETA_GRID - self.b[:, None])))
+        p = np.clip(p, 1e-9, 1 - 1e-9)
+        self.log_p = np.log(p)
+        self.log_q = np.log1p(-p)
+        self.information = (self.a[:, None] ** 2) * ((p - self.c[:, None]) ** 2 / (1 - self.c[:, None]) ** 2) * ((1 - p) / p)
+
+        # by_information[d][g] -> item positions of domain d, most informative at grid g first
+        self.by_information: Dict[int, np.ndarray] = {}
+        for d in range(len(DOMAINS)):
+            members = np.flatnonzero(self.domain_codes == d)
+            order = np.argsort(-self.information[members], axis=0, kind="stable")
+            self.by_information[d] = members[order].T.astype(np.int32)  # (n_grid, n_members)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def domain_size(self, domain: int) -> int:
+        return self.by_information[domain].shape[1]
+
+    @staticmethod
+    def grid_index(theta: float) -> int:
+        step = THETA_GRID[1] - THETA_GRID[0]
+        return int(np.clip(round((theta - THETA_GRID[0]) / step), 0, len(THETA_GRID) - 1))
+
+    def most_informative(self, domain: int, theta: float, seen: Container[int]) -> Optional[int]:
+        """
+        Position of the most informative unseen item of `domain` at `theta`, or None.
+        `seen` is any container of item positions (a set, or a session Bitset).
+        """
+        for pos in self.by_information[domain][self.grid_index(theta)]:
+            if int(pos) not in seen:
+                return int(pos)
+        return None
+
+
+class AbilityEstimate:
+    """
+    Expected-a-posteriori (EAP) ability on THETA_GRID with a normal prior.
+    Each answer adds one precomputed log-likelihood row, so updates are O(grid).
+    """
+
+    def __init__(self, prior_mean: float = 0.0, prior_sd: float = 1.0):
+        self.log_posterior = -0.5 * ((THETA_GRID - prior_mean) / prior_sd) ** 2
+        self.answered = 0
+
+    def update(self, bank: ItemBank, position: int, correct: bool):
+        self.log_posterior = self.log_posterior + (bank.log_p[position] if correct else bank.log_q[position])
+        self.answered += 1
+
+    def _weights(self) -> np.ndarray:
+        w = np.exp(self.log_posterior - self.log_posterior.max())
+        return w / w.sum()
+
+    @property
+    def theta(self) -> float:
+        return float(self._weights() @ THETA_GRID)
+
+    @property
+    def se(self) -> float:
+        w = self._weights()
+        mean = w @ THETA_GRID
+        return float(np.sqrt(w @ (THETA_GRID - mean) ** 2))
@@ -0,0 +1,231 @@
+# ai-services/models/metrics.py
+
+"""
+Low-overhead in-process metrics for the ML service.
+
+Counters and fixed-bucket histograms (an observation is one bisect and two
+adds) exported in the Prometheus text format, per-request timing marks and
+engine stage timers:
+
+    with stage("career.similarity"):
+        ...
+
+A sampled fraction of requests (profile_sample_rate) additionally keeps its
+full stage breakdown, which is logged and held in a small ring buffer.
+Stages that run on a process-pool worker (ENGINE_EXECUTOR=process) land in
+that worker's own registry and are not exported by the parent.
+"""
+
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; the +Inf bucket is implicit
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Bytes
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+HELP = {
+    "edupath_requests_total": "Requests by endpoint, method and status.",
+    "edupath_request_errors_total": "Requests answered with a 4xx/5xx status.",
+    "edupath_request_duration_seconds": "Time from routing to the response object, by endpoint.",
+    "edupath_request_phase_seconds": "Request time split into validation, handler and serialization.",
+    "edupath_request_bytes": "Request body size (Content-Length).",
+    "edupath_response_bytes": "Response body size (non-streaming responses).",
+    "edupath_engine_stage_seconds": "Time spent in each engine stage.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestTrace:
+    """Timing marks for one request; `stages` is only collected when sampled."""
+
+    __slots__ = ("endpoint", "started", "handler_started", "handler_finished", "stages")
+
+    def __init__(self, endpoint: str, sampled: bool):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.handler_started: Optional[float] = None
+        self.handler_finished: Optional[float] = None
+        self.stages: Optional[List[Tuple[str, float]]] = [] if sampled else None
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("edupath_request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = ['%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+             for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms keyed by metric name and label tuple."""
+
+    def __init__(self, enabled: bool = True, profile_sample_rate: float = 0.0, profile_keep: int = 100):
+        self.enabled = enabled
+        self.profile_sample_rate = profile_sample_rate
+        self.profiles: deque = deque(maxlen=profile_keep)
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("edupath.profile")
+
+    def configure(self, enabled: Optional[bool] = None, profile_sample_rate: Optional[float] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if profile_sample_rate is not None:
+            self.profile_sample_rate = profile_sample_rate
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def observe(self, name: str, value: float, labels: Labels = (),
+                buckets: Sequence[float] = LATENCY_BUCKETS):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(labels)
+            if hist is None:
+                hist = series[labels] = Histogram(buckets)
+            hist.observe(value)
+
+    def observe_stage(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        self.observe("edupath_engine_stage_seconds", seconds, (("stage", name),))
+        trace = _current_trace.get()
+        if trace is not None and trace.stages is not None:
+            trace.stages.append((name, seconds))
+
+    # -- requests ---------------------------------------------------------------
+
+    def begin_request(self, endpoint: str):
+        """Start timing a request; returns (trace, token) for end_request."""
+        sampled = self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate
+        trace = RequestTrace(endpoint, sampled)
+        return trace, _current_trace.set(trace)
+
+    def end_request(self, trace: RequestTrace, token, method: str, status: int,
+                    request_bytes: Optional[int] = None, response_bytes: Optional[int] = None):
+        _current_trace.reset(token)
+        if not self.enabled:
+            return
+        finished = time.perf_counter()
+        endpoint = (("endpoint", trace.endpoint),)
+        total = finished - trace.started
+        self.inc("edupath_requests_total", endpoint + (("method", method), ("status", str(status))))
+        if status >= 400:
+            self.inc("edupath_request_errors_total",
+                     endpoint + (("kind", "server" if status >= 500 else "client"),))
+        self.observe("edupath_request_duration_seconds", total, endpoint)
+
+        phases = {}
+        if trace.handler_started is not None:
+            handler_finished = trace.handler_finished or finished
+            phases = {
+                "validation": trace.handler_started - trace.started,
+                "handler": handler_finished - trace.handler_started,
+                "serialization": finished - handler_finished,
+            }
+            for phase, seconds in phases.items():
+                self.observe("edupath_request_phase_seconds", seconds, endpoint + (("phase", phase),))
+        if request_bytes is not None:
+            self.observe("edupath_request_bytes", request_bytes, endpoint, SIZE_BUCKETS)
+        if response_bytes is not None:
+            self.observe("edupath_response_bytes", response_bytes, endpoint, SIZE_BUCKETS)
+
+        if trace.stages is not None:
+            profile = {
+                "endpoint": trace.endpoint,
+                "method": method,
+                "status": status,
+                "total_ms": round(total * 1000, 3),
+                **{f"{phase}_ms": round(s * 1000, 3) for phase, s in phases.items()},
+                "stages": [{"stage": name, "ms": round(s * 1000, 3)} for name, s in trace.stages],
+            }
+            self.profiles.append(profile)
+            self._log.info(json.dumps(profile))
+
+    # -- export -----------------------------------------------------------------
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in series.items():
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        le = _format_labels(labels, 'le="%g"' % bound)
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    le = _format_labels(labels, 'le="+Inf"')
+                    lines.append(f"{name}_bucket{le} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum:.9g}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+        self.profiles.clear()
+
+
+# Process-wide registry; main.py configures it from the environment
+METRICS = MetricsRegistry()
+
+
+class stage:
+    """Context manager timing one engine stage into METRICS."""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        METRICS.observe_stage(self.name, time.perf_counter() - self.started)
+        return False
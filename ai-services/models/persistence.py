@@ -0,0 +1,215 @@
+# ai-services/models/persistence.py
+
+"""
+Write-behind persistence of scored results (the counselor audit trail).
+
+Handlers call ResultWriter.record(), which only appends to a bounded queue
+and returns; request latency never includes a database round trip. A
+background task drains the queue in batches of up to `batch_size`
+documents, or whatever arrived within `flush_interval` seconds of the
+first pending one, and hands each batch to the store's insert_many on a
+dedicated writer thread. When the queue is full new documents are dropped
+and counted rather than slowing requests down.
+
+Each document is {"kind", "created_at" (UTC), "student_id", "endpoint",
+"input", "result"}, with kind one of "interest_profile", "aptitude_result"
+or "recommendation".
+
+Stores (RESULTS_STORE):
+  - mongodb://...      MongoResultStore; pymongo's pooled client, unordered insert_many
+  - sqlite:///path.db  SQLiteResultStore; one executemany per batch
+  - memory             InMemoryResultStore, for tests and local runs
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Queued by close() so the drain task flushes its batch and exits
+_STOP = object()
+
+
+class InMemoryResultStore:
+    def __init__(self):
+        self.documents: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def insert_many(self, documents: List[Dict]):
+        with self._lock:
+            self.documents.extend(documents)
+
+    def close(self):
+        pass
+
+
+class SQLiteResultStore:
+    """One table, the document as JSON next to the columns counselors filter on."""
+
+    def __init__(self, path: str):
+        # Only the writer thread uses the connection after construction
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL, student_id TEXT, created_at TEXT NOT NULL, document TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_student ON results (student_id, created_at)")
+        self.conn.commit()
+
+    def insert_many(self, documents: List[Dict]):
+        rows = [(d["kind"], d.get("student_id"), d["created_at"].isoformat(), json.dumps(d, default=str))
+                for d in documents]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO results (kind, student_id, created_at, document) VALUES (?, ?, ?, ?)", rows)
+
+    def close(self):
+        self.conn.close()
+
+
+class MongoResultStore:
+    """Batches go out as one unordered insert_many over pymongo's connection pool."""
+
+    def __init__(self, url: str, database: str = "edupath", collection: str = "assessment_results",
+                 pool_size: int = 10):
+        import pymongo  # only needed when MongoDB is configured
+
+        self.client = pymongo.MongoClient(url, maxPoolSize=pool_size, w=1)
+        self.collection = self.client[database][collection]
+
+    def insert_many(self, documents: List[Dict]):
+        self.collection.insert_many(documents, ordered=False)
+
+    def close(self):
+        self.client.close()
+
+
+class ResultWriter:
+    """Bounded write-behind queue in front of a result store."""
+
+    def __init__(self, store: Any, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-writer")
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"recorded": 0, "dropped": 0, "written": 0, "failed": 0, "batches": 0,
+                         "size_flushes": 0, "interval_flushes": 0}
+
+    def record(self, kind: str, input: Any, result: Any, endpoint: Optional[str] = None,
+               student_id: Optional[str] = None):
+        """Queue one document; never blocks (a full queue drops it)."""
+        document = {
+            "kind": kind,
+            "created_at": datetime.now(timezone.utc),
+            "student_id": student_id,
+            "endpoint": endpoint,
+            "input": input,
+            "result": result,
+        }
+        try:
+            self._queue.put_nowait(document)
+            self.counters["recorded"] += 1
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+
+    def start(self):
+        """Start draining; call from the running event loop (app startup)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            document = await self._queue.get()
+            if document is _STOP:
+                return
+            batch = [document]
+            deadline = loop.time() + self.flush_interval
+            reason = "size"
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        reason = "interval"
+                        break
+                    try:
+                        document = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        reason = "interval"
+                        break
+                else:
+                    document = self._queue.get_nowait()
+                if document is _STOP:
+                    stopping = True
+                    break
+                batch.append(document)
+            self.counters[f"{reason}_flushes"] += 1
+            await self._write(batch)
+
+    async def _write(self, batch: List[Dict]):
+        self.counters["batches"] += 1
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._pool, self.store.insert_many, batch)
+            self.counters["written"] += len(batch)
+        except Exception:
+            self.counters["failed"] += len(batch)
+            logger.exception("Writing %d results failed", len(batch))
+
+    async def close(self, timeout: float = 5.0):
+        """Write whatever is still queued (waiting at most `timeout`), then release the store."""
+        try:
+            if self._task is None:
+                self._task = asyncio.get_running_loop().create_task(self._drain())
+            await asyncio.wait_for(self._queue.put(_STOP), timeout)
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Gave up flushing %d queued results on shutdown", self._queue.qsize())
+        self._task = None
+        self._pool.shutdown(wait=True)
+        self.store.close()
+
+    def stats(self) -> Dict:
+        return {**self.counters, "queued": self._queue.qsize(), "max_queue": self._queue.maxsize,
+                "batch_size": self.batch_size, "flush_interval_ms": self.flush_interval * 1000}
+
+
+def result_writer_from_env(env: Dict[str, str]) -> Optional[ResultWriter]:
+    """
+    RESULTS_STORE selects the store (unset = persistence off); RESULTS_QUEUE_SIZE,
+    RESULTS_BATCH_SIZE and RESULTS_FLUSH_MS tune the queue; RESULTS_MONGO_DB,
+    RESULTS_MONGO_COLLECTION and RESULTS_MONGO_POOL the MongoDB store.
+    """
+    url = env.get("RESULTS_STORE", "")
+    if not url:
+        return None
+    if url == "memory":
+        store = InMemoryResultStore()
+    elif url.startswith("sqlite:///"):
+        store = SQLiteResultStore(url[len("sqlite:///"):])
+    elif url.startswith(("mongodb://", "mongodb+srv://")):
+        store = MongoResultStore(
+            url,
+            database=env.get("RESULTS_MONGO_DB", "edupath"),
+            collection=env.get("RESULTS_MONGO_COLLECTION", "assessment_results"),
+            pool_size=int(env.get("RESULTS_MONGO_POOL", "10")),
+        )
+    else:
+        raise ValueError(f"Unsupported RESULTS_STORE: {url}")
+    return ResultWriter(
+        store,
+        max_queue=int(env.get("RESULTS_QUEUE_SIZE", "10000")),
+        batch_size=int(env.get("RESULTS_BATCH_SIZE", "500")),
+        flush_interval=float(env.get("RESULTS_FLUSH_MS", "1000")) / 1000,
+    )
@@ -1,27 +1,81 @@
 # ai-services/models/personality.py
 
 from typing import Dict, List
+import numpy as np
+
+CATEGORIES = ["realistic", "investigative", "artistic", "social", "enterprising", "conventional"]
+CATEGORY_CODES = {cat: i for i, cat in enumerate(CATEGORIES)}
+
+INTEREST_TIPS = {
+    "investigative": "Enjoys problem-solving and analysis; STEM and research pathways may fit well.",
+    "realistic": "Prefers hands-on, practical tasks; engineering, operations, or technical trades can fit.",
+    "artistic": "Values creativity and expression; design, media, or content roles may suit.",
+    "social": "Likes helping and collaborating; teaching, counseling, or community roles can align.",
+    "enterprising": "Enjoys leading and influencing; business, entrepreneurship, or management paths may fit.",
+    "conventional": "Organized and detail-focused; finance, analysis, or administrative roles may suit.",
+}
 
 class PersonalityAnalyzer:
     """
     Lightweight placeholder for personality/interest interpretations.
     """
 
+    def analyze_responses(self, responses: List[Dict]) -> Dict:
+        """
+        Analyze interest assessment responses and return RIASEC-like profile.
+        Each response: {"category": one of categories, "rating": 1..5}
+        """
+        return self.analyze_bulk([responses])[0]
+
+    def analyze_bulk(self, students: List[List[Dict]]) -> List[Dict]:
+        """
+        analyze_responses for many students at once.
+        Ratings are flattened to (student, category) codes and averaged with
+        bincount, then each row is normalized to 0-100 by its max.
+        """
+        n = len(students)
+        cells: List[int] = []
+        ratings: List[float] = []
+        for s, responses in enumerate(students):
+            base = s * len(CATEGORIES)
+            for r in responses:
+                code = CATEGORY_CODES.get(r.get("category"))
+                rating = r.get("rating")
+                if code is not None and isinstance(rating, (int, float)):
+                    cells.append(base + code)
+                    ratings.append(float(rating))
+
+        size = n * len(CATEGORIES)
+        cells_arr = np.array(cells, dtype=np.intp)
+        sums = np.bincount(cells_arr, weights=np.array(ratings, dtype=float), minlength=size)
+        sums = sums.astype(float).reshape(n, len(CATEGORIES))
+        counts = np.bincount(cells_arr, minlength=size).reshape(n, len(CATEGORIES))
+
+        # Averages
+        means = np.zeros_like(sums)
+        np.divide(sums, counts, out=means, where=counts > 0)
+
+        # Normalize to 0-100
+        max_scores = means.max(axis=1) if n else np.zeros(0)
+        max_scores[max_scores <= 0] = 1.0
+        profiles = (means / max_scores[:, None]) * 100.0
+
+        # Top interests and interpretation
+        top = np.argsort(-profiles, axis=1, kind="stable")[:, :3]
+        results = []
+        for row, order in zip(profiles.tolist(), top.tolist()):
+            results.append({
+                "profile": dict(zip(CATEGORIES, row)),
+                "primary_interests": [(CATEGORIES[i], row[i]) for i in order],
+                "interpretation": [INTEREST_TIPS[CATEGORIES[i]] for i in order],
+            })
+        return results
+
     def interpret_interests(self, profile: Dict[str, float]) -> List[str]:
         # profile has keys: realistic, investigative, artistic, social, enterprising, conventional (0–100)
         tips = []
         top = sorted(profile.items(), key=lambda x: x[1], reverse=True)[:3]
         for k, v in top:
-            if k == "investigative":
-                tips.append("Enjoys problem-solving and analysis; STEM and research pathways may fit well.")
-            elif k == "realistic":
-                tips.append("Prefers hands-on, practical tasks; engineering, operations, or technical trades can fit.")
-            elif k == "artistic":
-                tips.append("Values creativity and expression; design, media, or content roles may suit.")
-            elif k == "social":
-                tips.append("Likes helping and collaborating; teaching, counseling, or community roles can align.")
-            elif k == "enterprising":
-                tips.append("Enjoys leading and influencing; business, entrepreneurship, or management paths may fit.")
-            elif k == "conventional":
-                tips.append("Organized and detail-focused; finance, analysis, or administrative roles may suit.")
-        return tips or ["Balanced profile; explore multiple streams to discover preferences."]
\ No newline at end of file
+            if k in INTEREST_TIPS:
+                tips.append(INTEREST_TIPS[k])
+        return tips or ["Balanced profile; explore multiple streams to discover preferences."]
@@ -1,15 +1,65 @@
 import numpy as np
-import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
 from typing import Dict, List, Optional
+import hashlib
 import json
+import os
+
+from models.catalog import CatalogSnapshot, CatalogSource
+from models.constraints import as_list
+from models.metrics import stage
+from models.scoring import (APTITUDE_KEYS, BIG_FIVE_KEYS, RIASEC_KEYS, ScoringWeights, load_weight_sets,
+                            top_k, top_k_rows)
+from models.whatif import WhatIfSession
+
+# recommend_careers_batch: scratch budget per chunk (cache-sized chunks measured
+# fastest), and the (catalog,)-sized float arrays it keeps per request in a chunk
+BATCH_SCRATCH_BYTES = int(os.getenv("RECOMMEND_BATCH_SCRATCH_MB", "8")) << 20
+_BATCH_ROW_ARRAYS = 16
 
 class CareerRecommendationEngine:
-    def __init__(self):
-        self.career_data = self._load_career_data()
-        self.stream_data = self._load_stream_data()
-        self.scaler = StandardScaler()
+    def __init__(self, catalog_path: Optional[str] = None):
+        # Compiled catalog file (see models/catalog.py); falls back to the built-in catalog.
+        # CATALOG_RELOAD_INTERVAL is how often (seconds) a background thread checks it; 0 = never
+        catalog_path = catalog_path or os.getenv("CAREER_CATALOG_PATH")
+        self.catalog_source = None
+        if catalog_path:
+            self.catalog_source = CatalogSource(
+                catalog_path,
+                default_streams=self._load_stream_data(),
+                check_interval=float(os.getenv("CATALOG_RELOAD_INTERVAL", "2")),
+            )
+        else:
+            careers, streams = self._load_career_data(), self._load_stream_data()
+            # Content-derived like compiled catalogs' versions, so ETags and cache keys follow edits
+            digest = hashlib.sha1(json.dumps([careers, streams], sort_keys=True).encode("utf-8"))
+            self._builtin = CatalogSnapshot(careers, streams, "builtin-" + digest.hexdigest()[:12])
+        # Named fit-score weight sets (e.g. per tenant), applied per call on the same catalog matrices
+        self.weight_sets = load_weight_sets(os.getenv("SCORING_WEIGHTS_PATH"))
+    
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog and its derived matrices/indexes; read once per request."""
+        if self.catalog_source is not None:
+            return self.catalog_source.current()
+        return self._builtin
+    
+    @property
+    def career_data(self):
+        return self.snapshot().careers
+    
+    @property
+    def stream_data(self) -> Dict:
+        return self.snapshot().streams
+    
+    @property
+    def catalog_version(self) -> str:
+        return self.snapshot().version
+    
+    def weight_set_name(self, name: Optional[str]) -> str:
+        """`name` if it is a configured weight set, else "default"."""
+        return name if name in self.weight_sets else "default"
+    
+    def _weights(self, name: Optional[str]) -> ScoringWeights:
+        return self.weight_sets.get(name or "default", self.weight_sets["default"])
         
     def _load_career_data(self):
         """Load career database with RIASEC profiles and requirements"""
@@ -19,6 +69,8 @@ class CareerRecommendationEngine:
                 "name": "Software Engineer",
                 "riasec_profile": {"realistic": 20, "investigative": 90, "artistic": 30, "social": 20, "enterprising": 40, "conventional": 60},
                 "required_aptitude": {"logical": 85, "numerical": 70, "spatial": 60, "verbal": 50},
+                "personality_profile": {"openness": 70, "conscientiousness": 75, "extraversion": 35, "agreeableness": 50, "neuroticism": 40},
+                "young_prior": 0,
                 "education_path": ["Science", "Computer Science", "B.Tech/B.E."],
                 "salary_range": "₹6-25 LPA",
                 "job_market": "Excellent",
@@ -29,6 +81,8 @@ class CareerRecommendationEngine:
                 "name": "Data Scientist",
                 "riasec_profile": {"realistic": 30, "investigative": 95, "artistic": 20, "social": 30, "enterprising": 50, "conventional": 80},
                 "required_aptitude": {"logical": 90, "numerical": 95, "spatial": 40, "verbal": 60},
+                "personality_profile": {"openness": 80, "conscientiousness": 75, "extraversion": 35, "agreeableness": 50, "neuroticism": 40},
+                "young_prior": 0,
                 "education_path": ["Science", "Mathematics/Statistics", "B.Sc/B.Tech"],
                 "salary_range": "₹8-30 LPA",
                 "job_market": "Excellent",
@@ -39,6 +93,8 @@ class CareerRecommendationEngine:
                 "name": "Graphic Designer", 
                 "riasec_profile": {"realistic": 40, "investigative": 30, "artistic": 95, "social": 40, "enterprising": 60, "conventional": 30},
                 "required_aptitude": {"logical": 50, "numerical": 40, "spatial": 85, "verbal": 60},
+                "personality_profile": {"openness": 90, "conscientiousness": 55, "extraversion": 50, "agreeableness": 60, "neuroticism": 50},
+                "young_prior": 1,
                 "education_path": ["Arts/Science", "Fine Arts/Design", "BFA/B.Des"],
                 "salary_range": "₹3-12 LPA",
                 "job_market": "Good",
@@ -49,6 +105,8 @@ class CareerRecommendationEngine:
                 "name": "Teacher",
                 "riasec_profile": {"realistic": 20, "investigative": 60, "artistic": 50, "social": 95, "enterprising": 40, "conventional": 60},
                 "required_aptitude": {"logical": 70, "numerical": 60, "spatial": 30, "verbal": 90},
+                "personality_profile": {"openness": 60, "conscientiousness": 75, "extraversion": 70, "agreeableness": 85, "neuroticism": 35},
+                "young_prior": 1,
                 "education_path": ["Any", "Subject Specialization", "B.Ed"],
                 "salary_range": "₹3-8 LPA",
                 "job_market": "Good", 
@@ -59,6 +117,8 @@ class CareerRecommendationEngine:
                 "name": "Business Analyst",
                 "riasec_profile": {"realistic": 20, "investigative": 80, "artistic": 30, "social": 60, "enterprising": 85, "conventional": 70},
                 "required_aptitude": {"logical": 80, "numerical": 85, "spatial": 40, "verbal": 80},
+                "personality_profile": {"openness": 65, "conscientiousness": 75, "extraversion": 65, "agreeableness": 60, "neuroticism": 35},
+                "young_prior": 0,
                 "education_path": ["Commerce/Science", "Business/Economics", "BBA/B.Com"],
                 "salary_range": "₹5-18 LPA",
                 "job_market": "Excellent",
@@ -74,7 +134,23 @@ class CareerRecommendationEngine:
                 "career_paths": ["Engineering", "Medicine", "Research", "Technology"],
                 "entrance_exams": ["JEE", "NEET", "BITSAT"],
                 "suitable_interests": ["investigative", "realistic"],
-                "description": "For students interested in understanding how things work"
+                "description": "For students interested in understanding how things work",
+                "courses": {
+                    "PCM": {
+                        "subjects": ["Physics", "Chemistry", "Mathematics"],
+                        "entrance_exams": ["JEE", "BITSAT"],
+                        "interest_weights": {"investigative": 1, "realistic": 1},
+                        "aptitude_weights": {"logical": 1, "numerical": 2, "spatial": 1},
+                        "aptitude_reason": "Strong numerical, logical and spatial abilities"
+                    },
+                    "PCB": {
+                        "subjects": ["Physics", "Chemistry", "Biology"],
+                        "entrance_exams": ["NEET"],
+                        "interest_weights": {"investigative": 1, "realistic": 0.5, "social": 0.5},
+                        "aptitude_weights": {"logical": 1, "verbal": 1},
+                        "aptitude_reason": "Strong logical and verbal abilities"
+                    }
+                }
             },
             "Commerce": {
                 "subjects": ["Economics", "Accountancy", "Business Studies", "Mathematics"],
@@ -93,141 +169,152 @@ class CareerRecommendationEngine:
         }
     
     def recommend_careers(self, interests: Dict, aptitude: Optional[Dict] = None, 
-                         personality: Optional[Dict] = None, class_level: int = 10) -> List[Dict]:
-        """Generate career recommendations using hybrid approach"""
-        
-        recommendations = []
-        
-        for career in self.career_data:
-            # Calculate interest similarity
-            interest_similarity = self._calculate_similarity(interests, career["riasec_profile"])
-            
-            # Calculate aptitude match if available
-            aptitude_match = 0.5  # default neutral score
-            if aptitude and career.get("required_aptitude"):
-                aptitude_match = self._calculate_aptitude_match(aptitude, career["required_aptitude"])
-            
-            # Combined score
-            combined_score = (interest_similarity * 0.7) + (aptitude_match * 0.3)
-            
-            # Add contextual factors for class level
-            if class_level <= 10:
-                # Boost careers that are easier to understand for younger students
-                if career["id"] in ["teacher", "graphic_designer"]:
-                    combined_score += 0.1
-            
-            recommendations.append({
-                "career": career,
-                "fit_score": round(combined_score * 100, 1),
-                "interest_match": round(interest_similarity * 100, 1),
-                "aptitude_match": round(aptitude_match * 100, 1),
-                "reasons": self._generate_reasons(interests, career, interest_similarity)
-            })
+                         personality: Optional[Dict] = None, class_level: int = 10,
+                         k: int = 10, streams: Optional[List[str]] = None,
+                         job_markets: Optional[List[str]] = None,
+                         constraints: Optional[Dict] = None, weights: Optional[str] = None) -> List[Dict]:
+        """
+        Generate career recommendations using hybrid approach.
+        Optional `streams` / `job_markets` prefilter the catalog through the
+        precomputed index, and `constraints` (see ConstraintIndex) are applied
+        as AND-ed masks, all before scoring; only the top `k` get full results.
+        `personality` (Big Five, 0-100) is matched against the careers'
+        personality_profile; `weights` names a weight set (see ScoringWeights).
+        """
         
-        # Sort by fit score and return top 10
-        recommendations.sort(key=lambda x: x["fit_score"], reverse=True)
-        return recommendations[:10]
+        catalog = self.snapshot()
+        w = self._weights(weights)
+        with stage("career.filter"):
+            rows = self._candidate_rows(catalog, streams, job_markets, constraints)
+        if rows is not None and len(rows) == 0:
+            return []
+        with stage("career.similarity"):
+            similarity = catalog.scorer.interest_similarity(interests, rows)
+        with stage("career.aptitude_match"):
+            match, affinity = catalog.scorer.trait_match(aptitude, personality if w.personality else None, rows)
+        with stage("career.combine"):
+            fit = catalog.scorer.combine(similarity, match, class_level, rows, affinity, w)
+        return self._top_results(catalog, interests, fit, similarity, match, rows, k)
     
-    def recommend_streams(self, interests: Dict, aptitude: Optional[Dict] = None, 
-                         class_level: int = 10) -> List[Dict]:
-        """Recommend academic streams based on interests and aptitude"""
-        
-        stream_scores = {}
-        
-        for stream_name, stream_info in self.stream_data.items():
-            score = 0
-            reasons = []
-            
-            # Interest-based scoring
-            for suitable_interest in stream_info["suitable_interests"]:
-                if suitable_interest in interests:
-                    interest_score = interests[suitable_interest] / 100
-                    score += interest_score
-                    if interest_score > 0.6:
-                        reasons.append(f"High {suitable_interest} interest ({interests[suitable_interest]:.0f}%)")
-            
-            # Aptitude-based scoring (if available)
-            if aptitude:
-                if stream_name == "Science":
-                    aptitude_score = (aptitude["logical"] + aptitude["numerical"]) / 200
-                    score += aptitude_score
-                    if aptitude_score > 0.7:
-                        reasons.append("Strong logical and numerical abilities")
-                        
-                elif stream_name == "Commerce":
-                    aptitude_score = (aptitude["numerical"] + aptitude["verbal"]) / 200
-                    score += aptitude_score
-                    if aptitude_score > 0.7:
-                        reasons.append("Good numerical and verbal skills")
-                        
-                elif stream_name == "Arts":
-                    aptitude_score = aptitude["verbal"] / 100
-                    score += aptitude_score
-                    if aptitude_score > 0.7:
-                        reasons.append("Excellent verbal abilities")
-            
-            # Normalize score
-            score = score / (len(stream_info["suitable_interests"]) + (1 if aptitude else 0))
-            
-            stream_scores[stream_name] = {
-                "stream": stream_name,
-                "info": stream_info,
-                "fit_score": round(score * 100, 1),
-                "reasons": reasons,
-                "career_examples": self._get_stream_career_examples(stream_name)
-            }
-        
-        # Sort by fit score
-        sorted_streams = sorted(stream_scores.values(), key=lambda x: x["fit_score"], reverse=True)
-        return sorted_streams
+    def recommend_careers_batch(self, requests: List[Dict], scratch_bytes: int = BATCH_SCRATCH_BYTES) -> List:
+        """
+        Score many recommend_careers requests (dicts of its keyword arguments)
+        together. Each chunk's interest similarity, trait match, blend,
+        filters and top-k run on one (chunk, catalog) matrix; only building
+        the k result objects stays per request. Chunks are sized so their
+        scratch stays within about `scratch_bytes`. A request that fails
+        yields its exception in place so it doesn't fail the batch.
+        """
+        catalog = self.snapshot()
+        chunk = max(1, scratch_bytes // (_BATCH_ROW_ARRAYS * 8 * max(len(catalog.scorer), 1)))
+        results: List = [None] * len(requests)
+        for start in range(0, len(requests), chunk):
+            block = []
+            for i in range(start, min(start + chunk, len(requests))):
+                req = requests[i]
+                try:
+                    w = self._weights(req.get("weights"))
+                    personality = req.get("personality") if w.personality else None
+                    # Vectorize up front so a malformed request fails alone, not its chunk
+                    for values, keys in ((req["interests"], RIASEC_KEYS), (req.get("aptitude"), APTITUDE_KEYS),
+                                         (personality, BIG_FIVE_KEYS)):
+                        catalog.scorer._vectorize(values, keys)
+                    rows = self._candidate_rows(catalog, req.get("streams"), req.get("job_markets"),
+                                                req.get("constraints"))
+                    block.append((i, req, w, personality, rows))
+                except Exception as e:
+                    results[i] = e
+            if block:
+                for (i, *_), result in zip(block, self._recommend_block(catalog, block)):
+                    results[i] = result
+        return results
+
+    def _recommend_block(self, catalog: CatalogSnapshot, block: List[tuple]) -> List[List[Dict]]:
+        scorer = catalog.scorer
+        requests = [req for _, req, _, _, _ in block]
+        weights = [w for _, _, w, _, _ in block]
+        personalities = [personality for _, _, _, personality, _ in block]
+        with stage("career.similarity_batch"):
+            similarity = scorer.interest_similarity_batch([req["interests"] for req in requests])
+        with stage("career.aptitude_match_batch"):
+            match, affinity = scorer.trait_match_batch([req.get("aptitude") for req in requests], personalities)
+        with stage("career.combine_batch"):
+            fit = scorer.combine_batch(similarity, match, affinity,
+                                       [req.get("class_level", 10) for req in requests], weights,
+                                       [bool(personality) for personality in personalities])
+            keys = np.round(fit * 100, 1)
+            # Filtered-out careers rank below everything and are dropped after top-k
+            for b, (_, _, _, _, rows) in enumerate(block):
+                if rows is not None:
+                    excluded = np.ones(len(scorer), dtype=bool)
+                    excluded[rows] = False
+                    keys[b, excluded] = -np.inf
+        ks = [max(int(req.get("k", 10)), 0) for req in requests]
+        with stage("career.rank_batch"):
+            winners = top_k_rows(keys, max(ks))
+        return [
+            self._results(catalog, req["interests"], top[:k][keys[b, top[:k]] > -np.inf],
+                          fit[b], similarity[b], match[b], None)
+            for b, (req, top, k) in enumerate(zip(requests, winners, ks))
+        ]
     
-    def _calculate_similarity(self, profile1: Dict, profile2: Dict) -> float:
-        """Calculate cosine similarity between two profiles"""
-        keys = set(profile1.keys()) & set(profile2.keys())
-        if not keys:
-            return 0.0
-            
-        vec1 = np.array([profile1[k] for k in keys])
-        vec2 = np.array([profile2[k] for k in keys])
-        
-        return cosine_similarity([vec1], [vec2])
+    def what_if_session(self, interests: Dict, aptitude: Optional[Dict] = None, class_level: int = 10,
+                        k: int = 10, streams: Optional[List[str]] = None,
+                        job_markets: Optional[List[str]] = None,
+                        constraints: Optional[Dict] = None, personality: Optional[Dict] = None,
+                        weights: Optional[str] = None) -> WhatIfSession:
+        """Incrementally rescored recommend_careers state for live exploration (see models/whatif.py)."""
+        catalog = self.snapshot()
+        rows = self._candidate_rows(catalog, streams, job_markets, constraints)
+        return WhatIfSession(catalog, rows, interests, aptitude, class_level, k, personality, self._weights(weights))
     
-    def _calculate_aptitude_match(self, student_aptitude: Dict, required_aptitude: Dict) -> float:
-        """Calculate how well student's aptitude matches career requirements"""
-        matches = []
-        for skill, required_level in required_aptitude.items():
-            if skill in student_aptitude:
-                # Convert to 0-1 scale and calculate match
-                student_level = student_aptitude[skill] / 100
-                required_level = required_level / 100
-                match = 1 - abs(student_level - required_level)
-                matches.append(match)
-        
-        return sum(matches) / len(matches) if matches else 0.5
+    def _candidate_rows(self, catalog: CatalogSnapshot, streams: Optional[List[str]],
+                        job_markets: Optional[List[str]], constraints: Optional[Dict]) -> Optional[np.ndarray]:
+        """Catalog rows left after index prefilters and constraint masks; None = all."""
+        rows = catalog.index.candidates(streams=streams, job_markets=job_markets)
+        allowed = catalog.constraint_index.mask(constraints)
+        if allowed is not None:
+            rows = np.flatnonzero(allowed) if rows is None else rows[allowed[rows]]
+        return rows
     
-    def _generate_reasons(self, interests: Dict, career: Dict, similarity: float) -> List[str]:
-        """Generate human-readable reasons for career recommendation"""
-        reasons = []
-        
-        # Find top matching interests
-        career_interests = career["riasec_profile"]
-        for interest, student_score in interests.items():
-            career_score = career_interests.get(interest, 0)
-            if student_score > 60 and career_score > 60:
-                reasons.append(f"Your {interest} interests align well with this career")
-        
-        if similarity > 0.8:
-            reasons.append("Excellent overall personality match")
-        elif similarity > 0.6:
-            reasons.append("Good personality fit for this role")
-        
-        return reasons[:3]  # Top 3 reasons
+    def _top_results(self, catalog: CatalogSnapshot, interests: Dict, fit: np.ndarray,
+                     similarity: np.ndarray, match: np.ndarray, rows: Optional[np.ndarray],
+                     k: int) -> List[Dict]:
+        """Full result objects for the top k only."""
+        # Select top k by fit score as displayed; ties keep catalog order
+        with stage("career.rank"):
+            winners = top_k(np.round(fit * 100, 1), k)
+        return self._results(catalog, interests, winners, fit, similarity, match, rows)
     
-    def _get_stream_career_examples(self, stream_name: str) -> List[str]:
-        """Get example careers for each stream"""
-        stream_careers = {
-            "Science": ["Software Engineer", "Data Scientist", "Doctor", "Research Scientist"],
-            "Commerce": ["Business Analyst", "Chartered Accountant", "Investment Banker", "Entrepreneur"],
-            "Arts": ["Teacher", "Lawyer", "Journalist", "Civil Servant"]
-        }
-        return stream_careers.get(stream_name, [])
\ No newline at end of file
+    def _results(self, catalog: CatalogSnapshot, interests: Dict, winners: np.ndarray, fit: np.ndarray,
+                 similarity: np.ndarray, match: np.ndarray, rows: Optional[np.ndarray]) -> List[Dict]:
+        """Result objects for `winners`, indices into the score arrays (which `rows` maps to the catalog)."""
+        records = catalog.records
+        alignment = records.student_alignment(interests)
+        recommendations = []
+        with stage("career.reasons"):
+            for i in winners:
+                row = int(i if rows is None else rows[i])
+                interest_similarity = float(similarity[i])
+                recommendations.append({
+                    "career": records.ref(row),
+                    "fit_score": round(float(fit[i]) * 100, 1),
+                    "interest_match": round(interest_similarity * 100, 1),
+                    "aptitude_match": round(float(match[i]) * 100, 1),
+                    "reasons": records.reasons(row, alignment, interest_similarity)
+                })
+        return recommendations
+    
+    def recommend_streams(self, interests: Dict, aptitude: Optional[Dict] = None, 
+                         class_level: int = 10, constraints: Optional[Dict] = None) -> List[Dict]:
+        """
+        Recommend academic streams based on interests and aptitude, scored
+        from the catalog's stream weights (see models/streams.py); streams
+        with sub-courses list them, best first, under "courses".
+        A `streams` constraint limits the result to those streams.
+        """
+        streams = None
+        if constraints and constraints.get("streams"):
+            wanted = constraints["streams"]
+            streams = as_list(wanted, "streams")
+        return self.snapshot().stream_scorer.recommend(interests, aptitude, streams)
\ No newline at end of file
@@ -0,0 +1,187 @@
+# ai-services/models/records.py
+
+"""
+Compiled per-catalog career records.
+
+Built once per catalog snapshot so that assembling a recommendation only
+picks precomputed pieces by row:
+  - high_riasec: (n, 6) bool, the RIASEC dimensions each career scores above 60
+    (stored in compiled catalogs, see models/catalog.py)
+  - reason strings, interned once as module constants
+  - each career's static fields as a JSON fragment, rendered on first use
+    and reused by every response (and the catalog document) that includes it
+
+render_recommendations writes results in one of three shapes: "full" (the
+career object inline), "compact" (career id and scores only) or a
+projection of chosen career fields.
+"""
+
+import json
+import math
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.scoring import RIASEC_KEYS
+
+# A dimension explains a match when both student and career score above this
+ALIGN_THRESHOLD = 60
+ALIGN_REASONS = {k: f"Your {k} interests align well with this career" for k in RIASEC_KEYS}
+EXCELLENT_MATCH_REASON = "Excellent overall personality match"
+GOOD_FIT_REASON = "Good personality fit for this role"
+MAX_REASONS = 3
+
+# Career fields a projection may ask for, and the only ones rendered (catalog
+# entries may carry internal ranking inputs such as young_prior)
+CAREER_FIELDS = ("id", "name", "riasec_profile", "required_aptitude", "personality_profile",
+                 "education_path", "salary_range", "job_market", "description")
+RESPONSE_MODES = ("full", "compact")
+
+_COLUMN = {k: i for i, k in enumerate(RIASEC_KEYS)}
+
+
+def dumps(value) -> str:
+    """Same output as starlette's JSONResponse, without going through jsonable_encoder."""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def public_fields(career) -> Dict:
+    """The career's CAREER_FIELDS, in its own key order."""
+    return {k: v for k, v in career.items() if k in CAREER_FIELDS}
+
+
+class CareerRef(Mapping):
+    """
+    A career as it appears in results: a row reference into CompiledCareers
+    that reads like the career dict. Pickles (and caches) as a plain dict.
+    """
+
+    __slots__ = ("_records", "row")
+
+    def __init__(self, records: "CompiledCareers", row: int):
+        self._records = records
+        self.row = row
+
+    def __getitem__(self, key):
+        return self._records.careers[self.row][key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records.careers[self.row])
+
+    def __len__(self) -> int:
+        return len(self._records.careers[self.row])
+
+    @property
+    def json(self) -> str:
+        return self._records.fragment(self.row)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+def aligned_dimensions(riasec: np.ndarray) -> np.ndarray:
+    """(n, 6) bool: the RIASEC dimensions each career scores above ALIGN_THRESHOLD (NaN never does)."""
+    return riasec > ALIGN_THRESHOLD
+
+
+class CompiledCareers:
+    """
+    Per-row precomputed data for one catalog. `high_riasec` is aligned_dimensions()
+    of the catalog; `ids` may be a lazy column with a find(career_id) lookup.
+    """
+
+    def __init__(self, careers: Sequence, ids: Sequence[str], high_riasec: np.ndarray):
+        self.careers = careers
+        self.ids = ids
+        self.high_riasec = high_riasec
+        self._row_of: Optional[Dict[str, int]] = None
+        self._fragments: Dict[int, str] = {}
+        self._document: Optional[str] = None
+
+    def row(self, career_id: str) -> Optional[int]:
+        """Row of a career id, or None."""
+        find = getattr(self.ids, "find", None)
+        if find is not None:
+            return find(career_id)
+        if self._row_of is None:
+            self._row_of = {cid: row for row, cid in enumerate(self.ids)}
+        return self._row_of.get(career_id)
+
+    def ref(self, row: int) -> CareerRef:
+        return CareerRef(self, row)
+
+    def document(self, version: str) -> str:
+        """JSON of every career's static fields, built once per catalog."""
+        if self._document is None:
+            self._document = (f'{{"version":{dumps(version)},"careers":['
+                              + ",".join(self.fragment(row) for row in range(len(self.careers))) + "]}")
+        return self._document
+
+    def fragment(self, row: int) -> str:
+        fragment = self._fragments.get(row)
+        if fragment is None:
+            fragment = self._fragments[row] = dumps(public_fields(self.careers[row]))
+        return fragment
+
+    @staticmethod
+    def student_alignment(interests: Dict) -> List[Tuple[str, int]]:
+        """The student's (dimension, column) pairs above the threshold, in their dict order."""
+        return [(k, _COLUMN[k]) for k, v in interests.items() if v > ALIGN_THRESHOLD and k in _COLUMN]
+
+    def reasons(self, row: int, alignment: List[Tuple[str, int]], similarity: float) -> List[str]:
+        high = self.high_riasec[row]
+        reasons = [ALIGN_REASONS[k] for k, col in alignment if high[col]]
+        if similarity > 0.8:
+            reasons.append(EXCELLENT_MATCH_REASON)
+        elif similarity > 0.6:
+            reasons.append(GOOD_FIT_REASON)
+        return reasons[:MAX_REASONS]
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return repr(value)
+    return dumps(value)
+
+
+def check_projection(mode: str = "full", fields: Optional[List[str]] = None):
+    """Raise ValueError for an unknown response mode or career field."""
+    if mode not in RESPONSE_MODES:
+        raise ValueError(f"Unknown response mode {mode!r}; expected one of {RESPONSE_MODES}")
+    unknown = [f for f in fields or [] if f not in CAREER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown career fields {unknown}; expected any of {CAREER_FIELDS}")
+
+
+def _career_json(career, fields: Optional[List[str]]) -> str:
+    if fields is None:
+        return career.json if isinstance(career, CareerRef) else dumps(public_fields(career))
+    # The id is always kept so clients can join against /catalog/careers
+    return dumps({f: career.get(f) for f in ["id"] + [f for f in fields if f != "id"]})
+
+
+def render_recommendations(recommendations: List[Dict], mode: str = "full",
+                           fields: Optional[List[str]] = None) -> str:
+    """
+    JSON for recommend_careers results. "full" is byte-for-byte what
+    JSONResponse would produce for the careers' public fields (CAREER_FIELDS),
+    splicing in each career's cached fragment;
+    `fields` projects the career object; "compact" keeps the id and scores.
+    Results that came back through a cache or a process pool carry plain
+    dicts and are encoded normally.
+    """
+    parts = []
+    for rec in recommendations:
+        career = rec["career"]
+        scores = (f'"fit_score":{_number(rec["fit_score"])},'
+                  f'"interest_match":{_number(rec["interest_match"])},'
+                  f'"aptitude_match":{_number(rec["aptitude_match"])}')
+        if mode == "compact" and fields is None:
+            parts.append(f'{{"career_id":{dumps(career["id"])},{scores}}}')
+        else:
+            parts.append(f'{{"career":{_career_json(career, fields)},{scores},'
+                         f'"reasons":{dumps(rec["reasons"])}}}')
+    return "[" + ",".join(parts) + "]"
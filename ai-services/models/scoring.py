@@ -0,0 +1,447 @@
+# ai-services/models/scoring.py
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+RIASEC_KEYS = ["realistic", "investigative", "artistic", "social", "enterprising", "conventional"]
+APTITUDE_KEYS = ["logical", "numerical", "spatial", "verbal"]
+BIG_FIVE_KEYS = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+
+
+class ScoringWeights:
+    """
+    One weight set for the fit score:
+
+        fit = interest * similarity + aptitude * match                  (no personality given)
+        fit = (1 - personality) * (interest * similarity + aptitude * match)
+              + personality * affinity                                 (personality given)
+        fit += young_boost * young_prior when class_level <= young_max_class_level
+
+    young_prior is per career, from the catalog (e.g. 1 for careers younger
+    students relate to easily, 0 by default).
+
+    Weight sets are per call, so tenants can A/B them on the same catalog matrices.
+    """
+
+    FIELDS = ("interest", "aptitude", "personality", "young_boost", "young_max_class_level")
+
+    def __init__(self, interest: float = 0.7, aptitude: float = 0.3, personality: float = 0.2,
+                 young_boost: float = 0.1, young_max_class_level: int = 10):
+        for name, value in (("interest", interest), ("aptitude", aptitude), ("personality", personality),
+                            ("young_boost", young_boost)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} weight must be a non-negative number")
+        if personality > 1:
+            raise ValueError("personality weight must be at most 1")
+        self.interest = float(interest)
+        self.aptitude = float(aptitude)
+        self.personality = float(personality)
+        self.young_boost = float(young_boost)
+        self.young_max_class_level = int(young_max_class_level)
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> "ScoringWeights":
+        unknown = [k for k in values if k not in cls.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown scoring weights {unknown}; expected any of {cls.FIELDS}")
+        return cls(**values)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+DEFAULT_WEIGHTS = ScoringWeights()
+
+
+def load_weight_sets(path: Optional[str] = None) -> Dict[str, ScoringWeights]:
+    """
+    Named weight sets from a JSON file {"default": {...}, "<name>": {...}}.
+    Every set starts from "default" (itself starting from ScoringWeights()),
+    so a tenant only lists the weights it changes.
+    """
+    sets = {"default": DEFAULT_WEIGHTS}
+    if not path:
+        return sets
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    base = ScoringWeights.from_dict(config.get("default", {}))
+    sets["default"] = base
+    for name, values in config.items():
+        if name != "default":
+            sets[name] = ScoringWeights.from_dict({**base.to_dict(), **values})
+    return sets
+
+
+class CareerScorer:
+    """
+    Matrix form of the career catalog.
+    RIASEC, aptitude and Big Five affinity profiles are packed once into dense
+    arrays so a student is scored against every career with one matrix-vector
+    product plus one vectorized trait-distance step, instead of a per-career
+    Python loop.
+    """
+
+    # Everything _setup derives; compiled catalogs store these so mapped workers share them
+    COLUMNS = ("riasec", "riasec_mask", "aptitude", "aptitude_mask", "traits", "traits_mask",
+               "riasec_unit", "young_prior")
+
+    def __init__(self, careers: List[Dict]):
+        n = len(careers)
+        # Missing dimensions are NaN here and masked out below
+        riasec = np.full((n, len(RIASEC_KEYS)), np.nan)
+        aptitude = np.full((n, len(APTITUDE_KEYS)), np.nan)
+        personality = np.full((n, len(BIG_FIVE_KEYS)), np.nan)
+        young_prior = np.array([float(career.get("young_prior") or 0) for career in careers])
+        for i, career in enumerate(careers):
+            for field, matrix, keys in (("riasec_profile", riasec, RIASEC_KEYS),
+                                        ("required_aptitude", aptitude, APTITUDE_KEYS),
+                                        ("personality_profile", personality, BIG_FIVE_KEYS)):
+                profile = career.get(field) or {}
+                for j, key in enumerate(keys):
+                    if key in profile:
+                        matrix[i, j] = profile[key]
+        self._setup([c["id"] for c in careers], riasec, aptitude, personality, young_prior)
+
+    @classmethod
+    def from_arrays(cls, ids: List[str], riasec: np.ndarray, aptitude: np.ndarray,
+                    personality: Optional[np.ndarray] = None,
+                    young_prior: Optional[np.ndarray] = None) -> "CareerScorer":
+        """
+        Build from (n, 6) RIASEC, (n, 4) aptitude and optional (n, 5) Big Five
+        arrays on a 0-100 scale, NaN = not listed, and an optional (n,) young
+        prior (default 0).
+        """
+        scorer = cls.__new__(cls)
+        scorer._setup(list(ids), riasec, aptitude, personality, young_prior)
+        return scorer
+
+    @classmethod
+    def from_columns(cls, ids: Sequence[str], columns: Dict[str, np.ndarray]) -> "CareerScorer":
+        """Build from precomputed COLUMNS (e.g. mapped from a compiled catalog), used as-is."""
+        scorer = cls.__new__(cls)
+        scorer.ids = ids
+        for name in cls.COLUMNS:
+            setattr(scorer, name, columns[name])
+        scorer.riasec_complete = bool(scorer.riasec_mask.all())
+        return scorer
+
+    def _setup(self, ids: List[str], riasec: np.ndarray, aptitude: np.ndarray,
+               personality: Optional[np.ndarray] = None, young_prior: Optional[np.ndarray] = None):
+        self.ids = ids
+        if personality is None:
+            personality = np.full((len(ids), len(BIG_FIVE_KEYS)), np.nan)
+
+        # Interest profiles; missing dimensions are masked out of the cosine
+        self.riasec_mask = (~np.isnan(riasec)).astype(float)
+        self.riasec = np.nan_to_num(riasec, nan=0.0)
+        # Required aptitude on a 0-1 scale, with a mask of the skills each career lists
+        self.aptitude_mask = (~np.isnan(aptitude)).astype(float)
+        self.aptitude = np.nan_to_num(aptitude, nan=0.0) / 100
+        # The same next to Big Five affinity, so both distances take one pass
+        traits = np.hstack([aptitude, personality])
+        self.traits_mask = (~np.isnan(traits)).astype(float)
+        self.traits = np.nan_to_num(traits, nan=0.0) / 100
+
+        # Pre-normalized rows for the common case of a full student profile
+        self.riasec_unit = self._normalize_rows(self.riasec)
+        self.riasec_complete = bool(self.riasec_mask.all())
+        # Weight of the young-student boost per career
+        self.young_prior = np.zeros(len(ids)) if young_prior is None else np.asarray(young_prior, dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+        norms[norms == 0.0] = 1.0
+        return matrix / norms[:, None]
+
+    @staticmethod
+    def _vectorize(values: Optional[Dict], keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Dict -> (vector, mask) in canonical key order."""
+        values = values or {}
+        vec = np.array([float(values.get(k, 0.0)) for k in keys])
+        mask = np.array([1.0 if k in values else 0.0 for k in keys])
+        return vec, mask
+
+    @staticmethod
+    def _take(matrix: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        return matrix if rows is None else matrix[rows]
+
+    def interest_similarity(self, interests: Dict, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of the student's interests with every career (0 for zero vectors)."""
+        n = len(self) if rows is None else len(rows)
+        vec, mask = self._vectorize(interests, RIASEC_KEYS)
+        norm = np.sqrt(vec @ vec)
+        if norm == 0.0:
+            return np.zeros(n)
+        unit = vec / norm
+        if mask.all() and self.riasec_complete:
+            return self._take(self.riasec_unit, rows) @ unit
+
+        # Partial profiles: cosine over the dimensions both sides define
+        riasec = self._take(self.riasec, rows)
+        shared = self._take(self.riasec_mask, rows) * mask
+        career_norms = np.sqrt((riasec * riasec) @ mask)
+        student_norms = np.sqrt(shared @ (vec * vec))
+        denom = career_norms * student_norms
+        out = np.zeros(n)
+        np.divide(riasec @ vec, denom, out=out, where=denom > 0)
+        return out
+
+    def aptitude_match(self, aptitude: Optional[Dict], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Mean of 1 - |student - required| over shared skills; 0.5 when nothing overlaps."""
+        return self.trait_match(aptitude, None, rows)[0]
+
+    def trait_match(self, aptitude: Optional[Dict], personality: Optional[Dict] = None,
+                    rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        (aptitude match, personality affinity): each the mean of 1 - |student - career|
+        over the dimensions both sides list, 0.5 when nothing overlaps. Affinity is
+        None without a personality profile.
+
+        Both come from one fused pass over the side-by-side trait columns:
+        |student - career| masked by what each career lists, then one (n, 9) x (9, 2)
+        product sums the distances per block (and per the student's own mask), so
+        personality costs no extra pass over the catalog.
+        """
+        n = len(self) if rows is None else len(rows)
+        if not aptitude and not personality:
+            return np.full(n, 0.5), None
+        aptitude_vec, aptitude_mask = self._vectorize(aptitude, APTITUDE_KEYS)
+        if personality:
+            personality_vec, personality_mask = self._vectorize(personality, BIG_FIVE_KEYS)
+            vec = np.concatenate([aptitude_vec, personality_vec])
+            traits, listed = self.traits, self.traits_mask
+        else:
+            # Aptitude only: the narrower matrices are enough
+            vec, traits, listed = aptitude_vec, self.aptitude, self.aptitude_mask
+        # Block indicator weighted by the student's mask: column 0 aptitude, column 1 personality
+        blocks = np.zeros((len(vec), 2))
+        blocks[:len(APTITUDE_KEYS), 0] = aptitude_mask
+        if personality:
+            blocks[len(APTITUDE_KEYS):, 1] = personality_mask
+
+        traits, listed = self._take(traits, rows), self._take(listed, rows)
+        distance = np.subtract(traits, vec / 100)
+        np.abs(distance, out=distance)
+        distance *= listed
+        counts = listed @ blocks
+        out = np.full((n, 2), 0.5)
+        np.divide(counts - distance @ blocks, counts, out=out, where=counts > 0)
+        return out[:, 0], (out[:, 1] if personality else None)
+
+    def score(self, interests: Dict, aptitude: Optional[Dict] = None, class_level: int = 10,
+              rows: Optional[np.ndarray] = None, personality: Optional[Dict] = None,
+              weights: ScoringWeights = DEFAULT_WEIGHTS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return (fit, interest_similarity, aptitude_match) arrays.
+        Arrays are aligned with the catalog, or with `rows` when a candidate subset is given.
+        """
+        similarity = self.interest_similarity(interests, rows)
+        match, affinity = self.trait_match(aptitude, personality, rows)
+        return self.combine(similarity, match, class_level, rows, affinity, weights), similarity, match
+
+    def combine(self, similarity: np.ndarray, match: np.ndarray, class_level: int = 10,
+                rows: Optional[np.ndarray] = None, affinity: Optional[np.ndarray] = None,
+                weights: ScoringWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+        """Fit score from interest similarity, aptitude match, personality affinity and the class-level prior."""
+        fit = (similarity * weights.interest) + (match * weights.aptitude)
+        if affinity is not None and weights.personality > 0:
+            fit = fit * (1 - weights.personality) + affinity * weights.personality
+        if class_level <= weights.young_max_class_level and weights.young_boost:
+            fit = fit + self._take(self.young_prior, rows) * weights.young_boost
+        return fit
+
+    def interest_similarity_batch(self, interests: List[Dict]) -> np.ndarray:
+        """
+        (batch, n_careers) cosine similarities, as interest_similarity per student.
+        Full profiles against a complete catalog are one matrix-matrix product on
+        the pre-normalized rows; the rest take three, over the shared dimensions.
+        """
+        vecs, masks = (np.array(part).reshape(-1, len(RIASEC_KEYS))
+                       for part in zip(*[self._vectorize(i, RIASEC_KEYS) for i in interests] or [((), ())]))
+        norms = np.sqrt(np.einsum("ij,ij->i", vecs, vecs))
+        out = np.zeros((len(interests), len(self)))
+        nonzero = norms > 0
+        full = nonzero & masks.all(axis=1) if self.riasec_complete else np.zeros(len(interests), dtype=bool)
+        if full.any():
+            out[full] = (vecs[full] / norms[full, None]) @ self.riasec_unit.T
+        partial = nonzero & ~full
+        if partial.any():
+            vec, mask = vecs[partial], masks[partial]
+            career_norms = np.sqrt(mask @ (self.riasec * self.riasec).T)
+            career_norms *= np.sqrt((vec * vec) @ self.riasec_mask.T)
+            scores = np.zeros_like(career_norms)
+            np.divide(vec @ self.riasec.T, career_norms, out=scores, where=career_norms > 0)
+            out[partial] = scores
+        return out
+
+    def trait_match_batch(self, aptitudes: List[Optional[Dict]],
+                          personalities: List[Optional[Dict]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (batch, n_careers) aptitude match and personality affinity, each as
+        trait_match gives it per student (0.5 where nothing overlaps; affinity
+        is 0.5 throughout for students without a personality profile). Built
+        one trait column at a time, so scratch stays O(batch x n_careers).
+        """
+        with_personality = any(personalities)
+        vec, mask = [], []
+        for aptitude, personality in zip(aptitudes, personalities):
+            parts = [self._vectorize(aptitude, APTITUDE_KEYS)]
+            if with_personality:
+                parts.append(self._vectorize(personality, BIG_FIVE_KEYS))
+            vec.append(np.concatenate([v for v, _ in parts]))
+            mask.append(np.concatenate([m for _, m in parts]))
+        vec, mask = np.array(vec), np.array(mask)
+        traits, listed = (self.traits, self.traits_mask) if with_personality else (self.aptitude, self.aptitude_mask)
+
+        # Block 0 sums the aptitude columns, block 1 the personality ones
+        blocks = [slice(0, len(APTITUDE_KEYS)), slice(len(APTITUDE_KEYS), vec.shape[1])]
+        distance = np.zeros((2, len(vec), len(self)))
+        column = np.empty((len(vec), len(self)))
+        # Contiguous per-trait columns; student dimensions nobody in the chunk gave are skipped
+        traits_t, listed_t = np.ascontiguousarray(traits.T), np.ascontiguousarray(listed.T)
+        for j in np.flatnonzero(mask.any(axis=0)):
+            np.subtract(traits_t[j], (vec[:, j] / 100)[:, None], out=column)
+            np.abs(column, out=column)
+            column *= listed_t[j]
+            if not mask[:, j].all():
+                column *= mask[:, j, None]
+            distance[0 if j < len(APTITUDE_KEYS) else 1] += column
+        counts = np.stack([mask[:, block] @ listed[:, block].T for block in blocks])
+        out = np.full(distance.shape, 0.5)
+        np.divide(counts - distance, counts, out=out, where=counts > 0)
+        return out[0], out[1]
+
+    def combine_batch(self, similarity: np.ndarray, match: np.ndarray, affinity: np.ndarray,
+                      class_levels: List[int], weights: List[ScoringWeights],
+                      with_personality: List[bool]) -> np.ndarray:
+        """combine() for (batch, n_careers) inputs, one class level and weight set per row."""
+        def column(values):
+            return np.array(values, dtype=float)[:, None]
+
+        fit = similarity * column([w.interest for w in weights]) + match * column([w.aptitude for w in weights])
+        personality = column([w.personality if has else 0.0 for w, has in zip(weights, with_personality)])
+        if personality.any():
+            fit = fit * (1 - personality) + affinity * personality
+        boost = column([w.young_boost if level <= w.young_max_class_level else 0.0
+                        for w, level in zip(weights, class_levels)])
+        if boost.any():
+            fit = fit + self.young_prior * boost
+        return fit
+
+
+def top_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest keys, best first, ties in index order.
+    Uses a partial selection so only the winners are fully sorted.
+    """
+    n = len(keys)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-keys, kind="stable")
+    kth = np.partition(keys, n - k)[n - k]
+    above = np.flatnonzero(keys > kth)
+    ties = np.flatnonzero(keys == kth)[:k - len(above)]
+    winners = np.concatenate([above, ties])
+    return winners[np.argsort(-keys[winners], kind="stable")]
+
+
+def top_k_rows(keys: np.ndarray, k: int) -> List[np.ndarray]:
+    """
+    top_k for every row of a (batch, n) matrix: one partition along axis 1
+    finds each row's k-th key, then only the winners are sorted per row.
+    """
+    batch, n = keys.shape
+    if k <= 0 or n == 0:
+        return [np.zeros(0, dtype=np.intp) for _ in range(batch)]
+    if k >= n:
+        return [np.argsort(-row, kind="stable") for row in keys]
+    kth = np.partition(keys, n - k, axis=1)[:, n - k, None]
+    above = np.nonzero(keys > kth)
+    ties = np.nonzero(keys == kth)
+
+    def per_row(found):
+        rows, cols = found
+        return np.split(cols, np.searchsorted(rows, np.arange(1, batch)))
+
+    out = []
+    for r, (high, tied) in enumerate(zip(per_row(above), per_row(ties))):
+        # Ties at the k-th key fill the remaining places in index order
+        winners = np.concatenate([high, tied[:k - len(high)]])
+        out.append(winners[np.argsort(-keys[r, winners], kind="stable")])
+    return out
+
+
+def career_streams(career: Dict) -> List[str]:
+    """Streams a career is reachable from, parsed from education_path[0] (e.g. "Commerce/Science")."""
+    path = career.get("education_path") or []
+    if not path:
+        return []
+    return [s.strip() for s in path[0].split("/") if s.strip()]
+
+
+class CareerIndex:
+    """
+    Posting lists over the career catalog so whole segments can be skipped
+    before scoring. Lookups are case-insensitive; careers open to "Any"
+    stream match every stream filter.
+    """
+
+    def __init__(self, careers: List[Dict]):
+        by_stream: Dict[str, List[int]] = {}
+        by_market: Dict[str, List[int]] = {}
+        open_to_any: List[int] = []
+        for i, career in enumerate(careers):
+            for stream in career_streams(career):
+                if stream.lower() == "any":
+                    open_to_any.append(i)
+                else:
+                    by_stream.setdefault(stream.lower(), []).append(i)
+            market = career.get("job_market")
+            if market:
+                by_market.setdefault(market.lower(), []).append(i)
+
+        self._setup(len(careers),
+                    {k: np.array(v, dtype=np.intp) for k, v in by_stream.items()},
+                    {k: np.array(v, dtype=np.intp) for k, v in by_market.items()},
+                    np.array(open_to_any, dtype=np.intp))
+
+    @classmethod
+    def from_postings(cls, size: int, by_stream: Dict[str, np.ndarray], by_market: Dict[str, np.ndarray],
+                      open_to_any: np.ndarray) -> "CareerIndex":
+        """Build from sorted row-id postings keyed by lower-cased stream / job market."""
+        index = cls.__new__(cls)
+        index._setup(size, by_stream, by_market, open_to_any)
+        return index
+
+    def _setup(self, size: int, by_stream: Dict[str, np.ndarray], by_market: Dict[str, np.ndarray],
+               open_to_any: np.ndarray):
+        self.size = size
+        self.by_stream = by_stream
+        self.by_market = by_market
+        self.open_to_any = open_to_any
+
+    @staticmethod
+    def _union(postings: Dict[str, np.ndarray], values: List[str]) -> np.ndarray:
+        empty = np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate([postings.get(v.lower(), empty) for v in values] + [empty]))
+
+    def candidates(self, streams: Optional[List[str]] = None,
+                   job_markets: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """
+        Sorted row ids matching any of `streams` and any of `job_markets`.
+        Returns None when no filter is given (i.e. the whole catalog).
+        """
+        rows = None
+        if streams:
+            rows = np.union1d(self._union(self.by_stream, streams), self.open_to_any)
+        if job_markets:
+            market_rows = self._union(self.by_market, job_markets)
+            rows = market_rows if rows is None else np.intersect1d(rows, market_rows, assume_unique=True)
+        return rows
@@ -0,0 +1,251 @@
+# ai-services/models/sessions.py
+
+"""
+Server-side aptitude test sessions.
+
+A session keeps only what the adaptive engine needs between clicks: a
+bitset of seen items, per-domain answered/correct counts and each domain's
+ability posterior. Recording an answer is a constant-time update, so
+neither payloads nor server work grow with test length.
+
+Answers go through the store's update(), which applies a change to one
+session atomically: a striped lock in memory, WATCH/MULTI compare-and-set
+on Redis. Concurrent answers to the same item therefore count once.
+"""
+
+import base64
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from models.irt import DOMAINS, AbilityEstimate
+
+
+class Bitset:
+    """Fixed-size set of small ints packed 8 per byte."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, size: int, bits: Optional[bytearray] = None):
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+
+    def add(self, i: int):
+        self.bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, i) -> bool:
+        return bool(self.bits[int(i) >> 3] & (1 << (int(i) & 7)))
+
+
+class SessionState:
+    """Compact per-student state for one adaptive aptitude test."""
+
+    __slots__ = ("seen", "correct", "estimates", "created_at")
+
+    def __init__(self, bank_size: int, prior_mean: float = 0.0):
+        self.seen = Bitset(bank_size)
+        self.correct = [0] * len(DOMAINS)
+        self.estimates = [AbilityEstimate(prior_mean=prior_mean) for _ in DOMAINS]
+        self.created_at = time.time()
+
+    @property
+    def answered(self) -> List[int]:
+        return [e.answered for e in self.estimates]
+
+    @property
+    def total_answered(self) -> int:
+        return sum(e.answered for e in self.estimates)
+
+    def to_bytes(self) -> bytes:
+        posterior = np.stack([e.log_posterior for e in self.estimates]).astype("<f8")
+        return json.dumps({
+            "seen": base64.b64encode(bytes(self.seen.bits)).decode("ascii"),
+            "answered": self.answered,
+            "correct": self.correct,
+            "posterior": base64.b64encode(posterior.tobytes()).decode("ascii"),
+            "created_at": self.created_at,
+        }).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "SessionState":
+        data = json.loads(raw)
+        state = cls.__new__(cls)
+        state.seen = Bitset(0, bytearray(base64.b64decode(data["seen"])))
+        state.correct = data["correct"]
+        posterior = np.frombuffer(base64.b64decode(data["posterior"]), dtype="<f8").reshape(len(DOMAINS), -1)
+        state.estimates = []
+        for d in range(len(DOMAINS)):
+            est = AbilityEstimate.__new__(AbilityEstimate)
+            est.log_posterior = posterior[d].copy()
+            est.answered = data["answered"][d]
+            state.estimates.append(est)
+        state.created_at = data["created_at"]
+        return state
+
+
+class AlreadyAnswered(Exception):
+    """The item was already answered in this session."""
+
+
+class InMemorySessionStore:
+    """Process-local store; entries expire `ttl` seconds after their last write."""
+
+    # update() serializes per session on one of these, picked by session id
+    UPDATE_STRIPES = 64
+
+    def __init__(self, ttl: float = 1800.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._update_locks = [threading.Lock() for _ in range(self.UPDATE_STRIPES)]
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            expires_at, state = entry
+            if expires_at <= self.clock():
+                del self._entries[session_id]
+                return None
+            return state
+
+    def put(self, session_id: str, state: SessionState):
+        with self._lock:
+            self._entries[session_id] = (self.clock() + self.ttl, state)
+            if len(self._entries) % 1024 == 0:
+                self._purge()
+
+    def update(self, session_id: str, fn: Callable[[SessionState], Any]) -> Any:
+        """fn(state) for the session with no other update running on it, then save; None if absent."""
+        with self._update_locks[hash(session_id) % self.UPDATE_STRIPES]:
+            state = self.get(session_id)
+            if state is None:
+                return None
+            result = fn(state)
+            self.put(session_id, state)
+            return result
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def _purge(self):
+        now = self.clock()
+        for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+
+
+class RedisSessionStore:
+    """Shared store over a redis-py style client (get / set(ex=) / delete / pipeline)."""
+
+    def __init__(self, client: Any, ttl: float = 1800.0, prefix: str = "edupath:aptsession:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        raw = self.client.get(self.prefix + session_id)
+        return SessionState.from_bytes(raw) if raw is not None else None
+
+    def put(self, session_id: str, state: SessionState):
+        self.client.set(self.prefix + session_id, state.to_bytes(), ex=max(1, int(self.ttl)))
+
+    def update(self, session_id: str, fn: Callable[[SessionState], Any]) -> Any:
+        """
+        fn(state), saved only if nobody wrote the session in between
+        (WATCH/MULTI); a conflicting write re-runs fn on the fresh state.
+        """
+        from redis.exceptions import WatchError
+
+        key = self.prefix + session_id
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    if raw is None:
+                        return None
+                    state = SessionState.from_bytes(raw)
+                    result = fn(state)
+                    pipe.multi()
+                    pipe.set(key, state.to_bytes(), ex=max(1, int(self.ttl)))
+                    pipe.execute()
+                    return result
+                except WatchError:
+                    continue
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+
+def session_store_from_env(env: Dict[str, str]):
+    """
+    APTITUDE_SESSION_TTL seconds; APTITUDE_SESSION_REDIS_URL selects the shared store,
+    with APTITUDE_SESSION_REDIS_TIMEOUT seconds per connect / command.
+    """
+    ttl = float(env.get("APTITUDE_SESSION_TTL", "1800"))
+    redis_url = env.get("APTITUDE_SESSION_REDIS_URL")
+    if redis_url:
+        import redis  # only needed when the shared store is configured
+        timeout = float(env.get("APTITUDE_SESSION_REDIS_TIMEOUT", "0.5"))
+        client = redis.Redis.from_url(redis_url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        return RedisSessionStore(client, ttl=ttl)
+    return InMemorySessionStore(ttl=ttl)
+
+
+class AptitudeSessions:
+    """
+    start / answer / next / finish over an AptitudeEngine and a session store.
+    Calls block on the store (a Redis round trip); async callers run them in a thread.
+    """
+
+    def __init__(self, get_engine: Callable[[], Any], store):
+        # Resolved per call so the engine can be built lazily
+        self._get_engine = get_engine
+        self.store = store
+
+    @property
+    def engine(self):
+        return self._get_engine()
+
+    def _load(self, session_id: str) -> SessionState:
+        state = self.store.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown or expired session: {session_id}")
+        return state
+
+    def start(self, difficulty: float = 3) -> Dict:
+        session_id = uuid.uuid4().hex
+        state = self.engine.new_session_state(difficulty)
+        self.store.put(session_id, state)
+        return {"session_id": session_id, "question": self.engine.select_item(state.estimates, state.seen)}
+
+    def answer(self, session_id: str, item_id: str, correct: Optional[bool] = None,
+               response: Optional[str] = None) -> Dict:
+        """Record one answer atomically; AlreadyAnswered if the item was answered before."""
+        engine = self.engine
+
+        def record(state: SessionState) -> Dict:
+            if not engine.record_answer(state, item_id, correct=correct, response=response):
+                raise AlreadyAnswered(f"Item {item_id} was already answered in this session")
+            return {"answered": state.total_answered,
+                    "question": engine.select_item(state.estimates, state.seen)}
+
+        result = self.store.update(session_id, record)
+        if result is None:
+            raise KeyError(f"Unknown or expired session: {session_id}")
+        return result
+
+    def next(self, session_id: str) -> Dict:
+        state = self._load(session_id)
+        return self.engine.select_item(state.estimates, state.seen)
+
+    def finish(self, session_id: str) -> Dict:
+        state = self._load(session_id)
+        self.store.delete(session_id)
+        return self.engine.session_report(state)
@@ -0,0 +1,184 @@
+# ai-services/models/streams.py
+
+"""
+Stream and sub-course scoring driven by weights in the catalog.
+
+Each stream in the catalog's "streams" mapping may carry, besides the
+informational fields returned to clients (subjects, entrance_exams, ...):
+
+    "interest_weights": {"investigative": 1, "realistic": 1}   # or legacy "suitable_interests": [...]
+    "aptitude_weights": {"logical": 1, "numerical": 1}
+    "aptitude_reason":  "Strong logical and numerical abilities"
+    "career_examples":  ["Software Engineer", ...]
+    "courses": {"PCM": {...same keys, plus any info fields...}, ...}
+
+A course inherits its stream's weights unless it sets its own. Streams and
+courses are compiled into one (rows, 6) interest matrix and one (rows, 4)
+aptitude matrix, so every stream and course is scored in a single pass:
+
+    fit = (sum_i w_i * interest_i / 100 + [sum_a v_a * aptitude_a / (100 * sum_a v_a)])
+          / (sum_i w_i + [1])
+
+with the aptitude terms only when the student has aptitude scores and the
+row lists aptitude weights. With unit weights this is exactly the old
+per-stream formula.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.scoring import APTITUDE_KEYS, RIASEC_KEYS
+
+# Weights for the original three streams, used when a catalog doesn't give any
+DEFAULT_APTITUDE_WEIGHTS = {
+    "Science": {"logical": 1, "numerical": 1},
+    "Commerce": {"numerical": 1, "verbal": 1},
+    "Arts": {"verbal": 1},
+}
+DEFAULT_APTITUDE_REASONS = {
+    "Science": "Strong logical and numerical abilities",
+    "Commerce": "Good numerical and verbal skills",
+    "Arts": "Excellent verbal abilities",
+}
+DEFAULT_CAREER_EXAMPLES = {
+    "Science": ["Software Engineer", "Data Scientist", "Doctor", "Research Scientist"],
+    "Commerce": ["Business Analyst", "Chartered Accountant", "Investment Banker", "Entrepreneur"],
+    "Arts": ["Teacher", "Lawyer", "Journalist", "Civil Servant"],
+}
+
+# Scoring keys are compiled, not echoed back in "info"
+SCORING_FIELDS = ("interest_weights", "aptitude_weights", "aptitude_reason", "career_examples", "courses")
+
+# An interest or aptitude term above this earns a reason
+INTEREST_REASON_THRESHOLD = 0.6
+APTITUDE_REASON_THRESHOLD = 0.7
+
+
+def _weights(values: Dict, keys: List[str], label: str, name: str) -> np.ndarray:
+    unknown = [k for k in values if k not in keys]
+    if unknown:
+        raise ValueError(f"{name}: unknown {label} {unknown}")
+    return np.array([float(values.get(k, 0.0)) for k in keys])
+
+
+def _interest_weights(spec: Dict) -> Optional[Dict]:
+    if "interest_weights" in spec:
+        return spec["interest_weights"]
+    if "suitable_interests" in spec:
+        return {k: 1 for k in spec["suitable_interests"]}
+    return None
+
+
+class StreamScorer:
+    """Compiled weight matrices for every stream and course of one catalog."""
+
+    def __init__(self, streams: Dict):
+        names: List[str] = []
+        interest_rows, aptitude_rows = [], []
+        # Per row: interest keys that can earn a reason (in the catalog's order) and the aptitude reason
+        self.reason_keys: List[List[str]] = []
+        self.aptitude_reasons: List[str] = []
+        self.infos: List[Dict] = []
+        self.stream_rows: List[int] = []
+        self.course_rows: List[List[int]] = []
+        self.career_examples: List[List[str]] = []
+
+        def add(name: str, spec: Dict, interests: Dict, aptitude: Dict, reason: str) -> int:
+            interest_rows.append(_weights(interests, RIASEC_KEYS, "interest dimensions", name))
+            aptitude_rows.append(_weights(aptitude, APTITUDE_KEYS, "aptitude skills", name))
+            self.reason_keys.append([k for k, w in interests.items() if w > 0])
+            self.aptitude_reasons.append(reason)
+            self.infos.append({k: v for k, v in spec.items() if k not in SCORING_FIELDS})
+            names.append(name)
+            return len(names) - 1
+
+        for stream, spec in streams.items():
+            interests = _interest_weights(spec) or {}
+            aptitude = spec.get("aptitude_weights", DEFAULT_APTITUDE_WEIGHTS.get(stream, {}))
+            reason = spec.get("aptitude_reason") or DEFAULT_APTITUDE_REASONS.get(stream) or (
+                "Strong " + " and ".join(k for k in aptitude if aptitude[k] > 0) + " abilities")
+            self.stream_rows.append(add(stream, spec, interests, aptitude, reason))
+            self.career_examples.append(list(spec.get("career_examples", DEFAULT_CAREER_EXAMPLES.get(stream, []))))
+            courses = []
+            for course, course_spec in (spec.get("courses") or {}).items():
+                courses.append(add(
+                    course, course_spec,
+                    _interest_weights(course_spec) or interests,
+                    course_spec.get("aptitude_weights", aptitude),
+                    course_spec.get("aptitude_reason", reason),
+                ))
+            self.course_rows.append(courses)
+
+        self.names = names
+        self.interest_weights = np.array(interest_rows).reshape(-1, len(RIASEC_KEYS))
+        self.aptitude_weights = np.array(aptitude_rows).reshape(-1, len(APTITUDE_KEYS))
+        self.interest_totals = self.interest_weights.sum(axis=1)
+        aptitude_totals = self.aptitude_weights.sum(axis=1)
+        self.has_aptitude = aptitude_totals > 0
+        # Aptitude dot products are divided by 100 * sum(weights); 1 where a row has none
+        self.aptitude_scale = np.where(self.has_aptitude, 100 * aptitude_totals, 1.0)
+        self.stream_index = {name.lower(): i for i, name in enumerate(streams)}
+
+    def __len__(self) -> int:
+        return len(self.stream_rows)
+
+    def score(self, interests: Dict, aptitude: Optional[Dict] = None):
+        """(fit, aptitude term) for every stream and course row, on a 0-1 scale."""
+        vec = np.array([float(interests.get(k, 0.0)) for k in RIASEC_KEYS]) / 100
+        total = self.interest_weights @ vec
+        denom = self.interest_totals
+        if aptitude:
+            skills = np.array([float(aptitude.get(k, 0.0)) for k in APTITUDE_KEYS])
+            term = (self.aptitude_weights @ skills) / self.aptitude_scale
+            total = total + term
+            denom = denom + self.has_aptitude
+        else:
+            term = None
+        fit = np.zeros(len(total))
+        np.divide(total, denom, out=fit, where=denom > 0)
+        return fit, term
+
+    def _reasons(self, row: int, high: Dict[str, str], strong: List[bool]) -> List[str]:
+        reasons = [high[k] for k in self.reason_keys[row] if k in high]
+        if strong[row]:
+            reasons.append(self.aptitude_reasons[row])
+        return reasons
+
+    def recommend(self, interests: Dict, aptitude: Optional[Dict] = None,
+                  streams: Optional[List[str]] = None) -> List[Dict]:
+        """Streams best first (ties in catalog order), each with its courses best first."""
+        fit, term = self.score(interests, aptitude)
+        scores = [round(v, 1) for v in (fit * 100).tolist()]
+        # Interest reasons depend only on the student; format each once
+        high = {k: f"High {k} interest ({v:.0f}%)" for k, v in interests.items()
+                if v / 100 > INTEREST_REASON_THRESHOLD}
+        strong = ([False] * len(fit) if term is None
+                  else (self.has_aptitude & (term > APTITUDE_REASON_THRESHOLD)).tolist())
+        if streams is None:
+            picked = range(len(self))
+        else:
+            picked = sorted({self.stream_index[s.lower()] for s in streams if s.lower() in self.stream_index})
+
+        results = []
+        for i in sorted(picked, key=lambda i: -scores[self.stream_rows[i]]):
+            row = self.stream_rows[i]
+            result = {
+                "stream": self.names[row],
+                "info": self.infos[row],
+                "fit_score": scores[row],
+                "reasons": self._reasons(row, high, strong),
+                "career_examples": self.career_examples[i],
+            }
+            if self.course_rows[i]:
+                result["courses"] = [
+                    {
+                        "course": self.names[c],
+                        "info": self.infos[c],
+                        "fit_score": scores[c],
+                        "reasons": self._reasons(c, high, strong),
+                    }
+                    for c in sorted(self.course_rows[i], key=lambda c: -scores[c])
+                ]
+            results.append(result)
+        return results
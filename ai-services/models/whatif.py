@@ -0,0 +1,204 @@
+# ai-services/models/whatif.py
+
+"""
+Incremental "what-if" rescoring for live slider exploration.
+
+A WhatIfSession keeps, for one student and every candidate career, the
+partial terms of the fit score:
+
+    interest:  dot = r . s,  career_sq = sum(r_j^2 over the student's dims),
+               student_sq = sum(s_j^2 over the career's dims)
+    aptitude:  totals = sum(1 - |s_j - a_j|), counts = number of shared skills
+
+Changing one dimension j is a rank-1 update of each term (one column of the
+catalog), so a slider move costs O(catalog) instead of a full rescoring.
+The incremental scores only preselect a small pool around the k-th best;
+the pool is then scored exactly with CareerScorer, so results are identical
+to recommend_careers (float rounding in the deltas can't flip a displayed
+score or a tie). The terms are also rebuilt every REBUILD_EVERY updates so
+rounding can't drift. Personality has no sliders, so its affinity term is
+computed once per session.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.catalog import CatalogSnapshot
+from models.scoring import APTITUDE_KEYS, DEFAULT_WEIGHTS, RIASEC_KEYS, ScoringWeights, top_k
+
+REBUILD_EVERY = 256
+# Pool margin below the k-th best incremental fit score (0-100 scale)
+POOL_MARGIN = 0.2
+
+
+class WhatIfSession:
+    """One student's profile plus per-career partial terms over a fixed candidate set."""
+
+    def __init__(self, catalog: CatalogSnapshot, rows: Optional[np.ndarray], interests: Dict,
+                 aptitude: Optional[Dict] = None, class_level: int = 10, k: int = 10,
+                 personality: Optional[Dict] = None, weights: ScoringWeights = DEFAULT_WEIGHTS):
+        self.catalog = catalog
+        self.rows = rows
+        self.k = k
+        self.class_level = class_level
+        self.personality = personality
+        self.weights = weights
+        scorer = catalog.scorer
+        self._affinity = scorer.trait_match(None, personality, rows)[1] if weights.personality else None
+        take = scorer._take
+        self._riasec = take(scorer.riasec, rows)
+        self._riasec_sq = self._riasec * self._riasec
+        self._riasec_mask = take(scorer.riasec_mask, rows)
+        self._aptitude = take(scorer.aptitude, rows)
+        self._aptitude_mask = take(scorer.aptitude_mask, rows)
+
+        # Inputs as given (for exact scoring) and as vectors (for the partial terms)
+        self.interest_values = {k: v for k, v in (interests or {}).items() if k in RIASEC_KEYS}
+        self.aptitude_values = {k: v for k, v in (aptitude or {}).items() if k in APTITUDE_KEYS}
+        self.interests = np.array([float(self.interest_values.get(k, 0.0)) for k in RIASEC_KEYS])
+        self.interest_mask = np.array([1.0 if k in self.interest_values else 0.0 for k in RIASEC_KEYS])
+        self.aptitude = np.array([float(self.aptitude_values.get(k, 0.0)) for k in APTITUDE_KEYS]) / 100
+        self.aptitude_mask = np.array([1.0 if k in self.aptitude_values else 0.0 for k in APTITUDE_KEYS])
+        self._rebuild()
+        self.top: List[Dict] = self._rank()
+
+    def __len__(self) -> int:
+        return len(self._riasec)
+
+    def _rebuild(self):
+        vec, mask = self.interests, self.interest_mask
+        self._dot = self._riasec @ vec
+        self._career_sq = self._riasec_sq @ mask
+        self._student_sq = self._riasec_mask @ (mask * vec * vec)
+        shared = self._aptitude_mask * self.aptitude_mask
+        self._counts = shared.sum(axis=1)
+        self._totals = ((1 - np.abs(self.aptitude - self._aptitude)) * shared).sum(axis=1)
+        self._updates = 0
+
+    # -- scores -----------------------------------------------------------------
+
+    def similarity(self) -> np.ndarray:
+        denom = np.sqrt(self._career_sq * self._student_sq)
+        out = np.zeros(len(self))
+        np.divide(self._dot, denom, out=out, where=denom > 0)
+        return out
+
+    def match(self) -> np.ndarray:
+        out = np.full(len(self), 0.5)
+        np.divide(self._totals, self._counts, out=out, where=self._counts > 0)
+        return out
+
+    def _rank(self) -> List[Dict]:
+        scorer = self.catalog.scorer
+        approx = scorer.combine(self.similarity(), self.match(), self.class_level, self.rows,
+                                self._affinity, self.weights) * 100
+        if len(approx) > self.k:
+            kth = np.partition(approx, len(approx) - self.k)[len(approx) - self.k]
+            pool = np.flatnonzero(approx >= kth - POOL_MARGIN)
+        else:
+            pool = np.arange(len(approx))
+        rows = pool if self.rows is None else self.rows[pool]
+
+        # Exact scores for the pool, as recommend_careers computes them
+        similarity = scorer.interest_similarity(self.interest_values, rows)
+        match, affinity = scorer.trait_match(self.aptitude_values or None,
+                                             self.personality if self.weights.personality else None, rows)
+        fit = scorer.combine(similarity, match, self.class_level, rows, affinity, self.weights)
+        ids = scorer.ids
+        top = []
+        for rank, i in enumerate(top_k(np.round(fit * 100, 1), self.k), start=1):
+            row = int(rows[i])
+            top.append({
+                "career_id": ids[row],
+                "rank": rank,
+                "fit_score": round(float(fit[i]) * 100, 1),
+                "interest_match": round(float(similarity[i]) * 100, 1),
+                "aptitude_match": round(float(match[i]) * 100, 1),
+            })
+        return top
+
+    def profile(self) -> Dict:
+        """The session's current inputs, as recommend_careers arguments."""
+        return {
+            "interests": dict(self.interest_values),
+            "aptitude": dict(self.aptitude_values) or None,
+            "class_level": self.class_level,
+            "personality": self.personality,
+        }
+
+    # -- updates ----------------------------------------------------------------
+
+    def set_interest(self, key: str, value: Optional[float]):
+        """Set (or with None, clear) one RIASEC dimension."""
+        j = RIASEC_KEYS.index(key)
+        old, old_m = self.interests[j], self.interest_mask[j]
+        new, new_m = (0.0, 0.0) if value is None else (float(value), 1.0)
+        column, column_mask = self._riasec[:, j], self._riasec_mask[:, j]
+        self._dot += column * (new - old)
+        self._career_sq += self._riasec_sq[:, j] * (new_m - old_m)
+        self._student_sq += column_mask * (new_m * new * new - old_m * old * old)
+        self.interests[j], self.interest_mask[j] = new, new_m
+        if value is None:
+            self.interest_values.pop(key, None)
+        else:
+            self.interest_values[key] = value
+        self._count_update()
+
+    def set_aptitude(self, key: str, value: Optional[float]):
+        """Set (or with None, clear) one aptitude skill, on the API's 0-100 scale."""
+        j = APTITUDE_KEYS.index(key)
+        old, old_m = self.aptitude[j], self.aptitude_mask[j]
+        new, new_m = (0.0, 0.0) if value is None else (float(value) / 100, 1.0)
+        required, listed = self._aptitude[:, j], self._aptitude_mask[:, j]
+        self._totals += listed * (new_m * (1 - np.abs(new - required)) - old_m * (1 - np.abs(old - required)))
+        self._counts += listed * (new_m - old_m)
+        self.aptitude[j], self.aptitude_mask[j] = new, new_m
+        if value is None:
+            self.aptitude_values.pop(key, None)
+        else:
+            self.aptitude_values[key] = value
+        self._count_update()
+
+    def _count_update(self):
+        self._updates += 1
+        if self._updates >= REBUILD_EVERY:
+            self._rebuild()
+
+    def apply(self, interests: Optional[Dict] = None, aptitude: Optional[Dict] = None,
+              class_level: Optional[int] = None) -> Dict:
+        """
+        Apply slider changes and re-rank. Returns {"changes": [...], "removed": [...]}:
+        the top-k entries whose rank or scores changed and the ids that left the top k.
+        """
+        # Validate everything first so a bad value leaves the session untouched
+        for values, keys, label in ((interests, RIASEC_KEYS, "interest dimension"),
+                                    (aptitude, APTITUDE_KEYS, "aptitude skill")):
+            for key, value in (values or {}).items():
+                if key not in keys:
+                    raise ValueError(f"Unknown {label}: {key}")
+                if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                          or not math.isfinite(value)):
+                    raise ValueError(f"{key} must be a number or null")
+        if class_level is not None:
+            try:
+                if isinstance(class_level, bool):
+                    raise TypeError
+                class_level = int(class_level)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError("class_level must be a whole number") from None
+        for key, value in (interests or {}).items():
+            self.set_interest(key, value)
+        for key, value in (aptitude or {}).items():
+            self.set_aptitude(key, value)
+        if class_level is not None:
+            self.class_level = class_level
+
+        previous = {entry["career_id"]: entry for entry in self.top}
+        self.top = self._rank()
+        current = {entry["career_id"] for entry in self.top}
+        return {
+            "changes": [entry for entry in self.top if previous.get(entry["career_id"]) != entry],
+            "removed": [career_id for career_id in previous if career_id not in current],
+        }
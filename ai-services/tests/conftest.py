@@ -0,0 +1,16 @@
+# ai-services/tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+# Tests import the service's modules the way main.py does (models.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def builtin_catalog(monkeypatch):
+    """Engines use the built-in catalog and default weights unless a test says otherwise."""
+    for name in ("CAREER_CATALOG_PATH", "SCORING_WEIGHTS_PATH"):
+        monkeypatch.delenv(name, raising=False)
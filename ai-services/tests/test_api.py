@@ -0,0 +1,193 @@
+# ai-services/tests/test_api.py
+
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from models.records import CAREER_FIELDS
+
+PROFILE = {
+    "interests": {"realistic": 30, "investigative": 80, "artistic": 40, "social": 50, "enterprising": 40,
+                  "conventional": 35},
+    "aptitude": {"logical": 85, "numerical": 80, "spatial": 60, "verbal": 55},
+    "class_level": 10,
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline, "engines did not warm up"
+            time.sleep(0.02)
+        yield client
+
+
+def test_colleges_near_the_student(client):
+    location = {"latitude": 34.07, "longitude": 74.82, "radius_km": 30, "max_fees": "9000"}
+    r = client.post("/recommend/colleges", json={"profile": dict(PROFILE, location=location)})
+    assert r.status_code == 200
+    recs = r.json()["recommendations"]
+    assert recs and all(rec["min_annual_fee"] <= 9000 for rec in recs)
+
+
+@pytest.mark.parametrize("key,value", [("max_fees", "x"), ("max_fees", True), ("radius_km", "far"),
+                                       ("latitude", None), ("k", [3])])
+def test_colleges_reject_malformed_location(client, key, value):
+    location = {"latitude": 34.07, "longitude": 74.82, key: value}
+    r = client.post("/recommend/colleges", json={"profile": dict(PROFILE, location=location)})
+    assert r.status_code == 400
+    assert key in r.json()["detail"]
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_bulk_interests_stream_in_input_order(client, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "INTEREST_BULK_CHUNK", 2)
+    monkeypatch.setattr(main, "INTEREST_BULK_MAX_LINE", 200)
+    good = [{"category": "social", "rating": 5}, {"category": "artistic", "rating": 3}]
+    lines = [
+        json.dumps({"student_id": "a", "responses": good}),
+        "not json",
+        "",
+        json.dumps(good),
+        json.dumps({"student_id": "big", "responses": good * 20}),
+        json.dumps({"student_id": "b", "responses": "nope"}),
+        json.dumps({"student_id": "c", "responses": good}),
+    ]
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+    # Send in small pieces so lines straddle body chunks
+    r = client.post("/analyze/interests/bulk", content=(body[i:i + 17] for i in range(0, len(body), 17)))
+    assert r.status_code == 200
+    out = ndjson(r)
+    assert [o["index"] for o in out] == list(range(6))
+    assert [o["line"] for o in out] == [1, 2, 4, 5, 6, 7]
+    assert [o["student_id"] for o in out] == ["a", None, None, None, None, "c"]
+    assert ["error" in o for o in out] == [False, True, False, True, True, False]
+    assert "longer than 200 bytes" in out[3]["error"]
+    assert out[0]["profile"]["social"] == 100.0
+    assert out[0]["profile"] == out[2]["profile"] == out[5]["profile"]
+
+
+def test_aptitude_session_answer_errors(client):
+    started = client.post("/assess/aptitude/session/start", json={}).json()
+    url = f"/assess/aptitude/session/{started['session_id']}/answer"
+    item = started["question"]["id"]
+    assert client.post(url, json={"id": item, "correct": "false"}).status_code == 400
+    assert client.post(url, json={"id": item, "correct": False}).status_code == 200
+    assert client.post(url, json={"id": item, "correct": True}).status_code == 409
+    assert client.post("/assess/aptitude/session/nope/answer", json={"id": item, "correct": True}).status_code == 404
+
+
+def test_metrics_after_a_request(client):
+    from models.metrics import METRICS
+    from tests.test_metrics import parse, series
+    METRICS.reset()
+    responses = [{"category": "social", "rating": 5}]
+    assert client.post("/analyze/interests", json=responses).status_code == 200
+    assert client.post("/analyze/interests", json={"bad": 1}).status_code == 422
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    types, samples = parse(r.text)
+    assert types["edupath_requests_total"] == "counter"
+    assert types["edupath_request_duration_seconds"] == "histogram"
+    endpoint = "/analyze/interests"
+    assert series(samples, "edupath_requests_total", endpoint=endpoint, method="POST", status="200")[0][1] == 1
+    assert series(samples, "edupath_requests_total", endpoint=endpoint, status="422")[0][1] == 1
+    assert series(samples, "edupath_request_errors_total", endpoint=endpoint, kind="client")[0][1] == 1
+    buckets = [v for _, v in series(samples, "edupath_request_duration_seconds_bucket", endpoint=endpoint)]
+    assert buckets == sorted(buckets) and buckets[-1] == 2
+    count = series(samples, "edupath_request_duration_seconds_count", endpoint=endpoint)
+    assert count[0][1] == 2
+    phases = {l["phase"] for l, _ in series(samples, "edupath_request_phase_seconds_count", endpoint=endpoint)}
+    assert phases == {"validation", "handler", "serialization"}
+
+
+def test_audit_trail_keeps_the_request_as_sent(client, monkeypatch):
+    import main
+    from models.persistence import InMemoryResultStore, ResultWriter
+    store = InMemoryResultStore()
+    monkeypatch.setattr(main, "result_writer", ResultWriter(store))
+    # Off any cache quantum, so an opted-in cache key would differ from what was sent
+    profile = dict(PROFILE, interests=dict(PROFILE["interests"], realistic=30.37))
+    r = client.post("/recommend/careers", json={"profile": profile}, headers={"X-Student-Id": "s1"})
+    assert r.status_code == 200
+    body = json.dumps({"student_id": 7, "responses": [{"category": "social", "rating": 5}]}) + "\n" + "oops\n"
+    assert client.post("/analyze/interests/bulk", content=body).status_code == 200
+    client.portal.call(main.result_writer.close)
+
+    by_endpoint = {d["endpoint"]: d for d in store.documents}
+    assert set(by_endpoint) == {"/recommend/careers", "/analyze/interests/bulk"}
+    careers = by_endpoint["/recommend/careers"]
+    assert careers["kind"] == "recommendation" and careers["student_id"] == "s1"
+    assert careers["input"]["interests"] == profile["interests"]
+    bulk = by_endpoint["/analyze/interests/bulk"]
+    assert bulk["kind"] == "interest_profile" and bulk["student_id"] == "7"
+    assert bulk["input"] == [{"category": "social", "rating": 5}]
+    assert bulk["result"]["profile"]["social"] == 100.0
+
+
+def test_catalog_etag_and_304(client):
+    r = client.get("/catalog/careers")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    catalog = r.json()
+    assert etag == '"%s"' % catalog["version"] and catalog["careers"]
+    assert all(list(c) == list(CAREER_FIELDS) for c in catalog["careers"])
+
+    for header in (etag, f'"stale", {etag}', "*"):
+        cached = client.get("/catalog/careers", headers={"If-None-Match": header})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["etag"] == etag
+    assert client.get("/catalog/careers", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    career_id = catalog["careers"][0]["id"]
+    entry = client.get(f"/catalog/careers/{career_id}")
+    assert entry.status_code == 200 and entry.json() == catalog["careers"][0]
+    assert entry.headers["etag"] == etag
+    assert client.get(f"/catalog/careers/{career_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/catalog/careers/no-such-career").status_code == 404
+
+
+def recommend(client, **options):
+    return client.post("/recommend/careers", json={"profile": PROFILE, **options})
+
+
+def test_compact_and_projected_recommendations(client):
+    full = recommend(client).json()["recommendations"]
+    assert all(list(r["career"]) == list(CAREER_FIELDS) for r in full)
+    scores = [{k: v for k, v in r.items() if k not in ("career", "reasons")} for r in full]
+
+    compact = recommend(client, response_mode="compact").json()["recommendations"]
+    assert [r["career_id"] for r in compact] == [r["career"]["id"] for r in full]
+    assert [{k: v for k, v in r.items() if k != "career_id"} for r in compact] == scores
+
+    projected = recommend(client, fields=["name", "salary_range"]).json()["recommendations"]
+    assert [r["career"] for r in projected] == [
+        {"id": r["career"]["id"], "name": r["career"]["name"], "salary_range": r["career"]["salary_range"]}
+        for r in full]
+    assert [r["reasons"] for r in projected] == [r["reasons"] for r in full]
+
+
+@pytest.mark.parametrize("options", [{"fields": ["name", "salary"]}, {"fields": ["young_prior"]},
+                                     {"response_mode": "tiny"}])
+def test_unknown_fields_and_modes_are_rejected(client, options):
+    r = recommend(client, **options)
+    assert r.status_code == 400
+    assert "Unknown" in r.json()["detail"]
+
+
+def test_recommendation_scores_are_exact_by_default(client):
+    from models.recommender import CareerRecommendationEngine
+    interests = {k: v + 0.37 for k, v in PROFILE["interests"].items()}
+    r = client.post("/recommend/careers", json={"profile": dict(PROFILE, interests=interests)})
+    expected = CareerRecommendationEngine().recommend_careers(interests, PROFILE["aptitude"], class_level=10)
+    assert [(rec["career"]["id"], rec["fit_score"]) for rec in r.json()["recommendations"]] == [
+        (rec["career"]["id"], rec["fit_score"]) for rec in expected]
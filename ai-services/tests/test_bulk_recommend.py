@@ -0,0 +1,51 @@
+# ai-services/tests/test_bulk_recommend.py
+
+import json
+
+import pytest
+
+import bulk_recommend
+
+CSV = """student_id,realistic,investigative,artistic,social,enterprising,conventional,logical,numerical,spatial,verbal,class_level
+s1,30,80,40,50,40,35,85,80,60,55,10
+s2,30,abc,40,50,40,35,,,,,10
+,20,40,80,90,40,30,,,,,9
+s4,20,40,80,90,40,30,70,70,70,70,ten
+s5,60,30,20,40,70,80,,,,,12
+"""
+
+
+def strict_loads(line):
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+    return json.loads(line, parse_constant=reject)
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    path = tmp_path / "cohort.csv"
+    path.write_text(CSV)
+    return path
+
+
+def check_lines(lines):
+    assert [line["student_id"] for line in lines] == ["s1", "s2", None, "s4", "s5"]
+    assert [("error" in line) for line in lines] == [False, True, False, True, False]
+    assert "investigative" in lines[1]["error"]
+    assert "class_level" in lines[3]["error"]
+    for line in (lines[0], lines[2], lines[4]):
+        assert len(line["careers"]) == 3 and line["streams"]
+
+
+def test_bad_rows_become_error_records(cohort, monkeypatch):
+    import pandas as pd
+    from models.recommender import CareerRecommendationEngine
+    monkeypatch.setattr(bulk_recommend, "_engine", CareerRecommendationEngine())
+    out = bulk_recommend.score_chunk(pd.read_csv(cohort), top_k=3).decode("utf-8")
+    check_lines([strict_loads(line) for line in out.splitlines()])
+
+
+def test_run_writes_every_row_in_order(cohort, tmp_path):
+    output = tmp_path / "results.ndjson"
+    assert bulk_recommend.run(str(cohort), str(output), workers=1, chunk_size=2, top_k=3) == 5
+    check_lines([strict_loads(line) for line in output.read_text().splitlines()])
@@ -0,0 +1,92 @@
+# ai-services/tests/test_cache.py
+
+import asyncio
+import threading
+import time
+
+from models.cache import RecommendationCache
+
+
+class SlowShared:
+    """Redis stand-in whose every call takes `delay` seconds and records its thread."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.data = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.data[key] = value
+
+
+def test_shared_tier_stays_off_the_event_loop():
+    shared = SlowShared(0.2)
+    cache = RecommendationCache(max_size=0, shared=shared)
+
+    async def compute():
+        return [{"career_id": "teacher"}]
+
+    async def main():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        value = await cache.get_or_compute_async("k", compute)
+        done.set()
+        await task
+        return value, ticks
+
+    value, ticks = asyncio.run(main())
+    assert value == [{"career_id": "teacher"}]
+    # The loop kept ticking through the 0.2 s lookup
+    assert ticks >= 10
+    cache.close()
+    assert shared.data["k"] == '[{"career_id": "teacher"}]'
+    assert threading.main_thread().name not in shared.threads
+
+
+def test_shared_hits_fill_the_local_tier():
+    shared = SlowShared(0)
+    shared.data["k"] = '{"fit": 1}'
+    cache = RecommendationCache(shared=shared)
+
+    async def compute():
+        raise AssertionError("should be a shared hit")
+
+    assert asyncio.run(cache.get_or_compute_async("k", compute)) == {"fit": 1}
+    shared.data.clear()
+    assert cache.get("k") == {"fit": 1}
+    assert cache.counters["shared_hits"] == 1 and cache.counters["hits"] == 1
+    cache.close()
+
+
+def test_shared_errors_are_counted_not_raised():
+    class Broken:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value, ex=None):
+            raise ConnectionError("down")
+
+    cache = RecommendationCache(shared=Broken())
+
+    async def compute():
+        return 42
+
+    assert asyncio.run(cache.get_or_compute_async("k", compute)) == 42
+    cache.close()
+    assert cache.counters["shared_errors"] == 2
+    assert cache.get("k") == 42
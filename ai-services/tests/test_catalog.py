@@ -0,0 +1,176 @@
+# ai-services/tests/test_catalog.py
+
+import json
+import os
+import struct
+import time
+
+import numpy as np
+import pytest
+
+from models.catalog import (FORMAT_VERSION, MAGIC, STRING_FIELDS, CatalogSnapshot, CatalogSource,
+                            MappedCatalog, compile_catalog)
+from models.recommender import CareerRecommendationEngine
+from models.scoring import BIG_FIVE_KEYS, RIASEC_KEYS, CareerScorer
+
+STREAMS = {"Science": {"suitable_interests": ["investigative"]}}
+
+CAREERS = [
+    {
+        "id": "analyst",
+        "name": "Analyst",
+        "riasec_profile": {"investigative": 80, "conventional": 65.5},    # other dimensions not listed
+        "required_aptitude": {"numerical": 85},
+        "personality_profile": {"openness": 70, "neuroticism": 30},
+        "education_path": ["Commerce/Science", "Economics", "BBA/B.Com"],
+        "salary_range": "₹5-18 LPA",
+        "job_market": "Excellent",
+        "description": "Numbers, reports — and “quotes”",
+    },
+    {
+        "id": "artist",
+        "name": "Artist",
+        "riasec_profile": {k: 50 for k in RIASEC_KEYS},
+        "required_aptitude": {},
+        "education_path": [],
+        "salary_range": "Varies",
+        "job_market": "",
+        "description": "",
+    },
+    {
+        "id": "teacher",
+        "name": "Teacher",
+        "riasec_profile": {"social": 95, "artistic": 50},
+        "required_aptitude": {"verbal": 90, "logical": 70},
+        "personality_profile": {k: 60 for k in BIG_FIVE_KEYS},
+        "young_prior": 1,
+        "education_path": ["Any", "Subject Specialization", "B.Ed"],
+        "salary_range": "₹3-8 LPA",
+        "job_market": "Good",
+        "description": "Educate students",
+    },
+]
+
+
+def expected_record(career: dict) -> dict:
+    """A career as CareerRecord reads it back: every key present, absent profiles empty, prior 0."""
+    record = {field: career.get(field, [] if field == "education_path" else "") for field in STRING_FIELDS}
+    for field in ("riasec_profile", "required_aptitude", "personality_profile"):
+        record[field] = {k: float(v) for k, v in (career.get(field) or {}).items()}
+    record["young_prior"] = float(career.get("young_prior") or 0)
+    return record
+
+
+def compile_careers(tmp_path, careers, name="catalog.bin", streams=STREAMS) -> str:
+    source = tmp_path / f"{name}.json"
+    source.write_text(json.dumps({"careers": careers, "streams": streams}), encoding="utf-8")
+    out = str(tmp_path / name)
+    compile_catalog(str(source), out)
+    return out
+
+
+def assert_same_snapshot(mapped: CatalogSnapshot, loaded: CatalogSnapshot):
+    for name in CareerScorer.COLUMNS:
+        np.testing.assert_array_equal(getattr(mapped.scorer, name), getattr(loaded.scorer, name))
+    assert list(mapped.scorer.ids) == list(loaded.scorer.ids)
+    np.testing.assert_array_equal(mapped.records.high_riasec, loaded.records.high_riasec)
+    for name in ("by_stream", "by_market"):
+        a, b = getattr(mapped.index, name), getattr(loaded.index, name)
+        assert a.keys() == b.keys()
+        for key in a:
+            np.testing.assert_array_equal(a[key], b[key])
+    np.testing.assert_array_equal(mapped.index.open_to_any, loaded.index.open_to_any)
+    a, b = mapped.constraint_index, loaded.constraint_index
+    np.testing.assert_array_equal(a.salary_low, b.salary_low)
+    np.testing.assert_array_equal(a.market_level, b.market_level)
+    assert a.degree_rows.keys() == b.degree_rows.keys()
+    for key in a.degree_rows:
+        np.testing.assert_array_equal(a.degree_rows[key], b.degree_rows[key])
+
+
+def test_round_trip(tmp_path):
+    catalog = MappedCatalog(compile_careers(tmp_path, CAREERS))
+    assert len(catalog) == len(CAREERS)
+    assert [dict(record) for record in catalog] == [expected_record(c) for c in CAREERS]
+    assert catalog.streams == STREAMS
+    # Missing dimensions stay NaN in the raw profiles
+    assert np.isnan(catalog.riasec[0, RIASEC_KEYS.index("realistic")])
+    assert np.isnan(catalog.personality[1]).all()
+
+
+def test_mapped_snapshot_matches_in_memory(tmp_path):
+    catalog = MappedCatalog(compile_careers(tmp_path, CAREERS))
+    mapped = CatalogSnapshot(catalog, STREAMS, catalog.version)
+    assert_same_snapshot(mapped, CatalogSnapshot(CAREERS, STREAMS, "in-memory"))
+    mm = np.frombuffer(catalog._mm, dtype="u1")
+    assert all(np.shares_memory(getattr(mapped.scorer, name), mm) for name in CareerScorer.COLUMNS)
+    assert [mapped.records.row(c["id"]) for c in CAREERS] == [0, 1, 2]
+    assert mapped.records.row("astronaut") is None
+
+
+def test_compiled_builtin_catalog_recommends_the_same(tmp_path, monkeypatch):
+    builtin = CareerRecommendationEngine()
+    path = compile_careers(tmp_path, builtin._load_career_data(), streams=builtin._load_stream_data())
+    monkeypatch.setenv("CAREER_CATALOG_PATH", path)
+    monkeypatch.setenv("CATALOG_RELOAD_INTERVAL", "0")
+    compiled = CareerRecommendationEngine()
+    interests = {"realistic": 30, "investigative": 85, "artistic": 40, "social": 70, "enterprising": 55,
+                 "conventional": 65}
+    aptitude = {"logical": 80, "numerical": 75, "spatial": 50, "verbal": 60}
+    for constraints in (None, {"streams": ["Commerce"]}, {"min_salary": 5, "job_market": "Good+"}):
+        expected = builtin.recommend_careers(interests, aptitude, class_level=9, constraints=constraints)
+        got = compiled.recommend_careers(interests, aptitude, class_level=9, constraints=constraints)
+        assert [(dict(r["career"]), r["fit_score"], r["reasons"]) for r in got] == \
+            [(r["career"], r["fit_score"], r["reasons"]) for r in expected]
+    assert compiled.recommend_streams(interests, aptitude) == builtin.recommend_streams(interests, aptitude)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "careers.json"
+    path.write_text(json.dumps(CAREERS), encoding="utf-8")
+    with pytest.raises(ValueError, match="not a compiled career catalog"):
+        MappedCatalog(str(path))
+
+
+@pytest.mark.parametrize("fmt", [1, 2, FORMAT_VERSION + 1])
+def test_rejects_other_format_versions(tmp_path, fmt):
+    path = compile_careers(tmp_path, CAREERS)
+    with open(path, "r+b") as f:
+        f.write(struct.pack("<8sI", MAGIC, fmt))
+    with pytest.raises(ValueError, match="recompile the catalog"):
+        MappedCatalog(path)
+
+
+def test_reload_swaps_snapshots_and_keeps_old_ones_readable(tmp_path):
+    path = compile_careers(tmp_path, CAREERS)
+    source = CatalogSource(path, {}, check_interval=0)
+    before = source.current()
+    assert source.reload_if_changed() is False
+
+    compile_careers(tmp_path, CAREERS[:2], name="catalog.bin")
+    assert source.reload_if_changed() is True
+    after = source.current()
+    assert after.version != before.version and len(after.careers) == 2
+    # Snapshots already handed out keep reading the replaced file
+    assert dict(before.careers[2])["id"] == "teacher"
+
+    # A broken replacement keeps serving the last good catalog
+    broken = tmp_path / "broken.bin"
+    broken.write_bytes(b"not a catalog")
+    os.replace(broken, path)
+    assert source.reload_if_changed() is False
+    assert source.current() is after
+
+
+def test_background_reload(tmp_path):
+    path = compile_careers(tmp_path, CAREERS)
+    source = CatalogSource(path, {}, check_interval=0.02)
+    try:
+        version = source.current().version
+        compile_careers(tmp_path, CAREERS[1:], name="catalog.bin")
+        deadline = time.monotonic() + 5
+        while source.current().version == version and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(source.current().careers) == 2
+    finally:
+        source.close()
@@ -0,0 +1,127 @@
+# ai-services/tests/test_colleges.py
+
+import json
+import math
+import random
+
+import numpy as np
+import pytest
+
+from models.colleges import (FIT_WEIGHT, DISTANCE_WEIGHT, QUALITY_WEIGHT, CollegeRecommendationEngine, GeoGrid,
+                             bounding_box, college_quality, haversine_km)
+
+STREAMS = ["Science", "Commerce", "Arts"]
+DEGREES = {"Science": "BSc", "Commerce": "BCom", "Arts": "BA"}
+
+
+def random_colleges(n, seed=0):
+    rng = random.Random(seed)
+    colleges = []
+    for i in range(n):
+        courses = []
+        for stream in rng.sample(STREAMS, rng.randint(1, 3)):
+            for j in range(rng.randint(1, 2)):
+                fee = rng.choice([None, 5000, 8000, 12000, 20000])
+                courses.append({"name": f"{DEGREES[stream]} {i}.{j}", "degree": DEGREES[stream],
+                                "fees": {"annual": fee}})
+        colleges.append({
+            "id": f"c{i}",
+            "location": {"coordinates": [74 + rng.uniform(-2, 2), 33 + rng.uniform(-2, 2)]},
+            "courses": courses,
+            "accreditation": {"naac": rng.choice([None, "A", "B+", "C"])},
+            "rankings": {"placementRate": rng.choice([None, 30, 70])},
+        })
+    return colleges
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = tmp_path / "colleges.json"
+    path.write_text(json.dumps(random_colleges(400)))
+    return CollegeRecommendationEngine(data_path=str(path))
+
+
+def reference(colleges, latitude, longitude, stream_fits, radius_km=50, k=10, max_fees=None):
+    """Every college scored by its best in-budget stream, (rounded score desc, position) order."""
+    ranked = []
+    for pos, college in enumerate(colleges):
+        lon, lat = college["location"]["coordinates"]
+        d = float(haversine_km(latitude, longitude, np.array([lat]), np.array([lon]))[0])
+        if d > radius_km:
+            continue
+        best = None
+        for stream, fit in stream_fits.items():
+            courses = [c for c in college["courses"] if c["degree"] == DEGREES[stream]]
+            if not courses:
+                continue
+            fees = [c["fees"]["annual"] for c in courses if c["fees"]["annual"] is not None]
+            if max_fees is not None and fees and min(fees) > max_fees:
+                continue
+            score = FIT_WEIGHT * fit / 100 + DISTANCE_WEIGHT * (1 - d / radius_km) + QUALITY_WEIGHT * college_quality(college)
+            if best is None or score > best[0]:
+                best = (score, stream)
+        if best:
+            ranked.append((-round(best[0] * 100, 1), pos, college["id"], best[1]))
+    return [(cid, stream) for _, _, cid, stream in sorted(ranked)[:k]]
+
+
+def test_grid_query_covers_every_point_in_the_box():
+    rng = np.random.default_rng(1)
+    lats, lons = rng.uniform(-60, 60, 2000), rng.uniform(-170, 170, 2000)
+    grid = GeoGrid(lats, lons, cell_deg=0.5)
+    for lat, lon, radius in [(10, 20, 300), (-45.3, 100.1, 50), (0, 0, 5000)]:
+        box = bounding_box(lat, lon, radius)
+        inside = (lats >= box[0]) & (lats <= box[1]) & (lons >= box[2]) & (lons <= box[3])
+        found = grid.query(box)
+        assert set(np.flatnonzero(inside)) <= set(found.tolist())
+        assert len(set(found.tolist())) == len(found)
+
+
+@pytest.mark.parametrize("radius_km,max_fees", [(50, None), (120, None), (120, 8000), (300, 5000)])
+def test_matches_brute_force(engine, radius_km, max_fees):
+    colleges = random_colleges(400)
+    fits = {"Science": 80, "Commerce": 55, "Arts": 30}
+    got = engine.recommend_colleges(33.2, 74.1, fits, radius_km=radius_km, k=15, max_fees=max_fees)
+    assert [(r["college"]["id"], r["stream"]) for r in got] == reference(
+        colleges, 33.2, 74.1, fits, radius_km=radius_km, k=15, max_fees=max_fees)
+
+
+def test_results_respect_radius_streams_and_fees(engine):
+    got = engine.recommend_colleges(33.0, 74.0, {"Commerce": 70}, radius_km=150, k=50, max_fees=8000)
+    assert got
+    assert all(r["stream"] == "Commerce" for r in got)
+    assert all(r["distance_km"] <= 150 for r in got)
+    assert all(r["min_annual_fee"] is None or r["min_annual_fee"] <= 8000 for r in got)
+    scores = [r["fit_score"] for r in got]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_unknown_fees_pass_the_cap(tmp_path):
+    colleges = [
+        {"id": "free", "location": {"coordinates": [74.80, 34.07]},
+         "courses": [{"name": "BA", "degree": "BA", "fees": {"annual": None}}]},
+        {"id": "pricey", "location": {"coordinates": [74.81, 34.07]},
+         "courses": [{"name": "BA", "degree": "BA", "fees": {"annual": 50000}}]},
+    ]
+    path = tmp_path / "colleges.json"
+    path.write_text(json.dumps(colleges))
+    engine = CollegeRecommendationEngine(data_path=str(path))
+    got = engine.recommend_colleges(34.07, 74.80, {"Arts": 50}, max_fees=1000)
+    assert [r["college"]["id"] for r in got] == ["free"]
+    assert got[0]["min_annual_fee"] is None
+
+
+def test_builtin_colleges_near_srinagar():
+    engine = CollegeRecommendationEngine()
+    got = engine.recommend_colleges(34.07, 74.82, {"Science": 90, "Arts": 20}, radius_km=30)
+    assert {r["college"]["location"]["city"] for r in got} == {"Srinagar"}
+    assert all(r["stream"] == "Science" for r in got)
+    assert got[0]["courses"] and all(not math.isnan(r["distance_km"]) for r in got)
+
+
+def test_rejects_bad_coordinates_and_radius():
+    engine = CollegeRecommendationEngine()
+    with pytest.raises(ValueError):
+        engine.recommend_colleges(91, 0, {"Arts": 50})
+    with pytest.raises(ValueError):
+        engine.recommend_colleges(34, 74, {"Arts": 50}, radius_km=0)
@@ -0,0 +1,84 @@
+# ai-services/tests/test_constraints.py
+
+import random
+
+import numpy as np
+import pytest
+
+from models.constraints import JOB_MARKET_LEVELS, ConstraintIndex, career_degrees, parse_salary_range
+from models.scoring import CareerIndex, career_streams
+
+STREAMS = ["Science", "Commerce", "Arts", "Any", "Commerce/Science", "Arts/Science"]
+DEGREES = ["B.Tech", "B.Com", "BBA/B.Com", "BFA/B.Des", "B.Ed"]
+
+
+def catalog(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    careers = []
+    for i in range(n):
+        low = rng.randint(2, 12)
+        careers.append({
+            "id": f"career_{i}",
+            "education_path": [rng.choice(STREAMS), "Specialization", rng.choice(DEGREES)],
+            "salary_range": rng.choice([f"₹{low}-{low + rng.randint(0, 20)} LPA", f"₹{low} LPA", "Varies"]),
+            "job_market": rng.choice(JOB_MARKET_LEVELS + [""]),
+        })
+    return careers
+
+
+def brute_force(career: dict, constraints: dict) -> bool:
+    if "min_salary" in constraints and not parse_salary_range(career["salary_range"])[0] >= constraints["min_salary"]:
+        return False
+    if "streams" in constraints:
+        streams = {s.lower() for s in career_streams(career)}
+        if "any" not in streams and not streams & {s.lower() for s in constraints["streams"]}:
+            return False
+    if "job_market" in constraints:
+        rank = {m: i for i, m in enumerate(JOB_MARKET_LEVELS)}
+        level = rank.get(career["job_market"], -1)
+        if level < rank[constraints["job_market"].rstrip("+")]:
+            return False
+    if "degrees" in constraints:
+        if not {d.lower() for d in career_degrees(career)} & {d.lower() for d in constraints["degrees"]}:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("constraints", [
+    {"streams": ["commerce"]},
+    {"streams": ["Arts", "Science"], "min_salary": 6},
+    {"job_market": "Good+", "degrees": ["b.com"]},
+    {"min_salary": 8, "streams": ["Science"], "job_market": "Average+", "degrees": ["B.Tech", "BBA"]},
+    {"streams": ["Unknown"]},
+])
+def test_masks_match_brute_force(constraints):
+    careers = catalog(500)
+    index = ConstraintIndex(careers, CareerIndex(careers))
+    expected = np.array([brute_force(c, constraints) for c in careers])
+    np.testing.assert_array_equal(index.mask(constraints), expected)
+
+
+def test_no_constraints_is_none():
+    careers = catalog(10)
+    index = ConstraintIndex(careers, CareerIndex(careers))
+    assert index.mask(None) is None
+    assert index.mask({"streams": []}) is None
+
+
+@pytest.mark.parametrize("constraints", [
+    {"streams": 5},
+    {"degrees": ["B.Com", 3]},
+    {"job_market": {"at_least": "Good"}},
+    {"min_salary": [5]},
+    {"min_salary": "lots"},
+])
+def test_malformed_values_are_rejected(constraints):
+    careers = catalog(10)
+    with pytest.raises(ValueError):
+        ConstraintIndex(careers, CareerIndex(careers)).mask(constraints)
+
+
+def test_unknown_job_market_level_is_rejected():
+    careers = catalog(10)
+    with pytest.raises(ValueError):
+        ConstraintIndex(careers, CareerIndex(careers)).mask({"job_market": "Stellar"})
@@ -0,0 +1,66 @@
+# ai-services/tests/test_executor.py
+
+import asyncio
+import threading
+
+import pytest
+
+from models import executor
+from models.executor import EngineExecutor, LazyEngines, NotStarted, Overloaded
+
+
+class Echo:
+    def __init__(self):
+        self.built_on = threading.current_thread().name
+
+    def built_thread(self):
+        return self.built_on
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    monkeypatch.setattr(executor, "build_engine", lambda name: Echo())
+    return LazyEngines()
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+def test_lazy_engines_are_built_off_the_calling_thread(engines, mode):
+    pool = EngineExecutor(engines, mode=mode, workers=1)
+    pool.start()
+    try:
+        built_on = asyncio.run(pool.run("career", "built_thread"))
+    finally:
+        pool.shutdown()
+    assert built_on != threading.current_thread().name
+    assert engines.built() == ["career"]
+
+
+def test_pooled_executor_refuses_to_run_before_start(engines):
+    pool = EngineExecutor(engines, mode="thread", retry_after=7)
+    with pytest.raises(NotStarted) as raised:
+        asyncio.run(pool.run("career", "built_thread"))
+    assert raised.value.retry_after == 7
+    assert engines.get("career") is None
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_call_runs_local_objects_off_the_loop_and_sheds_when_full(engines, mode):
+    pool = EngineExecutor(engines, mode=mode, workers=1, max_queue=0, retry_after=3)
+    pool.start()
+
+    async def scenario():
+        release = threading.Event()
+        first = asyncio.ensure_future(pool.call(lambda: release.wait(5) and threading.current_thread().name))
+        await asyncio.sleep(0.05)
+        with pytest.raises(Overloaded) as raised:
+            await pool.call(str, 1)
+        release.set()
+        return await first, raised.value.retry_after
+
+    try:
+        worker, retry_after = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert worker != threading.current_thread().name
+    assert retry_after == 3
+    assert pool.stats()["rejected"] == 1
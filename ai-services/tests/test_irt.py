@@ -0,0 +1,100 @@
+# ai-services/tests/test_irt.py
+
+import json
+
+import numpy as np
+import pytest
+
+from models.aptitude import AptitudeEngine
+from models.irt import DOMAINS, THETA_GRID, AbilityEstimate, ItemBank, difficulty_level
+
+
+def p3(theta, a, b, c):
+    return c + (1 - c) / (1 + np.exp(-a * (theta - b)))
+
+
+def random_items(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{"id": f"I{i}", "domain": DOMAINS[i % len(DOMAINS)], "text": "?",
+             "a": float(rng.uniform(0.5, 2.5)), "b": float(rng.uniform(-2.5, 2.5)),
+             "c": float(rng.choice([0.0, 0.2, 0.25]))} for i in range(n)]
+
+
+@pytest.fixture
+def bank():
+    return ItemBank(random_items(200))
+
+
+def test_tables_follow_the_3pl_model(bank):
+    p = p3(THETA_GRID[None, :], bank.a[:, None], bank.b[:, None], bank.c[:, None])
+    assert np.exp(bank.log_p) == pytest.approx(p, abs=1e-9)
+    assert np.exp(bank.log_q) == pytest.approx(1 - p, abs=1e-9)
+    # Fisher information P'^2 / (P (1 - P)), P' by central differences
+    h = 1e-5
+    dp = (p3(THETA_GRID + h, bank.a[:, None], bank.b[:, None], bank.c[:, None])
+          - p3(THETA_GRID - h, bank.a[:, None], bank.b[:, None], bank.c[:, None])) / (2 * h)
+    assert bank.information == pytest.approx(dp ** 2 / (p * (1 - p)), rel=1e-5, abs=1e-9)
+
+
+def test_eap_matches_the_grid_posterior(bank):
+    answers = [(3, True), (7, False), (11, True), (19, True), (23, False)]
+    est = AbilityEstimate(prior_mean=0.5, prior_sd=1.0)
+    posterior = np.exp(-0.5 * (THETA_GRID - 0.5) ** 2)
+    for pos, correct in answers:
+        est.update(bank, pos, correct)
+        p = p3(THETA_GRID, bank.a[pos], bank.b[pos], bank.c[pos])
+        posterior *= p if correct else 1 - p
+    w = posterior / posterior.sum()
+    mean = w @ THETA_GRID
+    assert est.answered == len(answers)
+    assert est.theta == pytest.approx(mean, abs=1e-9)
+    assert est.se == pytest.approx(np.sqrt(w @ (THETA_GRID - mean) ** 2), abs=1e-9)
+
+
+def test_prior_only_estimate_is_the_prior():
+    # N(0, 1) is symmetric on the grid; off-centre priors lose a little to the grid's edge at +-4
+    est = AbilityEstimate()
+    assert est.theta == pytest.approx(0.0, abs=1e-12)
+    assert est.se == pytest.approx(1.0, abs=1e-3)
+    assert AbilityEstimate(prior_mean=-1.0).theta == pytest.approx(-1.0, abs=1e-2)
+
+
+def test_selector_picks_the_most_informative_unseen_item(bank):
+    seen = set()
+    for theta in (-1.3, 0.0, 0.0, 2.1, 0.4):
+        pos = bank.most_informative(1, theta, seen)
+        g = bank.grid_index(theta)
+        unseen = [i for i in np.flatnonzero(bank.domain_codes == 1) if i not in seen]
+        assert pos not in seen and bank.domain_codes[pos] == 1
+        assert bank.information[pos, g] == max(bank.information[i, g] for i in unseen)
+        seen.add(pos)
+    seen.update(np.flatnonzero(bank.domain_codes == 1).tolist())
+    assert bank.most_informative(1, 0.0, seen) is None
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps(random_items(200)), encoding="utf-8")
+    return AptitudeEngine(str(path), se_target=0.6)
+
+
+def test_test_stops_once_every_domain_is_precise(engine):
+    answers = []
+    while True:
+        question = engine.get_next_question(answers)
+        if question.get("done"):
+            break
+        assert question["id"] not in {a["id"] for a in answers}
+        assert question["difficulty"] == difficulty_level(engine.bank.b[engine.bank.position[question["id"]]])
+        answers.append({"id": question["id"], "correct": len(answers) % 3 != 0})
+    estimates = [AbilityEstimate() for _ in DOMAINS]
+    for a in answers:
+        pos = engine.bank.position[a["id"]]
+        estimates[engine.bank.domain_codes[pos]].update(engine.bank, pos, a["correct"])
+    assert all(est.se <= 0.6 for est in estimates)
+    assert len(answers) < engine.max_items
+
+
+def test_difficulty_levels():
+    assert [difficulty_level(b) for b in (-3, -1, 0, 1, 3)] == [1, 2, 3, 4, 5]
@@ -0,0 +1,66 @@
+# ai-services/tests/test_metrics.py
+
+import re
+
+import pytest
+
+from models.metrics import LATENCY_BUCKETS, MetricsRegistry, stage
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    """Prometheus text format -> ({name: type}, [(name, labels, value)]); fails on malformed lines."""
+    types, samples = {}, []
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name, labels, value = match.groups()
+            samples.append((name, dict(LABEL.findall(labels or "")), float(value)))
+    return types, samples
+
+
+def series(samples, name, **labels):
+    return [(l, v) for n, l, v in samples if n == name and all(l.get(k) == v for k, v in labels.items())]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for value in (0.00005, 0.001, 0.001, 0.3, 7.0):
+        registry.observe("edupath_request_duration_seconds", value, (("endpoint", "/x"),))
+    types, samples = parse(registry.render())
+    assert types == {"edupath_request_duration_seconds": "histogram"}
+    buckets = {l["le"]: v for l, v in series(samples, "edupath_request_duration_seconds_bucket", endpoint="/x")}
+    assert list(buckets) == ["%g" % b for b in LATENCY_BUCKETS] + ["+Inf"]
+    assert buckets["0.0001"] == 1
+    assert buckets["0.001"] == 3          # le is inclusive
+    assert buckets["0.25"] == 3 and buckets["0.5"] == 4
+    assert buckets["5"] == 4 and buckets["+Inf"] == 5
+    assert series(samples, "edupath_request_duration_seconds_count")[0][1] == 5
+    assert series(samples, "edupath_request_duration_seconds_sum")[0][1] == pytest.approx(7.30205)
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("edupath_requests_total", (("endpoint", 'a"b\\c\nd'),))
+    _, samples = parse(registry.render())
+    assert samples == [("edupath_requests_total", {"endpoint": 'a\\"b\\\\c\\nd'}, 1.0)]
+
+
+def test_disabled_registry_records_nothing(monkeypatch):
+    from models import metrics
+    registry = MetricsRegistry(enabled=False)
+    monkeypatch.setattr(metrics, "METRICS", registry)
+    with stage("career.similarity"):
+        pass
+    trace, token = registry.begin_request("/x")
+    registry.end_request(trace, token, "GET", 200)
+    assert registry.render() == "\n"
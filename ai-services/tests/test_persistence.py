@@ -0,0 +1,115 @@
+# ai-services/tests/test_persistence.py
+
+import asyncio
+import json
+import sqlite3
+
+from models.persistence import InMemoryResultStore, ResultWriter, SQLiteResultStore, result_writer_from_env
+
+
+class FlakyStore(InMemoryResultStore):
+    """Fails the first `failures` batches."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.closed = False
+
+    def insert_many(self, documents):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store down")
+        super().insert_many(documents)
+
+    def close(self):
+        self.closed = True
+
+
+def test_close_flushes_what_is_queued():
+    store = FlakyStore(failures=0)
+    writer = ResultWriter(store, batch_size=100, flush_interval=60)
+
+    async def scenario():
+        writer.start()
+        for i in range(3):
+            writer.record("interest_profile", {"n": i}, {"ok": True}, endpoint="/x", student_id=f"s{i}")
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert [d["input"] for d in store.documents] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert [d["student_id"] for d in store.documents] == ["s0", "s1", "s2"]
+    assert store.closed
+    assert writer.counters["written"] == 3 and writer.counters["batches"] == 1
+
+
+def test_close_without_start_still_flushes():
+    store = InMemoryResultStore()
+    writer = ResultWriter(store)
+
+    async def scenario():
+        writer.record("recommendation", {}, [])
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert len(store.documents) == 1
+
+
+def test_failed_batches_are_counted_and_dropped():
+    store = FlakyStore(failures=1)
+    writer = ResultWriter(store, batch_size=2, flush_interval=60)
+
+    async def scenario():
+        writer.start()
+        writer.record("recommendation", {"n": 0}, [])
+        writer.record("recommendation", {"n": 1}, [])
+        while writer.counters["batches"] < 1:
+            await asyncio.sleep(0.01)
+        writer.record("recommendation", {"n": 2}, [])
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert [d["input"] for d in store.documents] == [{"n": 2}]
+    assert writer.counters["failed"] == 2 and writer.counters["written"] == 1
+    assert writer.counters["batches"] == 2
+
+
+def test_full_queue_drops_new_documents():
+    writer = ResultWriter(InMemoryResultStore(), max_queue=2)
+    for i in range(5):
+        writer.record("recommendation", {"n": i}, [])
+    assert writer.counters["recorded"] == 2 and writer.counters["dropped"] == 3
+    assert writer.stats()["queued"] == 2
+
+
+def test_interval_flush_writes_a_partial_batch():
+    store = InMemoryResultStore()
+    writer = ResultWriter(store, batch_size=100, flush_interval=0.02)
+
+    async def scenario():
+        writer.start()
+        writer.record("recommendation", {}, [])
+        for _ in range(200):
+            if store.documents:
+                break
+            await asyncio.sleep(0.01)
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert len(store.documents) == 1 and writer.counters["interval_flushes"] == 1
+
+
+def test_sqlite_store(tmp_path):
+    path = tmp_path / "results.db"
+    writer = result_writer_from_env({"RESULTS_STORE": f"sqlite:///{path}", "RESULTS_FLUSH_MS": "10"})
+    assert isinstance(writer.store, SQLiteResultStore)
+
+    async def scenario():
+        writer.start()
+        writer.record("aptitude_result", {"answers": [1, 2]}, {"score": 50}, endpoint="/e", student_id="s1")
+        await writer.close()
+
+    asyncio.run(scenario())
+    rows = sqlite3.connect(path).execute("SELECT kind, student_id, document FROM results").fetchall()
+    assert [(kind, student_id) for kind, student_id, _ in rows] == [("aptitude_result", "s1")]
+    document = json.loads(rows[0][2])
+    assert document["input"] == {"answers": [1, 2]} and document["endpoint"] == "/e"
@@ -0,0 +1,48 @@
+# ai-services/tests/test_personality.py
+
+import random
+
+import pytest
+
+from models.personality import CATEGORIES, INTEREST_TIPS, PersonalityAnalyzer
+
+
+def reference(responses):
+    """Per-category mean rating, scaled so the best category is 100."""
+    sums, counts = dict.fromkeys(CATEGORIES, 0.0), dict.fromkeys(CATEGORIES, 0)
+    for r in responses:
+        if r.get("category") in sums and isinstance(r.get("rating"), (int, float)):
+            sums[r["category"]] += r["rating"]
+            counts[r["category"]] += 1
+    means = {c: sums[c] / counts[c] if counts[c] else 0.0 for c in CATEGORIES}
+    top = max(means.values())
+    return {c: m / (top if top > 0 else 1.0) * 100 for c, m in means.items()}
+
+
+def random_students(n, seed=0):
+    rng = random.Random(seed)
+    students = []
+    for _ in range(n):
+        responses = [{"category": rng.choice(CATEGORIES + ["unknown"]), "rating": rng.choice([1, 2, 3, 4, 5, 2.5, "5"])}
+                     for _ in range(rng.randint(0, 30))]
+        students.append(responses)
+    return students
+
+
+def test_bulk_matches_per_student_reference():
+    students = random_students(200)
+    results = PersonalityAnalyzer().analyze_bulk(students)
+    assert len(results) == len(students)
+    for responses, result in zip(students, results):
+        expected = reference(responses)
+        assert result["profile"] == pytest.approx(expected)
+        top = sorted(CATEGORIES, key=lambda c: -expected[c])[:3]
+        assert [c for c, _ in result["primary_interests"]] == top
+        assert result["interpretation"] == [INTEREST_TIPS[c] for c in top]
+
+
+def test_single_analysis_is_a_bulk_of_one():
+    analyzer = PersonalityAnalyzer()
+    responses = random_students(1, seed=3)[0]
+    assert analyzer.analyze_responses(responses) == analyzer.analyze_bulk([responses])[0]
+    assert analyzer.analyze_bulk([]) == []
@@ -0,0 +1,36 @@
+# ai-services/tests/test_records.py
+
+import json
+import pickle
+
+import pytest
+
+from models.recommender import CareerRecommendationEngine
+from models.records import CAREER_FIELDS, check_projection, render_recommendations
+
+INTERESTS = {"realistic": 20, "investigative": 40, "artistic": 80, "social": 90, "enterprising": 40,
+             "conventional": 30}
+
+
+@pytest.fixture
+def recommendations():
+    # class 9: the built-in teacher and graphic designer carry a young_prior
+    return CareerRecommendationEngine().recommend_careers(INTERESTS, {"verbal": 80}, class_level=9)
+
+
+def test_full_mode_renders_only_public_fields(recommendations):
+    assert "young_prior" in recommendations[0]["career"]
+    rendered = json.loads(render_recommendations(recommendations))
+    assert [list(r["career"]) for r in rendered] == [list(CAREER_FIELDS)] * len(recommendations)
+    assert [r["career"]["id"] for r in rendered] == [r["career"]["id"] for r in recommendations]
+
+
+def test_cached_results_render_the_same(recommendations):
+    # Results that went through a cache or a process pool carry plain dicts
+    restored = pickle.loads(pickle.dumps(recommendations))
+    assert render_recommendations(restored) == render_recommendations(recommendations)
+
+
+def test_projection_of_internal_fields_is_rejected():
+    with pytest.raises(ValueError):
+        check_projection("full", ["young_prior"])
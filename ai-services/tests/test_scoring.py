@@ -0,0 +1,227 @@
+# ai-services/tests/test_scoring.py
+
+"""CareerScorer and recommend_careers against the original per-career formulas."""
+
+import json
+import math
+import random
+
+import numpy as np
+import pytest
+
+from models.catalog import compile_catalog
+from models.recommender import CareerRecommendationEngine
+from models.scoring import APTITUDE_KEYS, BIG_FIVE_KEYS, RIASEC_KEYS, CareerScorer, top_k, top_k_rows
+
+# -- the per-career formulas CareerScorer replaced ---------------------------------
+def reference_similarity(student: dict, career: dict) -> float:
+    keys = [k for k in student if k in career]
+    dot = sum(student[k] * career[k] for k in keys)
+    norm = math.sqrt(sum(student[k] ** 2 for k in keys)) * math.sqrt(sum(career[k] ** 2 for k in keys))
+    return dot / norm if norm else 0.0
+
+
+def reference_aptitude_match(student: dict, required: dict) -> float:
+    matches = [1 - abs(student[k] / 100 - level / 100) for k, level in required.items() if k in student]
+    return sum(matches) / len(matches) if matches else 0.5
+
+
+def reference_scores(career: dict, interests: dict, aptitude, class_level: int):
+    similarity = reference_similarity(interests, career["riasec_profile"])
+    match = 0.5
+    if aptitude and career.get("required_aptitude"):
+        match = reference_aptitude_match(aptitude, career["required_aptitude"])
+    fit = similarity * 0.7 + match * 0.3
+    if class_level <= 10:
+        fit += 0.1 * career.get("young_prior", 0)
+    return fit, similarity, match
+
+
+def reference_recommendations(careers, interests, aptitude, class_level, k=10):
+    results = []
+    for career in careers:
+        fit, similarity, match = reference_scores(career, interests, aptitude, class_level)
+        results.append((career["id"], round(fit * 100, 1), round(similarity * 100, 1), round(match * 100, 1)))
+    # The original sorted by the displayed fit score; sort is stable, so ties keep catalog order
+    results.sort(key=lambda r: r[1], reverse=True)
+    return results[:k]
+
+
+# -- fixtures ----------------------------------------------------------------------
+def random_profile(rng: random.Random, keys, keep: float = 1.0) -> dict:
+    return {k: round(rng.uniform(0, 100), rng.choice([0, 1, 3])) for k in keys if rng.random() < keep}
+
+
+def random_catalog(rng: random.Random, n: int) -> list:
+    """Careers with some RIASEC and aptitude dimensions not listed."""
+    return [
+        {
+            "id": f"career_{i}",
+            "name": f"Career {i}",
+            "riasec_profile": random_profile(rng, RIASEC_KEYS, keep=0.8),
+            "required_aptitude": random_profile(rng, APTITUDE_KEYS, keep=0.6),
+            "education_path": ["Science", "Engineering", "B.Tech"],
+            "salary_range": "₹4-10 LPA",
+            "job_market": "Good",
+            "description": "",
+            "young_prior": rng.choice([0, 0, 0, 1, 0.5]),
+        }
+        for i in range(n)
+    ]
+
+
+def engine_for(careers, tmp_path, monkeypatch) -> CareerRecommendationEngine:
+    source = tmp_path / "careers.json"
+    source.write_text(json.dumps(careers), encoding="utf-8")
+    compile_catalog(str(source), str(tmp_path / "catalog.bin"))
+    monkeypatch.setenv("CAREER_CATALOG_PATH", str(tmp_path / "catalog.bin"))
+    return CareerRecommendationEngine()
+
+
+def assert_matches_reference(careers, interests, aptitude, class_level):
+    fit, similarity, match = CareerScorer(careers).score(interests, aptitude, class_level)
+    expected = np.array([reference_scores(c, interests, aptitude, class_level) for c in careers])
+    np.testing.assert_allclose(fit, expected[:, 0], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(similarity, expected[:, 1], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(match, expected[:, 2], rtol=0, atol=1e-12)
+
+
+# -- tests -------------------------------------------------------------------------
+def test_full_profiles_match_reference():
+    careers = CareerRecommendationEngine()._load_career_data()
+    rng = random.Random(1)
+    for _ in range(200):
+        aptitude = random_profile(rng, APTITUDE_KEYS) if rng.random() < 0.7 else None
+        assert_matches_reference(careers, random_profile(rng, RIASEC_KEYS), aptitude, rng.choice([9, 10, 11, 12]))
+
+
+def test_partial_profiles_match_reference():
+    rng = random.Random(2)
+    careers = random_catalog(rng, 200)
+    for _ in range(100):
+        interests = random_profile(rng, RIASEC_KEYS, keep=0.6)
+        aptitude = random_profile(rng, APTITUDE_KEYS, keep=0.5)
+        assert_matches_reference(careers, interests, aptitude, rng.choice([9, 12]))
+
+
+@pytest.mark.parametrize("interests, aptitude", [
+    ({k: 0.0 for k in RIASEC_KEYS}, None),       # all-zero interests: similarity 0
+    ({}, {}),                                      # nothing given
+    ({"artistic": 80}, {"logical": 70}),           # dimensions some careers don't list
+])
+def test_degenerate_profiles_match_reference(interests, aptitude):
+    careers = random_catalog(random.Random(3), 50)
+    assert_matches_reference(careers, interests, aptitude, 10)
+
+
+def test_rows_subset_is_aligned_with_rows():
+    careers = random_catalog(random.Random(4), 100)
+    scorer = CareerScorer(careers)
+    interests, aptitude = {"investigative": 90, "social": 20}, {"numerical": 60, "verbal": 40}
+    rows = np.array([3, 17, 42, 99])
+    full = scorer.score(interests, aptitude, 11)
+    subset = scorer.score(interests, aptitude, 11, rows=rows)
+    for whole, part in zip(full, subset):
+        np.testing.assert_array_equal(whole[rows], part)
+
+
+def test_builtin_recommendations_match_reference():
+    engine = CareerRecommendationEngine()
+    careers = engine._load_career_data()
+    rng = random.Random(5)
+    for _ in range(100):
+        interests = random_profile(rng, RIASEC_KEYS)
+        aptitude = random_profile(rng, APTITUDE_KEYS) if rng.random() < 0.7 else None
+        class_level = rng.choice([9, 10, 11, 12])
+        got = [(r["career"]["id"], r["fit_score"], r["interest_match"], r["aptitude_match"])
+               for r in engine.recommend_careers(interests, aptitude, class_level=class_level)]
+        assert got == reference_recommendations(careers, interests, aptitude, class_level)
+
+
+def test_ties_keep_catalog_order(tmp_path, monkeypatch):
+    rng = random.Random(6)
+    careers = random_catalog(rng, 8)
+    # Three identical careers scattered through the catalog tie on every score
+    twin = {"riasec_profile": {"investigative": 90, "realistic": 70}, "required_aptitude": {"logical": 80}}
+    for i in (1, 4, 6):
+        careers[i].update(twin)
+    careers += random_catalog(random.Random(7), 20)[8:]
+    engine = engine_for(careers, tmp_path, monkeypatch)
+    interests, aptitude = {"investigative": 90, "realistic": 70}, {"logical": 80}
+
+    got = [r["career"]["id"] for r in engine.recommend_careers(interests, aptitude, class_level=12, k=5)]
+    expected = [r[0] for r in reference_recommendations(careers, interests, aptitude, 12, k=5)]
+    assert got == expected
+    assert got[:3] == ["career_1", "career_4", "career_6"]
+
+
+def test_young_prior_comes_from_the_catalog(tmp_path, monkeypatch):
+    careers = random_catalog(random.Random(9), 3)
+    # Arbitrary ids: nothing about the prior is tied to the built-in careers
+    for career, career_id, social, prior in zip(careers, ["astronaut", "zookeeper", "teacher"], [90, 80, 85],
+                                                 [0, 1, 0]):
+        career.update(id=career_id, riasec_profile={"social": social, "artistic": 100 - social},
+                      required_aptitude={}, young_prior=prior)
+    engine = engine_for(careers, tmp_path, monkeypatch)
+    interests = {"social": 90, "artistic": 10}
+
+    def ranking(class_level):
+        return [r["career"]["id"] for r in engine.recommend_careers(interests, class_level=class_level)]
+
+    assert ranking(11) == ranking(12) == ["astronaut", "teacher", "zookeeper"]
+    assert ranking(9) == ranking(10) == ["zookeeper", "astronaut", "teacher"]
+
+
+def test_top_k_breaks_ties_by_index():
+    keys = np.array([5.0, 7.0, 5.0, 7.0, 1.0, 5.0])
+    assert top_k(keys, 3).tolist() == [1, 3, 0]
+    assert top_k(keys, 4).tolist() == [1, 3, 0, 2]
+    assert top_k(keys, 10).tolist() == [1, 3, 0, 2, 5, 4]
+    assert top_k(keys, 0).tolist() == []
+
+
+def test_batch_matches_single_requests():
+    engine = CareerRecommendationEngine()
+    rng = random.Random(8)
+    requests = [{"interests": random_profile(rng, RIASEC_KEYS, keep=1.0 if i % 3 else 0.5),
+                 "aptitude": random_profile(rng, APTITUDE_KEYS) if i % 2 else None,
+                 "class_level": rng.choice([9, 12]), "k": 3}
+                for i in range(19)]
+    requests[5]["constraints"] = {"job_market": "Stellar"}
+    results = engine.recommend_careers_batch(requests, scratch_bytes=1)
+    assert isinstance(results[5], ValueError)
+    for i, (request, result) in enumerate(zip(requests, results)):
+        if i != 5:
+            assert result == engine.recommend_careers(**request)
+
+
+@pytest.mark.parametrize("scratch_bytes", [1, 1 << 30])
+def test_batch_matches_single_requests_with_filters_and_personality(tmp_path, monkeypatch, scratch_bytes):
+    rng = random.Random(10)
+    careers = random_catalog(rng, 300)
+    for career in careers:
+        career["personality_profile"] = random_profile(rng, BIG_FIVE_KEYS, keep=0.7)
+        career["education_path"][0] = rng.choice(["Science", "Commerce", "Arts", "Any"])
+        career["job_market"] = rng.choice(["Excellent", "Good", "Average"])
+    engine = engine_for(careers, tmp_path, monkeypatch)
+    filters = [{}, {"streams": ["Commerce"]}, {"job_markets": ["Good"]},
+               {"constraints": {"job_market": "Good+", "streams": ["Arts"]}},
+               {"constraints": {"streams": ["Nowhere"]}}]
+    requests = [{"interests": random_profile(rng, RIASEC_KEYS, keep=1.0 if i % 4 else 0.5),
+                 "aptitude": random_profile(rng, APTITUDE_KEYS, keep=0.7) if i % 3 else None,
+                 "personality": random_profile(rng, BIG_FIVE_KEYS) if i % 2 else None,
+                 "class_level": rng.choice([9, 10, 12]), "k": rng.choice([0, 1, 5, 10, 400]),
+                 **filters[i % len(filters)]}
+                for i in range(40)]
+    results = engine.recommend_careers_batch(requests, scratch_bytes=scratch_bytes)
+    for request, result in zip(requests, results):
+        assert result == engine.recommend_careers(**request)
+
+
+def test_top_k_rows_matches_top_k():
+    rng = np.random.default_rng(11)
+    keys = np.round(rng.uniform(0, 5, size=(20, 50)), 0)    # many ties
+    keys[3, 10:] = -np.inf
+    for k in (0, 1, 7, 49, 50, 80):
+        for row, winners in zip(keys, top_k_rows(keys, k)):
+            assert winners.tolist() == top_k(row, k).tolist()
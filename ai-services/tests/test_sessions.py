@@ -0,0 +1,161 @@
+# ai-services/tests/test_sessions.py
+
+import json
+import threading
+
+import pytest
+from redis.exceptions import WatchError
+
+from models.aptitude import AptitudeEngine
+from models.sessions import (AlreadyAnswered, AptitudeSessions, InMemorySessionStore, RedisSessionStore,
+                             session_store_from_env)
+
+BANK = [
+    {"id": "L1", "domain": "logical", "text": "?", "answer": "Yes", "a": 1.0, "b": 0.0, "c": 0.0},
+    {"id": "N1", "domain": "numerical", "text": "?", "a": 1.0, "b": 0.0, "c": 0.0},   # no answer key
+    {"id": "S1", "domain": "spatial", "text": "?", "answer": "C", "a": 1.0, "b": 0.0, "c": 0.25},
+    {"id": "V1", "domain": "verbal", "text": "?", "answer": "Kind", "a": 1.0, "b": 0.0, "c": 0.25},
+]
+
+
+class FakeRedis:
+    """Just enough of redis-py for RedisSessionStore: a dict plus WATCH/MULTI/EXEC."""
+
+    def __init__(self):
+        self.data, self.versions = {}, {}
+        self.lock = threading.Lock()
+        # Called between a transaction's read and its EXEC, to inject a competing write
+        self.before_exec = None
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.data[key] = value
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client, self.watched, self.queued = client, {}, []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.watched, self.queued = {}, []
+
+    def watch(self, key):
+        self.watched[key] = self.client.versions.get(key, 0)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def multi(self):
+        self.queued = []
+
+    def set(self, key, value, ex=None):
+        self.queued.append((key, value))
+
+    def execute(self):
+        hook, self.client.before_exec = self.client.before_exec, None
+        if hook:
+            hook()
+        with self.client.lock:
+            if any(self.client.versions.get(k, 0) != v for k, v in self.watched.items()):
+                self.watched, self.queued = {}, []
+                raise WatchError("watched key changed")
+            for key, value in self.queued:
+                self.client.data[key] = value
+                self.client.versions[key] = self.client.versions.get(key, 0) + 1
+        self.watched, self.queued = {}, []
+
+
+@pytest.fixture
+def engine(tmp_path):
+    bank = tmp_path / "bank.json"
+    bank.write_text(json.dumps(BANK), encoding="utf-8")
+    return AptitudeEngine(str(bank))
+
+
+@pytest.fixture
+def sessions(engine):
+    return AptitudeSessions(lambda: engine, InMemorySessionStore())
+
+
+def test_answers_update_the_session(sessions):
+    session_id = sessions.start()["session_id"]
+    assert sessions.answer(session_id, "L1", response=" yes ")["answered"] == 1
+    assert sessions.answer(session_id, "S1", correct=False)["answered"] == 2
+    report = sessions.finish(session_id)
+    assert report["scores"]["logical"] == 100.0 and report["scores"]["spatial"] == 0.0
+    with pytest.raises(KeyError):
+        sessions.next(session_id)
+
+
+def test_response_without_an_answer_key_is_a_value_error(sessions):
+    session_id = sessions.start()["session_id"]
+    with pytest.raises(ValueError, match="no answer key"):
+        sessions.answer(session_id, "N1", response="30")
+    # The item stays unanswered, and `correct` still works for it
+    assert sessions.answer(session_id, "N1", correct=True)["answered"] == 1
+
+
+def test_redis_store_has_timeouts():
+    store = session_store_from_env({"APTITUDE_SESSION_REDIS_URL": "redis://localhost:6399/0",
+                                    "APTITUDE_SESSION_REDIS_TIMEOUT": "0.25"})
+    assert isinstance(store, RedisSessionStore)
+    kwargs = store.client.connection_pool.connection_kwargs
+    assert kwargs["socket_timeout"] == 0.25 and kwargs["socket_connect_timeout"] == 0.25
+
+
+def test_correct_must_be_a_bool(sessions):
+    session_id = sessions.start()["session_id"]
+    for bad in ("false", 0, 1, "yes"):
+        with pytest.raises(ValueError, match="true or false"):
+            sessions.answer(session_id, "S1", correct=bad)
+    assert sessions.answer(session_id, "S1", correct=False)["answered"] == 1
+    assert sessions.finish(session_id)["scores"]["spatial"] == 0.0
+
+
+def test_concurrent_duplicate_answers_count_once(sessions):
+    session_id = sessions.start()["session_id"]
+    barrier = threading.Barrier(8)
+    outcomes = []
+
+    def answer():
+        barrier.wait()
+        try:
+            outcomes.append(sessions.answer(session_id, "L1", correct=True)["answered"])
+        except AlreadyAnswered:
+            outcomes.append("duplicate")
+
+    threads = [threading.Thread(target=answer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(outcomes, key=str) == [1] + ["duplicate"] * 7
+    assert sessions.finish(session_id)["answered"] == 1
+
+
+def test_redis_updates_are_not_lost(engine):
+    client = FakeRedis()
+    sessions = AptitudeSessions(lambda: engine, RedisSessionStore(client))
+    session_id = sessions.start()["session_id"]
+    # Another worker records S1 while this one is between read and write
+    client.before_exec = lambda: sessions.answer(session_id, "S1", correct=True)
+    assert sessions.answer(session_id, "L1", correct=True)["answered"] == 2
+    with pytest.raises(AlreadyAnswered):
+        sessions.answer(session_id, "S1", correct=False)
+    report = sessions.finish(session_id)
+    assert report["answered"] == 2 and report["scores"]["spatial"] == 100.0
+    with pytest.raises(KeyError):
+        sessions.answer(session_id, "V1", correct=True)
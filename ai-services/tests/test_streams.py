@@ -0,0 +1,104 @@
+# ai-services/tests/test_streams.py
+
+import random
+
+import pytest
+
+from models.recommender import CareerRecommendationEngine
+from models.scoring import APTITUDE_KEYS, RIASEC_KEYS
+from models.streams import DEFAULT_CAREER_EXAMPLES, StreamScorer
+
+
+def reference_streams(stream_data, interests, aptitude=None):
+    """The original per-stream loop: unit interest weights plus a fixed aptitude rule per stream."""
+    aptitude_rules = {
+        "Science": (lambda a: (a["logical"] + a["numerical"]) / 200, "Strong logical and numerical abilities"),
+        "Commerce": (lambda a: (a["numerical"] + a["verbal"]) / 200, "Good numerical and verbal skills"),
+        "Arts": (lambda a: a["verbal"] / 100, "Excellent verbal abilities"),
+    }
+    results = []
+    for name, info in stream_data.items():
+        score, reasons = 0, []
+        for interest in info["suitable_interests"]:
+            if interest in interests:
+                value = interests[interest] / 100
+                score += value
+                if value > 0.6:
+                    reasons.append(f"High {interest} interest ({interests[interest]:.0f}%)")
+        if aptitude:
+            rule, reason = aptitude_rules[name]
+            value = rule(aptitude)
+            score += value
+            if value > 0.7:
+                reasons.append(reason)
+        score = score / (len(info["suitable_interests"]) + (1 if aptitude else 0))
+        results.append({"stream": name, "fit_score": round(score * 100, 1), "reasons": reasons,
+                        "career_examples": DEFAULT_CAREER_EXAMPLES[name]})
+    return sorted(results, key=lambda r: r["fit_score"], reverse=True)
+
+
+def reference_course(spec, interests, aptitude=None):
+    """Weighted form of the same formula, for a course's own weights."""
+    weights = spec["interest_weights"]
+    total = sum(w * interests[k] / 100 for k, w in weights.items())
+    denom = sum(weights.values())
+    if aptitude:
+        skills = spec["aptitude_weights"]
+        total += sum(v * aptitude[k] for k, v in skills.items()) / (100 * sum(skills.values()))
+        denom += 1
+    return round(total / denom * 100, 1)
+
+
+def random_profiles(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        interests = {k: rng.choice([0, 15, 40, 61, 75, 100, rng.uniform(0, 100)]) for k in RIASEC_KEYS}
+        aptitude = {k: rng.choice([20, 71, 90, rng.uniform(0, 100)]) for k in APTITUDE_KEYS} if i % 3 else None
+        yield interests, aptitude
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return CareerRecommendationEngine()
+
+
+def test_builtin_streams_match_the_per_stream_formula(engine):
+    stream_data = engine._load_stream_data()
+    for interests, aptitude in random_profiles(300):
+        got = engine.recommend_streams(interests, aptitude)
+        expected = reference_streams(stream_data, interests, aptitude)
+        assert [{k: r[k] for k in ("stream", "fit_score", "reasons", "career_examples")} for r in got] == expected
+        for r in got:
+            info = {k: v for k, v in stream_data[r["stream"]].items() if k != "courses"}
+            assert r["info"] == info
+
+
+def test_builtin_courses_use_their_own_weights(engine):
+    courses = engine._load_stream_data()["Science"]["courses"]
+    for interests, aptitude in random_profiles(100, seed=1):
+        science = next(r for r in engine.recommend_streams(interests, aptitude) if r["stream"] == "Science")
+        expected = sorted(((name, reference_course(spec, interests, aptitude)) for name, spec in courses.items()),
+                          key=lambda c: -c[1])
+        assert [(c["course"], c["fit_score"]) for c in science["courses"]] == expected
+        assert "interest_weights" not in science["courses"][0]["info"]
+
+
+def test_career_examples_come_from_the_catalog_or_the_defaults():
+    scorer = StreamScorer({
+        "Science": {"suitable_interests": ["investigative"]},
+        "Vocational": {"interest_weights": {"realistic": 2}, "aptitude_weights": {"spatial": 1},
+                       "career_examples": ["Electrician", "Welder"]},
+        "Design": {"suitable_interests": ["artistic"]},
+    })
+    examples = {r["stream"]: r["career_examples"] for r in scorer.recommend({"realistic": 50})}
+    assert examples == {"Science": DEFAULT_CAREER_EXAMPLES["Science"], "Vocational": ["Electrician", "Welder"],
+                        "Design": []}
+    design = next(r for r in scorer.recommend({"artistic": 80}, {"spatial": 90}) if r["stream"] == "Design")
+    assert design["reasons"] == ["High artistic interest (80%)"]
+
+
+def test_streams_filter_and_unknown_weights(engine):
+    got = engine.recommend_streams({k: 50 for k in RIASEC_KEYS}, constraints={"streams": ["arts", "Unknown"]})
+    assert [r["stream"] for r in got] == ["Arts"]
+    with pytest.raises(ValueError):
+        StreamScorer({"X": {"interest_weights": {"curiosity": 1}}})
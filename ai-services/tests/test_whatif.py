@@ -0,0 +1,33 @@
+# ai-services/tests/test_whatif.py
+
+import pytest
+
+from models.recommender import CareerRecommendationEngine
+
+INTERESTS = {"realistic": 30, "investigative": 85, "artistic": 40, "social": 70, "enterprising": 55,
+             "conventional": 65}
+
+
+def test_apply_matches_recommend_careers():
+    engine = CareerRecommendationEngine()
+    session = engine.what_if_session(dict(INTERESTS), {"logical": 80}, 12, k=5)
+    session.apply({"artistic": 90, "social": None}, {"verbal": 60}, "10")
+    expected = engine.recommend_careers(**session.profile(), k=5)
+    assert [entry["career_id"] for entry in session.top] == [r["career"]["id"] for r in expected]
+    assert session.class_level == 10
+
+
+@pytest.mark.parametrize("change", [
+    {"interests": {"artistic": 50}, "class_level": "x"},
+    {"interests": {"artistic": 50}, "class_level": True},
+    {"interests": {"artistic": 50}, "class_level": float("inf")},
+    {"interests": {"artistic": 50}, "aptitude": {"logical": "high"}},
+    {"interests": {"artistic": 50, "charisma": 10}},
+])
+def test_rejected_change_leaves_session_untouched(change):
+    session = CareerRecommendationEngine().what_if_session(dict(INTERESTS), {"logical": 80}, 12, k=5)
+    profile, top = session.profile(), list(session.top)
+    with pytest.raises(ValueError):
+        session.apply(**change)
+    assert session.profile() == profile
+    assert session.top == top